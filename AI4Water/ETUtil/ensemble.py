@@ -0,0 +1,87 @@
+from typing import Union
+
+import pandas as pd
+
+from AI4Water.ETUtil import et_methods
+from AI4Water.ETUtil.utils import Utils
+
+
+class ETEnsemble(Utils):
+    """
+    Calculates etp using several methods on the same input. The input is
+    checked, converted and transformed to the required frequency only once
+    and all the methods share it. Therefore, the intermediate quantities which
+    are saved in `cache` for future use, such as extraterrestrial radiation `ra`,
+    sunset hour angle `sha`, solar declination `solar_dec`, slope of saturation
+    vapour pressure curve `delta`, actual vapour pressure `ea` and net radiation
+    `rn` are calculated only once by the first method which requires them.
+
+    Example
+    -------
+    ```python
+    >>>ensemble = ETEnsemble(input_df, units, constants)
+    >>>et = ensemble(['PenmanMonteith', 'PriestleyTaylor', 'HargreavesSamani', 'Turc'])
+    ```
+    """
+    def __init__(self,
+                 input_df: pd.DataFrame,
+                 units: dict,
+                 constants: dict,
+                 **kwargs
+                 ):
+        """
+        Arguments:
+            input_df :
+            units :
+            constants :
+            kwargs : any keyword arguments for `Utils` such as `calculate_at`
+                and `verbosity`
+        """
+        self.name = self.__class__.__name__
+
+        super(ETEnsemble, self).__init__(input_df.copy(),
+                                         units.copy(),
+                                         constants.copy(),
+                                         **kwargs)
+
+    def __call__(self,
+                 methods: list,
+                 transform: bool = False,
+                 method_kwargs: dict = None) -> pd.DataFrame:
+        """
+        Arguments:
+            methods : names or classes of etp methods e.g. `['PenmanMonteith', PriestleyTaylor]`
+            transform : whether to transform the calculated etp to frequecies
+                other than at which it is calculated. The transformed etp is
+                saved in `output`.
+            method_kwargs : keyword arguments for the methods e.g.
+                `{'HargreavesSamani': {'method': '2003'}}`
+        Returns:
+            a dataframe whose columns are the etp calculated by each method at
+            the frequency of calculation.
+        """
+        if method_kwargs is None:
+            method_kwargs = {}
+
+        et = {}
+        for method in methods:
+            model = self.method(method)
+            model(transform=transform, **method_kwargs.get(model.name, {}))
+            et[model.name] = self.output['et_' + model.name + '_' + self.freq_str]
+
+        return self._to_frame(et)
+
+    def _to_frame(self, et: dict) -> pd.DataFrame:
+        return pd.DataFrame(et, index=self.input.index)
+
+    def method(self, method: Union[str, type]) -> et_methods.ETBase:
+        """Returns an instance of etp method which shares input, constants and
+        output of this ensemble, without preprocessing the input again."""
+        cls = getattr(et_methods, method) if isinstance(method, str) else method
+        if not (isinstance(cls, type) and issubclass(cls, et_methods.ETBase)):
+            raise ValueError(f"{method} is not an etp method")
+
+        model = cls.__new__(cls)
+        model.__dict__.update(self.__dict__)
+        model.name = cls.__name__
+        return model
@@ -86,7 +86,7 @@ class ETBase(Utils):
         return et
 
     def post_process(self, et, transform=False):
-        if isinstance(et, np.ndarray):
+        if isinstance(et, np.ndarray) and et.ndim == 1:
             et = pd.Series(et, index=self.input.index)
         self.output['et_' + self.name + '_' + self.freq_str] = et
         if transform:
@@ -219,7 +219,7 @@ class BrutsaertStrickler(ETBase):
     def __call__(self, *args, **kwargs):
         self.requirements(constants=['alphaPT'])  # check that all constants are present
 
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
         vabar = self.avp_from_rel_hum()  # Vapour pressure, *ea*
         vas = self.mean_sat_vp_fao56()
@@ -403,7 +403,7 @@ class GrangerGray(ETBase):
             _b = 0.06
 
         # rs = self.rs()
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
 
         vabar = self.avp_from_rel_hum()  # Vapour pressure
@@ -643,13 +643,14 @@ class Linacre(ETBase):
      """
     def __call__(self, *args, **kwargs):
 
-        if 'tdew' not in self.input:
-            if 'rel_hum' in self.input:
-                self.tdew_from_t_rel_hum()
+        if 'tdew' in self.input:
+            tdew = self.input['tdew'].values
+        else:
+            tdew = self.tdew_from_t_rel_hum()
 
         tm = np.add(self.input['temp'].values, np.multiply(0.006, self.cons['altitude']))
         tmp1 = np.multiply(500, np.divide(tm, 100 - self.cons['lat_dec_deg']))
-        tmp2 = np.multiply(15, np.subtract(self.input['temp'].values, self.input['tdew'].values))
+        tmp2 = np.multiply(15, np.subtract(self.input['temp'].values, tdew))
         upar = np.add(tmp1, tmp2)
 
         et = np.divide(upar, np.subtract(80, self.input['temp'].values))
@@ -671,7 +672,7 @@ class Makkink(ETBase):
 
         rs = self.rs()
 
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
 
         et = np.subtract(np.multiply(np.multiply(0.61, np.divide(delta, np.add(delta, gamma))),
@@ -732,7 +733,7 @@ class MattShuttleworth(ETBase):
         vas = self.mean_sat_vp_fao56()
         r_n = self.net_rad(vabar)  # net radiation
         u2 = self._wind_2m()    # Wind speed
-        delta = self.slope_sat_vp(self.input['temp'].values)   # slope of vapour pressure curve
+        delta = self.slope_sat_vp()   # slope of vapour pressure curve
         gam = self.psy_const()    # psychrometric constant
 
         tmp1 = self.seconds * ro_a * ca
@@ -815,7 +816,7 @@ class Penman(ETBase):
             _a = 1.313
             _b = 0.06
 
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
 
         rs = self.rs()
@@ -899,7 +900,7 @@ class PenmanMonteith(ETBase):
 
         wind_2m = self._wind_2m()
 
-        d = self.slope_sat_vp(self.input['temp'].values)
+        d = self.slope_sat_vp()
         g = self.psy_const()
 
         # Mean saturation vapour pressure
@@ -955,7 +956,7 @@ class PriestleyTaylor(ETBase):
     def __call__(self, *args, **kwargs):
         self.requirements(constants=['lat_dec_deg', 'altitude', 'alpha_pt', 'albedo'])
 
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
         vabar = self.avp_from_rel_hum()    # *ea*
         r_n = self.net_rad(vabar)   # net radiation
@@ -1012,7 +1013,7 @@ class SzilagyiJozsa(ETBase):
             _b = 0.06
         alpha_pt = self.cons['alphaPT']  # Priestley Taylor constant
 
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
 
         rs = self.rs()
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from AI4Water.ETUtil.ensemble import ETEnsemble
+from AI4Water.ETUtil.global_variables import ALLOWED_COLUMNS, default_constants
+
+
+class _Column(np.ndarray):
+    """An array which, like a pandas Series, also has the attribute `values`."""
+
+    @property
+    def values(self):
+        return self.view(np.ndarray)
+
+
+class SiteFrame(object):
+    """
+    Input of several sites as arrays of shape (time, sites), indexed like a
+    dataframe so that the etp methods can use it in place of `input_df`.
+    Quantities which only depend upon time, such as julian day, are saved
+    as arrays of shape (time, 1) so that they broadcast over sites.
+    """
+    def __init__(self, data: dict, index: pd.DatetimeIndex, sites: list):
+        self.index = index
+        self.sites = sites
+        self._data = {}
+        for key, val in data.items():
+            self[key] = val
+
+    @property
+    def columns(self) -> list:
+        return list(self._data.keys())
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.index), len(self.sites)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, item):
+        return item in self._data
+
+    def __getitem__(self, item) -> _Column:
+        return self._data[item].view(_Column)
+
+    def __setitem__(self, key, value):
+        value = np.asarray(value, dtype=float)
+        if value.ndim < 2:
+            value = np.broadcast_to(value.reshape(-1, 1), (len(self.index), 1))
+        if value.shape[0] != len(self.index) or value.shape[1] not in (1, len(self.sites)):
+            raise ValueError(f"{key} must be of shape ({len(self.index)}, {len(self.sites)}) but it is {value.shape}")
+        self._data[key] = value
+
+
+class MultiSiteET(ETEnsemble):
+    """
+    Calculates etp for many sites at once. The input time series are arrays
+    of shape (time, sites) and the constants which vary from site to site,
+    such as `lat_dec_deg`, `altitude` and `long_dec_deg`, are arrays of shape
+    (sites,). The solar geometry and the formulas of etp methods then broadcast
+    over sites, so etp of thousands of sites is calculated in one numpy pass.
+
+    Example
+    -------
+    ```python
+    >>>et = MultiSiteET({'tmin': tmin, 'tmax': tmax, 'rh_min': rh_min, 'rh_max': rh_max, 'sol_rad': sol_rad,
+    ...                  'wind_speed': wind}, units, {'lat_dec_deg': lats, 'altitude': altitudes, 'albedo': 0.23},
+    ...                  index=pd.date_range('20000101', periods=len(tmin), freq='D'))
+    >>>pet = et(['PenmanMonteith', 'HargreavesSamani'])
+    >>>pet['PenmanMonteith']  # dataframe of shape (time, sites)
+    ```
+
+    The input must be at a uniform time step, it is not transformed to other
+    frequencies. The methods in `unsupported` resample or index the input
+    with pandas and can not be used for many sites.
+    """
+    unsupported = ('Thornthwait', 'Kharrufa', 'JensenHaiseBasins')
+
+    def __init__(self,
+                 inputs: dict,
+                 units: dict,
+                 constants: dict,
+                 index: pd.DatetimeIndex = None,
+                 sites: list = None,
+                 verbosity: int = 1):
+        """
+        Arguments:
+            inputs : dictionary whose values are arrays or dataframes of shape
+                (time, sites). If the values are dataframes, `index` and `sites`
+                are taken from their index and columns.
+            units : units of inputs
+            constants : scalar constants or arrays of shape (sites,)
+            index : time index of inputs
+            sites : names of sites
+            verbosity :
+        """
+        self.name = self.__class__.__name__
+
+        first = next(iter(inputs.values()))
+        if isinstance(first, pd.DataFrame):
+            index = first.index if index is None else index
+            sites = first.columns.to_list() if sites is None else sites
+        if index is None:
+            raise ValueError("index must be given when inputs are not dataframes")
+        index = pd.DatetimeIndex(index)
+        if index.freq is None:
+            index.freq = pd.infer_freq(index)
+            if index.freq is None:
+                raise ValueError("inputs do not have uniform time-step")
+        if sites is None:
+            sites = list(range(np.shape(first)[1]))
+
+        for col in inputs:
+            if col not in ALLOWED_COLUMNS:
+                raise ValueError(f"col {col} given in inputs is not allowed. Allowed columns names are {ALLOWED_COLUMNS}")
+
+        self.input = SiteFrame(inputs, index, sites)
+        self.output = {}
+        self.allowed_columns = ALLOWED_COLUMNS
+        self.no_of_hours = None
+        self.in_freq = index.freqstr
+
+        self.units = units.copy()
+        self.default_cons = default_constants
+        self.cons = {k: np.asarray(v, dtype=float) if isinstance(v, (list, tuple, np.ndarray)) else v
+                     for k, v in constants.items()}
+        self.verbosity = verbosity
+        self.freq_in_mins = 'same'
+        self.sb_cons = self.freq_in_mins
+        self.lat_rad = self.cons
+        self._check_compatability()
+
+    def __call__(self,
+                 methods: list,
+                 transform: bool = False,
+                 method_kwargs: dict = None) -> pd.DataFrame:
+        """
+        Arguments:
+            methods : same as in `ETEnsemble`
+            transform : must be False
+            method_kwargs : same as in `ETEnsemble`
+        Returns:
+            a dataframe whose columns are (method, site) pairs.
+        """
+        if transform:
+            raise NotImplementedError("etp of many sites can not be transformed to other frequencies")
+
+        names = [method if isinstance(method, str) else getattr(method, '__name__', method) for method in methods]
+        unsupported = [name for name in names if name in self.unsupported]
+        if unsupported:
+            raise NotImplementedError(f"methods {unsupported} are not supported for many sites")
+
+        return super(MultiSiteET, self).__call__(methods, method_kwargs=method_kwargs)
+
+    def _to_frame(self, et: dict) -> pd.DataFrame:
+        return pd.concat({method: pd.DataFrame(np.broadcast_to(np.asarray(val, dtype=float), self.input.shape),
+                                               index=self.input.index, columns=self.input.sites)
+                          for method, val in et.items()}, axis=1)
+
+    @staticmethod
+    def to_array(et: pd.DataFrame) -> np.ndarray:
+        """converts the output of `__call__` into an array of shape (time, sites, methods)"""
+        methods = et.columns.get_level_values(0).unique()
+        return np.stack([et[m].values for m in methods], axis=-1)
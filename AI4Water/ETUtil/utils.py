@@ -465,6 +465,66 @@ class TransFormData(PreProcessing):
         return all_freqs[self.freq_str]
 
 
+class IntermediateCache(object):
+    """
+    Memoizes the intermediate quantities, such as extraterrestrial radiation or
+    sunset hour angle, which several methods of `Utils` require. A quantity is
+    saved against its name and the frequency (in minutes) at which it is
+    calculated and is always returned as a read-only numpy array.
+
+    Example
+    -------
+    ```python
+    >>>cache = IntermediateCache()
+    >>>ra = cache.get('ra', 1440, lambda: np.arange(3.0))  # calculated
+    >>>ra = cache.get('ra', 1440, lambda: np.arange(3.0))  # taken from cache
+    >>>cache.hits, cache.misses
+    (1, 1)
+    ```
+    """
+    def __init__(self):
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def nbytes(self) -> int:
+        """memory occupied by the cached arrays in bytes"""
+        return sum(val.nbytes for val in self._values.values())
+
+    def get(self, quantity: str, freq: int, func) -> np.ndarray:
+        """
+        Arguments:
+            quantity : name of quantity e.g. `ra`
+            freq : frequency in minutes at which the quantity is calculated
+            func : callable without arguments which calculates the quantity
+                when it is not in cache.
+        """
+        key = (quantity, freq)
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+
+        self.misses += 1
+        val = np.array(func(), dtype=float)
+        val.setflags(write=False)
+        self._values[key] = val
+        return val
+
+    def invalidate(self, *quantities):
+        """removes the given quantities, or all quantities if none is given, from the cache"""
+        if quantities:
+            self._values = {k: v for k, v in self._values.items() if k[0] not in quantities}
+        else:
+            self._values = {}
+
+
 class Utils(TransFormData):
     """
     Contains functions methods for calculation of ETP with various methods.
@@ -472,6 +532,12 @@ class Utils(TransFormData):
         net_rad
         atm_pressure
         _wind_2m
+
+    The intermediate quantities calculated from input and constants, such as
+    `ra`, `sha`, `solar_dec`, `ird`, `delta`, `ea`, `rn`, `sol_rad` and `cs_rad`
+    are saved in `cache` and not in `input`. The cache is emptied when `input`
+    or `cons` are assigned anew. If they are modified in place, call
+    `invalidate_cache`.
     """
 
     def __init__(self, input_df, units, constants, calculate_at=None, verbosity: bool=1):
@@ -483,6 +549,35 @@ class Utils(TransFormData):
 
         super(Utils, self).__init__(input_df, units, constants, calculate_at=calculate_at, verbosity=verbosity)
 
+    @property
+    def input(self):
+        return self._input
+
+    @input.setter
+    def input(self, input_df):
+        self._input = input_df
+        self.cache = IntermediateCache()
+
+    @property
+    def cons(self):
+        return self._cons
+
+    @cons.setter
+    def cons(self, constants):
+        self._cons = constants
+        self.lat_rad = constants
+        self.cache = IntermediateCache()
+
+    def invalidate_cache(self, *quantities):
+        """removes the given intermediate quantities, or all of them if none is given, from cache.
+        This must be called after `input` or `cons` are modified in place. The quantities
+        which are calculated from the removed ones, e.g. `ra` from `sha`, must be removed too."""
+        self.lat_rad = self.cons
+        self.cache.invalidate(*quantities)
+
+    def _cached(self, quantity: str, func) -> np.ndarray:
+        return self.cache.get(quantity, self.freq_in_mins, func)
+
     @property
     def seasonal_correction(self):
         """Seasonal correction for solar time (Eqs. 57 & 58)
@@ -518,19 +613,19 @@ class Utils(TransFormData):
         :return: net radiation [MJ m-2 timestep-1].
         :rtype: float
         """
-        if 'rn' not in self.input:
-            if rs is None:
-                rs = self.rs()
+        if 'rn' in self.input:
+            return self.input['rn'].values
+
+        def _net_rad():
+            _rs = self.rs() if rs is None else rs
             if 'rns' not in self.input:
-                rns = self.net_in_sol_rad(rs)
+                rns = self.net_in_sol_rad(_rs)
             else:
-                rns = self.input['rns']
-            rnl = self.net_out_lw_rad(rs=rs, ea=ea)
-            rn = np.subtract(rns, rnl)
-            self.input['rn'] = rn  # for future use
-        else:
-            rn = self.input['rn']
-        return rn
+                rns = self.input['rns'].values
+            rnl = self.net_out_lw_rad(rs=_rs, ea=ea)
+            return np.subtract(rns, rnl)
+
+        return self._cached('rn', _net_rad)
 
     def rs(self):
         """
@@ -539,7 +634,10 @@ class Utils(TransFormData):
         remain same for all years if sunshine hours data is not provided (which is difficult to obtain), but temperature
         data  which is easy to obtain and thus will be different for different years"""
 
-        if 'sol_rad' not in self.input.columns:
+        if 'sol_rad' in self.input.columns:
+            return self.input['sol_rad'].values
+
+        def _rs():
             if 'sunshine_hrs' in self.input.columns:
                 rs = self.sol_rad_from_sun_hours()
                 if self.verbosity > 0:
@@ -551,11 +649,9 @@ class Utils(TransFormData):
             else:
                 raise ValueError("""Unable to calculate solar radiation. Provide either of following inputs:
                                  sol_rad, sunshine_hrs or tmin and tmax""")
-        else:
-            rs = self.input['sol_rad']
+            return rs
 
-        self.input['sol_rad'] = rs
-        return rs
+        return self._cached('sol_rad', _rs)
 
     def net_in_sol_rad(self, rs):
         """
@@ -665,14 +761,8 @@ class Utils(TransFormData):
         else:           # for 'interior' locations, where land mass dominates and air
             adj = 0.16  # masses are not strongly influenced by a large water body
 
-        et_rad = None
-        cs_rad = None
-        if 'et_rad' not in self.input:
-            et_rad = self._et_rad()
-            self.input['et_rad'] = et_rad
-        if 'cs_rad' not in self.input:
-            cs_rad = self._cs_rad()
-            self.input['cs_rad'] = cs_rad
+        et_rad = self._et_rad()
+        cs_rad = self._cs_rad()
         sol_rad = np.multiply(adj, np.multiply(np.sqrt(np.subtract(self.input['tmax'].values,
                                                                    self.input['tmin'].values)), et_rad))
 
@@ -690,7 +780,9 @@ class Utils(TransFormData):
         :rtype: float
         """
         if method.upper() == 'ASCE':
-            return (0.00002 * self.cons['altitude'] + 0.75) * self._et_rad()
+            if 'cs_rad' in self.input:
+                return self.input['cs_rad'].values
+            return self._cached('cs_rad', lambda: (0.00002 * self.cons['altitude'] + 0.75) * self._et_rad())
         elif method.upper() == 'REFET':
             sc = self.seasonal_correction()
             _omega = omega(solar_time_rad(self.cons['long_dec_deg'], self.input['half_hour'], sc))
@@ -742,6 +834,11 @@ class Utils(TransFormData):
         ra = eto._et_rad()
         [32.27]
         """
+        if 'et_rad' in self.input:
+            return self.input['et_rad'].values
+        return self._cached('ra', self._ra)
+
+    def _ra(self):
         if self.freq_in_mins < 1440:  # TODO should sub_hourly be different from Hourly?
             j = (3.14/180) * self.cons['lat_dec_deg']  # eq 22  phi
             dr = self.inv_rel_dist_earth_sun()  # eq 23
@@ -760,12 +857,11 @@ class Utils(TransFormData):
             sha = self.sunset_angle()   # sunset hour angle[radians], based on latitude
             ird = self.inv_rel_dist_earth_sun()
             tmp1 = (24.0 * 60.0) / math.pi
-            tmp2 = np.multiply(sha, np.multiply(math.sin(self.lat_rad), np.sin(sol_dec)))
-            tmp3 = np.multiply(math.cos(self.lat_rad), np.multiply(np.cos(sol_dec), np.sin(sha)))
+            tmp2 = np.multiply(sha, np.multiply(np.sin(self.lat_rad), np.sin(sol_dec)))
+            tmp3 = np.multiply(np.cos(self.lat_rad), np.multiply(np.cos(sol_dec), np.sin(sha)))
             ra = np.multiply(tmp1, np.multiply(SOLAR_CONSTANT, np.multiply(ird, np.add(tmp2, tmp3))))  # eq 21
         else:
             raise NotImplementedError
-        self.input['ra'] = ra
         return ra
 
     def sunset_angle(self):
@@ -773,14 +869,12 @@ class Utils(TransFormData):
         calculates sunset hour angle in radians given by Equation 25  in Fao56 (1)
 
         1): http://www.fao.org/3/X0490E/x0490e07.htm"""
-        if 'sha' not in self.input:
+        def _sunset_angle():
             j = (3.14/180.0) * self.cons['lat_dec_deg']           # eq 22
             d = self.dec_angle()       # eq 24, declination angle
-            angle = np.arccos(-np.tan(j)*np.tan(d))      # eq 25
-            self.input['sha'] = angle
-        else:
-            angle = self.input['sha'].values
-        return angle
+            return np.arccos(-np.tan(j)*np.tan(d))      # eq 25
+
+        return self._cached('sha', _sunset_angle)
 
     def inv_rel_dist_earth_sun(self):
         """
@@ -791,29 +885,24 @@ class Utils(TransFormData):
         :return: Inverse relative distance between earth and the sun
         :rtype: np array
         """
-        if 'ird' not in self.input:
+        def _ird():
             inv1 = np.multiply(2*math.pi/365.0,  self.input['jday'].values)
             inv2 = np.cos(inv1)
             inv3 = np.multiply(0.033, inv2)
-            ird = np.add(1.0, inv3)
-            self.input['ird'] = ird
-        else:
-            ird = self.input['ird']
-        return ird
+            return np.add(1.0, inv3)
+
+        return self._cached('ird', _ird)
 
     def dec_angle(self):
         """
         finds solar declination angle
         """
-        if 'sol_dec' not in self.input:
+        def _dec_angle():
             if self.freq_str == 'monthly':
-                solar_dec = np.array(0.409 * np.sin(2*3.14 * self.daily_index().dayofyear/365 - 1.39))
-            else:
-                solar_dec = 0.409 * np.sin(2*3.14 * self.input['jday'].values/365 - 1.39)     # eq 24, declination angle
-            self.input['solar_dec'] = solar_dec
-        else:
-            solar_dec = self.input['solar_dec']
-        return solar_dec
+                return np.array(0.409 * np.sin(2*3.14 * self.daily_index().dayofyear/365 - 1.39))
+            return 0.409 * np.sin(2*3.14 * self.input['jday'].values/365 - 1.39)     # eq 24, declination angle
+
+        return self._cached('solar_dec', _dec_angle)
 
     def solar_time_angle(self):
         """
@@ -835,7 +924,7 @@ class Utils(TransFormData):
 
         # TODO find out how to calculate lz
         # https://github.com/djlampert/PyHSPF/blob/c3c123acf7dba62ed42336f43962a5e4db922422/src/pyhspf/preprocessing/etcalculator.py#L610
-        lz = np.abs(15 * round(self.cons['long_dec_deg'] / 15.0))
+        lz = np.abs(15 * np.round(np.divide(self.cons['long_dec_deg'], 15.0)))
         lm = np.abs(self.cons['long_dec_deg'])
         t1 = 0.0667*(lz-lm)
         t2 = self.input['half_hr'].values + t1 + self.solar_time_cor()
@@ -871,34 +960,34 @@ class Utils(TransFormData):
         http://www.fao.org/3/X0490E/x0490e07.htm#TopOfPage
         """
         if 'ea' in self.input:
-            avp = self.input['ea']
+            return self.input['ea'].values
+        return self._cached('ea', self._avp_from_rel_hum)
+
+    def _avp_from_rel_hum(self):
+        avp = 0.0
+        # TODO `shub_hourly` calculation should be different from `Hourly`
+        # use equation 54 in http://www.fao.org/3/X0490E/x0490e08.htm#TopOfPage
+        if self.freq_in_mins <= 60:  # for hourly or sub_hourly
+            avp = np.multiply(self.sat_vp_fao56(self.input['temp'].values),
+                              np.divide(self.input['rel_hum'].values, 100.0))
+
+        elif self.freq_in_mins == 1440:
+            if 'rh_min' in self.input.columns and 'rh_max' in self.input.columns:
+                tmp1 = np.multiply(self.sat_vp_fao56(self.input['tmin'].values),
+                                   np.divide(self.input['rh_max'].values, 100.0))
+                tmp2 = np.multiply(self.sat_vp_fao56(self.input['tmax'].values),
+                                   np.divide(self.input['rh_min'].values, 100.0))
+                avp = np.divide(np.add(tmp1, tmp2), 2.0)
+            elif 'rel_hum' in self.input.columns:
+                # calculation actual vapor pressure from mean humidity
+                # equation 19
+                t1 = np.divide(self.input['rel_hum'].values, 100)
+                t2 = np.divide(np.add(self.sat_vp_fao56(self.input['tmax'].values),
+                                      self.sat_vp_fao56(self.input['tmin'].values)), 2.0)
+                avp = np.multiply(t1, t2)
         else:
-            avp = 0.0
-            # TODO `shub_hourly` calculation should be different from `Hourly`
-            # use equation 54 in http://www.fao.org/3/X0490E/x0490e08.htm#TopOfPage
-            if self.freq_in_mins <= 60:  # for hourly or sub_hourly
-                avp = np.multiply(self.sat_vp_fao56(self.input['temp'].values),
-                                  np.divide(self.input['rel_hum'].values, 100.0))
-
-            elif self.freq_in_mins == 1440:
-                if 'rh_min' in self.input.columns and 'rh_max' in self.input.columns:
-                    tmp1 = np.multiply(self.sat_vp_fao56(self.input['tmin'].values),
-                                       np.divide(self.input['rh_max'].values, 100.0))
-                    tmp2 = np.multiply(self.sat_vp_fao56(self.input['tmax'].values),
-                                       np.divide(self.input['rh_min'].values, 100.0))
-                    avp = np.divide(np.add(tmp1, tmp2), 2.0)
-                elif 'rel_hum' in self.input.columns:
-                    # calculation actual vapor pressure from mean humidity
-                    # equation 19
-                    t1 = np.divide(self.input['rel_hum'].values, 100)
-                    t2 = np.divide(np.add(self.sat_vp_fao56(self.input['tmax'].values),
-                                          self.sat_vp_fao56(self.input['tmin'].values)), 2.0)
-                    avp = np.multiply(t1, t2)
-            else:
-                raise NotImplementedError(" for frequency of {} minutes, actual vapour pressure can not be calculated"
-                                          .format(self.freq_in_mins))
-
-            self.input['ea'] = avp
+            raise NotImplementedError(" for frequency of {} minutes, actual vapour pressure can not be calculated"
+                                      .format(self.freq_in_mins))
         return avp
 
     def sat_vp_fao56(self, temp):
@@ -958,18 +1047,22 @@ class Utils(TransFormData):
         """
         return np.multiply(0.000665, self.atm_pressure())
 
-    def slope_sat_vp(self, t):
+    def slope_sat_vp(self, t=None):
         """
         slope of the relationship between saturation vapour pressure and temperature for a given temperature
         according to equation 13 in Fao56[1].
 
         delta = 4098 [0.6108 exp(17.27T/T+237.3)] / (T+237.3)^2
 
-        :param t: Air temperature [deg C]. Use mean air temperature for use in Penman-Monteith.
+        :param t: Air temperature [deg C]. Use mean air temperature for use in Penman-Monteith. If None, then mean air
+            temperature `temp` of input is used and the slope is saved for future use.
         :return: Saturation vapour pressure [kPa degC-1]
 
         [1]: http://www.fao.org/3/X0490E/x0490e07.htm#TopOfPage
         """
+        if t is None:
+            return self._cached('delta', lambda: self.slope_sat_vp(self.input['temp'].values))
+
         to_exp = np.divide(np.multiply(17.27, t), np.add(t, 237.3))
         tmp = np.multiply(4098, np.multiply(0.6108, np.exp(to_exp)))
         return np.divide(tmp, np.power(np.add(t, 237.3), 2))
@@ -1004,9 +1097,9 @@ class Utils(TransFormData):
             return self.input['wind_speed'].values
         else:
             if method == 'fao56':
-                return np.multiply(self.input['wind_speed'], (4.87 / math.log((67.8 * wind_z) - 5.42)))
+                return np.multiply(self.input['wind_speed'], (4.87 / np.log((67.8 * wind_z) - 5.42)))
             else:
-                return np.multiply(self.input['wind_speed'].values, math.log(2/z_o) / math.log(wind_z/z_o))
+                return np.multiply(self.input['wind_speed'].values, math.log(2/z_o) / np.log(wind_z/z_o))
 
     def atm_pressure(self) -> float:
         """
@@ -1019,7 +1112,7 @@ class Utils(TransFormData):
         :rtype: float
         """
         tmp = (293.0 - (0.0065 * self.cons['altitude'])) / 293.0
-        return math.pow(tmp, 5.26) * 101.3
+        return np.power(tmp, 5.26) * 101.3
 
     def tdew_from_t_rel_hum(self):
         """
@@ -1035,12 +1128,13 @@ class Utils(TransFormData):
         ln = natural logarithm.
         The formula also holds true as calculations shown at http://www.decatur.de/javascript/dew/index.html
         """
-        temp = self.input['temp']
-        neum = (237.3 * (np.log(self.input['rel_hum'] / 100.0) + ((17.27 * temp) / (237.3 + temp))))
-        denom = (17.27 - (np.log(self.input['rel_hum'] / 100.0) + ((17.27 * temp) / (237.3 + temp))))
-        td = neum / denom
-        self.input['tdew'] = td
-        return
+        def _tdew():
+            temp = self.input['temp'].values
+            neum = (237.3 * (np.log(self.input['rel_hum'].values / 100.0) + ((17.27 * temp) / (237.3 + temp))))
+            denom = (17.27 - (np.log(self.input['rel_hum'].values / 100.0) + ((17.27 * temp) / (237.3 + temp))))
+            return neum / denom
+
+        return self._cached('tdew', _tdew)
 
     def evap_pan(self):
         """
@@ -1050,7 +1144,7 @@ class Utils(TransFormData):
 
         lat = self.cons['lat_dec_deg']
         rs = self.rs()
-        delta = self.slope_sat_vp(self.input['temp'].values)
+        delta = self.slope_sat_vp()
         gamma = self.psy_const()
         vabar = self.avp_from_rel_hum()  # Vapour pressure
         vas = self.mean_sat_vp_fao56()
@@ -1099,7 +1193,7 @@ class Utils(TransFormData):
         """
         # TODO following equation assumes radiations in langleys/day ando output in Inches
         tmp1 = np.multiply(np.subtract(597.3, np.multiply(0.57, self.input['temp'].values)), 2.54)
-        rad_in = np.divide(self.input['sol_rad'].values, tmp1)
+        rad_in = np.divide(self.rs(), tmp1)
 
         return rad_in
 
@@ -1,20 +1,31 @@
 """
 main models are pytorch based and Model.
 All tensorflow based models can be implemented purely using Model.
+
+The models are imported on first use, so that `import AI4Water` or importing
+its sub-packages such as `AI4Water.ETUtil` does not import tensorflow or pytorch.
 """
-from AI4Water.main import Model
+import importlib
+
+__version__ = '1.0'
+
+_LAZY_ATTRIBUTES = {
+    'Model': 'AI4Water.main',
+    'IMVLSTMModel': 'AI4Water.pytorch_models',
+    'HARHNModel': 'AI4Water.pytorch_models',
+    'InputAttentionModel': 'AI4Water.tf_models',
+    'DualAttentionModel': 'AI4Water.tf_models',
+    'NBeatsModel': 'AI4Water.tf_models',
+}
+
 
-try:
-    from AI4Water.pytorch_models import IMVLSTMModel
-    from AI4Water.pytorch_models import HARHNModel
-except AttributeError:
-    print("\n{}Pytorch models could not be imported {}\n".format(10*'*', 10*'*'))
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-try:
-    from AI4Water.tf_models import InputAttentionModel
-    from AI4Water.tf_models import DualAttentionModel
-    from AI4Water.tf_models import NBeatsModel
-except AttributeError:
-    print("\n{}Tensorflow models could not be imported {}\n".format(10 * '*', 10 * '*'))
 
-__version__ = '1.0'
\ No newline at end of file
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
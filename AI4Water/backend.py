@@ -2,18 +2,60 @@ __all__ = ["tf", "keras", "torch",
            "xgboost_models", "catboost_models", "lightgbm_models", "sklearn_models",
            "VERSION_INFO"]
 
+# The frameworks and the registries of their models are imported on first use,
+# e.g. `from AI4Water.backend import xgboost_models` imports only xgboost, so
+# that the jobs which do not need tensorflow or torch do not wait for them.
+
 import os
 import sys
+import importlib
 
 from AI4Water.utils.utils import get_attributes
 
-try:
-    import sklearn
-except ModuleNotFoundError:
-    sklearn = None
+_LOADERS = {}
+
+
+def _lazy(*names):
+    """registers the decorated function as loader of `names`. The loader returns
+    a dictionary whose keys are `names`."""
+    def register(loader):
+        for name in names:
+            _LOADERS[name] = loader
+        return loader
+    return register
+
+
+def __getattr__(name):
+    if name in _LOADERS:
+        globals().update(_LOADERS[name]())
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LOADERS))
+
+
+def _get(name):
+    """gets an attribute of this module from inside it, loading it if necessary"""
+    return globals()[name] if name in globals() else __getattr__(name)
+
+
+def _import(module):
+    try:
+        return importlib.import_module(module)
+    except ModuleNotFoundError:
+        return None
+
+
+@_lazy('sklearn')
+def _load_sklearn():
+    return {'sklearn': _import('sklearn')}
+
 
 def get_sklearn_models():
 
+    sklearn = _get('sklearn')
     if sklearn is not None:
         # the following line must be executed in order for get_attributes to work, don't know why
         from sklearn.ensemble import RandomForestRegressor
@@ -53,98 +95,125 @@ def get_sklearn_models():
 
     return skl_models
 
-maj_version = 0
-min_version = 0
-try:
-    from tensorflow import keras
-    import tensorflow as tf
-    maj_version = int(tf.__version__[0])
-    min_version = int(tf.__version__[2])
-except ModuleNotFoundError:
-    keras = None
-    tf = None
-
-try:
-    import tcn
-except ModuleNotFoundError:
-    tcn = None
-
-try:
-    import torch
-except ModuleNotFoundError:
-    torch = None
-
-catboost_models = {}
-
-try:
-    import catboost
-    from catboost import CatBoostClassifier, CatBoostRegressor
-    catboost_models.update({"CATBOOSTCLASSIFIER": CatBoostClassifier})
-    catboost_models.update({"CATBOOSTREGRESSOR": CatBoostRegressor})
-
-except ModuleNotFoundError:
-    catboost = None
-
-
-xgboost_models = {}
-
-try:
-    import xgboost
-    from xgboost import XGBRegressor, XGBClassifier, XGBRFRegressor, XGBRFClassifier
-    xgboost_models.update({
-        "XGBOOSTREGRESSOR": XGBRegressor,
-        "XGBOOSTCLASSIFIER": XGBClassifier,
-        "XGBOOSTRFREGRESSOR": XGBRFRegressor,
-        "XGBOOSTRFCLASSIFIER": XGBRFClassifier,
-    })
-except ModuleNotFoundError:
-    xgboost = None
-
-lightgbm_models = {}
-
-try:
-    import lightgbm
-    from lightgbm.sklearn import LGBMClassifier, LGBMRegressor
-    lightgbm_models.update({"LGBMCLASSIFIER": LGBMClassifier,
-                            "LGBMREGRESSOR": LGBMRegressor})
-except ModuleNotFoundError:
-    lightgbm = None
-
-tpot_models = {}
-try:
-    import tpot
-    from tpot import TPOTRegressor, TPOTClassifier
-    tpot_models.update({'TPOTREGRESSOR': TPOTRegressor,
-                       'TPOTCLASSIFIER': TPOTClassifier})
-except ModuleNotFoundError:
-    tpot = None
-
-sklearn_models = get_sklearn_models()
-
-if sklearn is not None:
-    from sklearn.experimental import enable_iterative_imputer  # noqa
-    imputations = get_attributes(sklearn, 'impute')
-else:
-    imputations = {}
-
-keras = keras
-torch = torch
-tf = tf
-
-VERSION_INFO = {
-    'python': sys.version,
-    'os': os.name,
-    'tensorflow': str(tf.__version__) if tf is not None else None,
-    'tf_is_built_with_cuda': tf.test.is_built_with_cuda() if tf is not None else None,
-    'is_built_with_gpu_support': tf.test.is_built_with_gpu_support() if tf is not None else None,
-    'tf_is_gpu_available': tf.test.is_gpu_available() if tf is not None else None,
-    'keras': str(keras.__version__) if keras is not None else None,
-    'tcn': str(tcn.__version__) if tcn is not None else None,
-    'pytorch': str(torch.__version__) if torch is not None else None,
-    'catboost': str(catboost.__version__) if catboost is not None else None,
-    'xgboost': str(xgboost.__version__) if xgboost is not None else None,
-    'lightgbm': str(lightgbm.__version__) if lightgbm is not None else None,
-    'sklearn': str(sklearn.__version__) if sklearn is not None else None,
-    'tpot': str(tpot.__version__) if tpot else None,
-    'eager_execution': tf.executing_eagerly() if tf is not None else None
-}
+
+@_lazy('sklearn_models')
+def _load_sklearn_models():
+    return {'sklearn_models': get_sklearn_models()}
+
+
+@_lazy('imputations')
+def _load_imputations():
+    sklearn = _get('sklearn')
+    if sklearn is not None:
+        from sklearn.experimental import enable_iterative_imputer  # noqa
+        imputations = get_attributes(sklearn, 'impute')
+    else:
+        imputations = {}
+    return {'imputations': imputations}
+
+
+@_lazy('tf', 'keras', 'maj_version', 'min_version')
+def _load_tf():
+    try:
+        from tensorflow import keras
+        import tensorflow as tf
+    except ModuleNotFoundError:
+        return {'tf': None, 'keras': None, 'maj_version': 0, 'min_version': 0}
+    return {'tf': tf, 'keras': keras, 'maj_version': int(tf.__version__[0]), 'min_version': int(tf.__version__[2])}
+
+
+@_lazy('tcn')
+def _load_tcn():
+    return {'tcn': _import('tcn')}
+
+
+@_lazy('torch')
+def _load_torch():
+    return {'torch': _import('torch')}
+
+
+@_lazy('catboost', 'catboost_models')
+def _load_catboost():
+    catboost = _import('catboost')
+    catboost_models = {}
+    if catboost is not None:
+        catboost_models.update({"CATBOOSTCLASSIFIER": catboost.CatBoostClassifier})
+        catboost_models.update({"CATBOOSTREGRESSOR": catboost.CatBoostRegressor})
+    return {'catboost': catboost, 'catboost_models': catboost_models}
+
+
+@_lazy('xgboost', 'xgboost_models')
+def _load_xgboost():
+    xgboost = _import('xgboost')
+    xgboost_models = {}
+    if xgboost is not None:
+        xgboost_models.update({
+            "XGBOOSTREGRESSOR": xgboost.XGBRegressor,
+            "XGBOOSTCLASSIFIER": xgboost.XGBClassifier,
+            "XGBOOSTRFREGRESSOR": xgboost.XGBRFRegressor,
+            "XGBOOSTRFCLASSIFIER": xgboost.XGBRFClassifier,
+        })
+    return {'xgboost': xgboost, 'xgboost_models': xgboost_models}
+
+
+@_lazy('lightgbm', 'lightgbm_models')
+def _load_lightgbm():
+    lightgbm = _import('lightgbm')
+    lightgbm_models = {}
+    if lightgbm is not None:
+        from lightgbm.sklearn import LGBMClassifier, LGBMRegressor
+        lightgbm_models.update({"LGBMCLASSIFIER": LGBMClassifier,
+                                "LGBMREGRESSOR": LGBMRegressor})
+    return {'lightgbm': lightgbm, 'lightgbm_models': lightgbm_models}
+
+
+@_lazy('tpot', 'tpot_models')
+def _load_tpot():
+    tpot = _import('tpot')
+    tpot_models = {}
+    if tpot is not None:
+        tpot_models.update({'TPOTREGRESSOR': tpot.TPOTRegressor,
+                            'TPOTCLASSIFIER': tpot.TPOTClassifier})
+    return {'tpot': tpot, 'tpot_models': tpot_models}
+
+
+def _version(module: str, *distributions):
+    """version of a module. If the module has not been imported yet, its version is found from the
+    metadata of its distribution, so that it is not imported only to find its version."""
+    try:
+        from importlib import metadata
+    except ImportError:  # python < 3.8
+        metadata = None
+
+    if module in sys.modules or metadata is None:
+        _module = _import(module)
+        return str(_module.__version__) if _module is not None else None
+    for dist in distributions or (module,):
+        try:
+            return metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+@_lazy('VERSION_INFO')
+def _load_version_info():
+    # only when tensorflow is already in use, it is asked about gpu
+    tf = sys.modules.get('tensorflow')
+    return {'VERSION_INFO': {
+        'python': sys.version,
+        'os': os.name,
+        'tensorflow': _version('tensorflow', 'tensorflow', 'tensorflow-cpu', 'tensorflow-gpu'),
+        'tf_is_built_with_cuda': tf.test.is_built_with_cuda() if tf is not None else None,
+        'is_built_with_gpu_support': tf.test.is_built_with_gpu_support() if tf is not None else None,
+        'tf_is_gpu_available': tf.test.is_gpu_available() if tf is not None else None,
+        'keras': _version('keras'),
+        'tcn': _version('tcn', 'keras-tcn'),
+        'pytorch': _version('torch'),
+        'catboost': _version('catboost'),
+        'xgboost': _version('xgboost'),
+        'lightgbm': _version('lightgbm'),
+        'sklearn': _version('sklearn', 'scikit-learn'),
+        'tpot': _version('tpot'),
+        'eager_execution': tf.executing_eagerly() if tf is not None else None
+    }}
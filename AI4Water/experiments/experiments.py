@@ -1,6 +1,10 @@
 import os
 import json
+import time
 import warnings
+import traceback
+import importlib.util
+import multiprocessing
 from typing import Union
 
 import numpy as np
@@ -17,23 +21,42 @@ from AI4Water.utils.utils import init_subplots, process_axis
 from AI4Water.utils.utils import clear_weights, dateandtime_now, save_config_file
 from AI4Water.backend import VERSION_INFO
 
-try:
-    import catboost
-except ModuleNotFoundError:
-    catboost = None
-
-try:
-    import lightgbm
-except ModuleNotFoundError:
-    lightgbm = None
+# the frameworks are only checked for being installed, they are imported when their models are built
+catboost = importlib.util.find_spec('catboost')
+lightgbm = importlib.util.find_spec('lightgbm')
+xgboost = importlib.util.find_spec('xgboost')
 
 try:
-    import xgboost
+    from threadpoolctl import threadpool_limits
 except ModuleNotFoundError:
-    xgboost = None
+    threadpool_limits = None
 
 SEP = os.sep
 
+
+def _run_model(conn, experiment, config: dict, title: str, predict: bool, fit_kws: dict, threads: int):
+    """Runs one model of `experiment` in a worker process and sends either
+    (True, (train_results, test_results, model_path)) or (False, traceback)
+    through `conn`."""
+    # limits the threads of libraries which read these when they are loaded
+    for var in ["OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"]:
+        os.environ[var] = str(threads)
+
+    try:
+        if threadpool_limits is not None:
+            with threadpool_limits(limits=threads):
+                train_results, test_results = experiment.build_and_run(predict=predict, title=title,
+                                                                       fit_kws=fit_kws, **config)
+        else:
+            train_results, test_results = experiment.build_and_run(predict=predict, title=title,
+                                                                   fit_kws=fit_kws, **config)
+        conn.send((True, (train_results, test_results, experiment._model.path)))
+    except Exception:
+        conn.send((False, traceback.format_exc()))
+    finally:
+        conn.close()
+    return
+
 # TODO, when predicting, use best saved weights instead of last state of weights
 # TODO, show loss curve of different models in an Experiment
 # todo plots comparing different models in following youtube videos at 6:30 and 8:00 minutes.
@@ -104,7 +127,10 @@ class Experiments(object):
             post_optimize='eval_best',
             fit_kws=None,
             predict_kws=None,
-            hpo_kws: dict = None):
+            hpo_kws: dict = None,
+            n_jobs: int = 1,
+            threads_per_model: int = None,
+            timeout: float = None):
         """
         Runs the fit loop for the specified models.
         todo, post_optimize not working for 'eval_best' with ML methods.
@@ -128,6 +154,15 @@ class Experiments(object):
             fit_kws dict:  key word arguments that will be passed to AI4Water's model.fit
             predict_kws dict: dict, key word arguments that will be passed to AI4Water's model.predict
             hpo_kws dict: keyword arguments for `HyperOpt` class.
+            n_jobs int: number of models to run concurrently in worker processes.
+                Only valid if `run_type` is `dry_run`. The models which fail or
+                exceed the `timeout` are skipped and recorded in `failed_models`
+                of config.
+            threads_per_model int: maximum number of threads used by the BLAS and
+                OpenMP libraries e.g. by boosting libraries in each worker process.
+                By default, the cpu cores are divided equally among `n_jobs` workers.
+            timeout float: maximum time in seconds for one model when `n_jobs` > 1.
+                The worker running a model for longer than this is terminated.
         """
 
         assert run_type in ['optimize', 'dry_run']
@@ -165,6 +200,13 @@ Available cases are {self.models} and you wanted to exclude
         self.config['eval_models'] = {}
         self.config['optimized_models'] = {}
 
+        if n_jobs > 1:
+            if run_type == 'dry_run':
+                return self._fit_parallel([m for m in include if m not in exclude],
+                                          n_jobs, threads_per_model, timeout, predict, fit_kws)
+            warnings.warn("n_jobs is only used when run_type is dry_run. Use `n_jobs` in hpo_kws to optimize"
+                          " each model in parallel.", UserWarning)
+
         for model_type in include:
 
             model_name = model_type.split('model_')[1]
@@ -173,14 +215,7 @@ Available cases are {self.models} and you wanted to exclude
 
                 def objective_fn(**kwargs):
 
-                    if model_type in self.cases:
-                        config = self.cases[model_type]
-                    elif model_name in self.cases:
-                        config = self.cases[model_name]
-                    elif hasattr(self, model_type):
-                        config = getattr(self, model_type)(**kwargs)
-                    else:
-                        raise TypeError
+                    config = self.model_config(model_type, **kwargs)
 
                     return self.build_and_run(predict=predict,
                                               title=f"{self.exp_name}{SEP}{model_name}",
@@ -225,6 +260,86 @@ Available cases are {self.models} and you wanted to exclude
         self.save_config()
         return
 
+    def __getstate__(self):
+        # the built model and optimizer are not required in worker processes
+        state = self.__dict__.copy()
+        state.pop('_model', None)
+        state['optimizer'] = None
+        return state
+
+    def _fit_parallel(self, include, n_jobs, threads_per_model, timeout, predict, fit_kws):
+        """Runs the `include` models in `dry_run` mode in at most `n_jobs` worker
+        processes at a time. The results are populated in the order of `include`."""
+        if threads_per_model is None:
+            threads_per_model = max(1, os.cpu_count() // n_jobs)
+
+        ctx = multiprocessing.get_context()
+        pending = list(include)
+        running = {}
+        results = {}
+        self.config['failed_models'] = {}
+
+        while len(pending) > 0 or len(running) > 0:
+
+            while len(pending) > 0 and len(running) < n_jobs:
+                model_type = pending.pop(0)
+                model_name = model_type.split('model_')[1]
+                print(f"running  {model_type} model")
+
+                receiver, sender = ctx.Pipe(duplex=False)
+                process = ctx.Process(target=_run_model,
+                                      args=(sender, self, self.model_config(model_type),
+                                            f"{self.exp_name}{SEP}{model_name}", predict, fit_kws,
+                                            threads_per_model))
+                process.start()
+                # so that receiver gets EOFError if the worker dies without sending the results
+                sender.close()
+                running[model_type] = (process, receiver, time.time())
+
+            for model_type, (process, receiver, start) in list(running.items()):
+                if receiver.poll():
+                    try:
+                        success, output = receiver.recv()
+                    except EOFError:
+                        success, output = False, f"worker process exited with code {process.exitcode}"
+                    process.join()
+                elif timeout is not None and time.time() - start > timeout:
+                    process.terminate()
+                    process.join()
+                    success, output = False, f"timed out after {timeout} seconds"
+                else:
+                    continue
+
+                receiver.close()
+                running.pop(model_type)
+                if success:
+                    results[model_type] = output
+                else:
+                    warnings.warn(f"{model_type} failed: {output}", UserWarning)
+                    self.config['failed_models'][model_type] = output
+
+            time.sleep(0.01)
+
+        for model_type in include:
+            if model_type in results:
+                train_results, test_results, path = results[model_type]
+                self._populate_results(model_type.split('model_')[1], train_results, test_results)
+                self.config['eval_models'][model_type] = path
+
+        self.save_config()
+        return
+
+    def model_config(self, model_type: str, **kwargs) -> dict:
+        """Returns the keyword arguments for `build_and_run` for `model_type`"""
+        model_name = model_type.split('model_')[1]
+        if model_type in self.cases:
+            return self.cases[model_type]
+        elif model_name in self.cases:
+            return self.cases[model_name]
+        elif hasattr(self, model_type):
+            return getattr(self, model_type)(**kwargs)
+        raise TypeError
+
     def eval_best(self, model_type, opt_dir, fit_kws, **kwargs):
         """Evaluate the best models."""
         best_models = clear_weights(opt_dir, rename=False, write=False)
@@ -3,9 +3,11 @@ import json
 import copy
 import inspect
 import warnings
+import functools
 import traceback
 from typing import Union
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
 from sklearn.model_selection import ParameterGrid, ParameterSampler
@@ -70,6 +72,7 @@ from AI4Water.hyper_opt.utils import post_process_skopt_results
 from AI4Water.hyper_opt.utils import Categorical, Real, Integer
 from AI4Water.hyper_opt.utils import sort_x_iters, x_iter_for_tpe
 from AI4Water.hyper_opt.utils import plot_convergences
+from AI4Water.hyper_opt.utils import Journal, fingerprint, run_trial
 from AI4Water.hyper_opt.utils import loss_histogram, plot_hyperparameters
 from AI4Water.utils.utils import JsonEncoder
 
@@ -381,6 +384,24 @@ class HyperOpt(object):
                 if True, then after optimization, the objective_fn will
                 be evaluated on best parameters and the results will be stored in the
                 folder named "best" inside `title` folder.
+            n_jobs int:
+                number of trials to evaluate in parallel. For `grid` and `random`
+                algorithms and for `bayes` with skopt backend, the trials are evaluated
+                in worker processes, so the objective_fn must be picklable i.e.
+                defined at module level. For `bayes`, the points are proposed in
+                batches of `n_jobs` using `ask`/`tell` interface of skopt's Optimizer.
+                For optuna backend, it is passed to `study.optimize`. For sklearn
+                based estimators, it is passed to the underlying SearchCV class.
+                Default is 1.
+            opt_path str:
+                folder in which the results are saved. Every evaluation is
+                appended to `journal.jsonl` in this folder as soon as it finishes.
+            resume bool:
+                if True, and an optimization with the same objective function,
+                parameter space and data was run before with the same `opt_path`,
+                the points found in its journal are not evaluated again. A journal
+                written by a different optimization raises ValueError. Default
+                is False, in which case the journal is started afresh.
             kwargs dict:
                 Any additional keyword arguments will for the underlying optimization
                 algorithm. In case of using AI4Water model, these must be arguments
@@ -403,9 +424,18 @@ class HyperOpt(object):
         self.data = None
         self.eval_on_best=eval_on_best
         self.opt_path = kwargs.pop('opt_path') if 'opt_path' in kwargs else None
+        resume = kwargs.pop('resume', False)
+        # for sklearn based estimators, n_jobs is passed to SearchCV classes
+        self.n_jobs = 1 if "sklearn" in str(type(objective_fn)) else kwargs.pop('n_jobs', 1)
 
         self.gpmin_args = self.check_args(**kwargs)
 
+        self.journal = Journal(os.path.join(self.opt_path, 'journal.jsonl'),
+                               fingerprint=fingerprint(objective_fn, param_space, self.data,
+                                                       model=self._model if self.use_ai4water_model else None,
+                                                       ai4water_args=self.ai4water_args),
+                               resume=resume)
+
         if self.use_sklearn:
             if self.algorithm == "random":
                 self.optfn = RandomizedSearchCV(estimator=objective_fn, param_distributions=param_space, **kwargs)
@@ -861,23 +891,7 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
         else:
             title = title
 
-        _model = self._model
-        if isinstance(_model, dict):
-            _model = list(_model.keys())[0]
-        model = Model(data=self.data,
-                      prefix=title,
-                      verbosity=1 if pp else 0,
-                      model={_model: kwargs},
-                      **self.ai4water_args)
-
-        assert model.config["model"] is not None, "Currently supported only for ml models. Make your own" \
-                                                               " AI4Water model and pass it as custom model."
-        model.fit(indices="random")
-
-        t, p = model.predict(indices=model.test_indices, pp=pp)
-        mse = RegressionMetrics(t, p).mse()
-
-        error = round(mse, 7)
+        model, error = fit_ai4water(self.data, self._model, self.ai4water_args, title, pp=pp, **kwargs)
         self.results[error] = sort_x_iters(kwargs, self.original_para_order())
 
         print(f"Validation mse {error}")
@@ -942,9 +956,12 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
             kwargs['n_calls'] = kwargs.pop('num_iterations')
 
         try:
-            search_result = gp_minimize(func=self.model_for_gpmin(),
-                                        dimensions=self.dims(),
-                                        **kwargs)
+            if self.n_jobs > 1:
+                search_result = self.ask_tell(**kwargs)
+            else:
+                search_result = gp_minimize(func=self.journaled(self.model_for_gpmin(), self.dim_names()),
+                                            dimensions=self.dims(),
+                                            **kwargs)
         except ValueError:
             if int(''.join(sklearn.__version__.split('.')[1]))>22:
                 raise ValueError(f"""
@@ -967,7 +984,8 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
 
         self.gpmin_results = search_result
 
-        if len(self.results) < 1:
+        # some of the points may have been read from journal instead of evaluating them
+        if len(self.results) < len(search_result.func_vals):
             self.results = {str(round(k, 8)): self.to_kw(v) for k, v in zip(search_result.func_vals, search_result.x_iters)}
 
         post_process_skopt_results(search_result, self.results, self.opt_path)
@@ -982,24 +1000,15 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
     def eval_sequence(self, params):
 
         print(f"total number of iterations: {len(params)}")
-        for idx, para in enumerate(params):
 
+        # objective_fn is external and uses kwargs or it does not uses keywork arguments
+        errors = self.evaluate(params, how='kwargs' if self.use_named_args else 'args')
+
+        for idx, (para, err) in enumerate(zip(params, errors)):
             if self.use_ai4water_model:
-                err = self.ai4water_model(**para)
-            elif self.use_named_args:  # objective_fn is external but uses kwargs
-                err = self.objective_fn(**para)
-            else: # objective_fn is external and does not uses keywork arguments
-                try:
-                    err = self.objective_fn(*list(para.values()))
-                except TypeError:
-                    raise TypeError(f"""
-                        use_named_args argument is set to {self.use_named_args}. If your
-                        objective function takes key word arguments, make sure that
-                        this argument is set to True during initiatiation of HyperOpt.""")
-            err = round(err, 8)
-
-            if not self.use_ai4water_model:
-                self.results[err + idx] = sort_x_iters(para, self.original_para_order())
+                self.results[round(err, 7)] = sort_x_iters(para, self.original_para_order())
+            else:
+                self.results[round(err, 8) + idx] = sort_x_iters(para, self.original_para_order())
 
         self._plot()
 
@@ -1008,6 +1017,120 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
 
         return self.results
 
+    def call_objective(self, para: dict, how: str):
+        """Evaluates the objective function at `para` in this process."""
+        if self.use_ai4water_model:
+            return self.ai4water_model(**para)
+        try:
+            return run_trial(self.objective_fn, para, how)
+        except TypeError:
+            if how == 'kwargs':
+                raise
+            raise TypeError(f"""
+                use_named_args argument is set to {self.use_named_args}. If your
+                objective function takes key word arguments, make sure that
+                this argument is set to True during initiatiation of HyperOpt.""")
+
+    def trial_fn(self, idx: int):
+        """Returns the picklable objective function which is evaluated in a worker process"""
+        if self.use_ai4water_model:
+            # each trial gets its own folder because the trials may start at the same second
+            return functools.partial(ai4water_error, self.data, self._model, self.ai4water_args,
+                                     os.path.join(self.opt_path, f"trial_{len(self.journal) + idx}"))
+        return self.objective_fn
+
+    def evaluate(self, params: list, how: str = 'kwargs') -> list:
+        """
+        Evaluates the objective function at every point in `params` and returns
+        the values in the same order. The points which are found in the journal are
+        not evaluated again. If `n_jobs` > 1, the points are evaluated in parallel
+        in worker processes and every value is written to the journal as soon as
+        it is available.
+        """
+        errors = [self.journal.get(para) for para in params]
+        pending = [idx for idx, err in enumerate(errors) if err is None]
+
+        if len(pending) < len(params):
+            print(f"{len(params) - len(pending)} points were found in journal")
+
+        if self.n_jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.n_jobs, len(pending))) as pool:
+                futures = {pool.submit(run_trial, self.trial_fn(idx), params[idx],
+                                       'kwargs' if self.use_ai4water_model else how): idx for idx in pending}
+                for future in as_completed(futures):
+                    idx = futures[future]
+                    errors[idx] = float(future.result())
+                    self.journal.append(params[idx], errors[idx])
+        else:
+            for idx in pending:
+                errors[idx] = float(self.call_objective(params[idx], how))
+                self.journal.append(params[idx], errors[idx])
+
+        return errors
+
+    def journaled(self, objective_fn, names: list = None):
+        """
+        Wraps the `objective_fn`, which receives one argument, so that its value at
+        a point is read from the journal if the point has already been evaluated.
+        names list: if given, the list of parameters received by objective_fn is
+            written to journal as dictionary with these names.
+        """
+        def journaled_fn(x):
+            para = dict(zip(names, x)) if names is not None else x
+            if not isinstance(para, dict):
+                para = {'x': para}
+
+            y = self.journal.get(para)
+            if y is None:
+                y = objective_fn(x)
+                if isinstance(y, (int, float, np.number)):
+                    self.journal.append(para, float(y))
+            return y
+        return journaled_fn
+
+    def dim_names(self) -> list:
+        return [getattr(dim, 'name', None) or f"x{idx}" for idx, dim in enumerate(self.dims())]
+
+    def ask_tell(self, n_calls=100, x0=None, y0=None, random_state=None, **kwargs):
+        """
+        Bayesian optimization with skopt's `Optimizer` which proposes `n_jobs`
+        points in every iteration. The proposed points are evaluated in parallel
+        and then told to the optimizer. The arguments are same as of `gp_minimize`.
+        """
+        n_initial_points = kwargs.get('n_initial_points', kwargs.get('n_random_starts', 10))
+        optimizer = skopt.Optimizer(self.dims(),
+                                    base_estimator=kwargs.get('base_estimator', 'GP'),
+                                    n_initial_points=n_initial_points,
+                                    acq_func=kwargs.get('acq_func', 'gp_hedge'),
+                                    acq_optimizer=kwargs.get('acq_optimizer', 'auto'),
+                                    random_state=random_state)
+        names = self.dim_names()
+        how = 'kwargs' if self.use_named_args else 'list'
+
+        search_result = None
+        if x0 is not None:
+            x0 = x0 if isinstance(x0[0], (list, tuple)) else [x0]
+            if y0 is None:
+                y0 = self.evaluate([dict(zip(names, x)) for x in x0], how)
+            search_result = optimizer.tell([list(x) for x in x0], list(y0))
+
+        while len(optimizer.Xi) < n_calls:
+            xs = optimizer.ask(n_points=min(self.n_jobs, n_calls - len(optimizer.Xi)))
+            ys = self.evaluate([dict(zip(names, x)) for x in xs], how)
+            search_result = optimizer.tell(xs, ys)
+
+        search_result.specs = {'function': 'Optimizer',
+                               'args': {'func': self.objective_fn,
+                                        'base_estimator': optimizer.base_estimator_,
+                                        'n_calls': n_calls,
+                                        'n_initial_points': n_initial_points,
+                                        'acq_func': optimizer.acq_func,
+                                        'acq_optimizer': optimizer.acq_optimizer,
+                                        'n_points': self.n_jobs,
+                                        'x0': x0,
+                                        'y0': y0}}
+        return search_result
+
     def grid_search(self):
 
         params = list(ParameterGrid(self.param_space))
@@ -1032,18 +1155,20 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
             'grid': optuna.samplers.GridSampler
         }
 
+        objective_fn = self.journaled(lambda suggestion: self.objective_fn(**suggestion))
+
         def objective(trial):
             suggestion = {}
             for space_name, _space in self.param_space.items():
                     suggestion[space_name] = _space.suggest(trial)
-            return self.objective_fn(**suggestion)
+            return objective_fn(suggestion)
 
         if self.algorithm in ['tpe', 'cmaes', 'random']:
             study = optuna.create_study(direction='minimize', sampler=sampler[self.algorithm]())
         else:
             space = {s.name:s.grid for s in self.skopt_space()}
             study = optuna.create_study(sampler=sampler[self.algorithm](space))
-        study.optimize(objective, n_trials=self.num_iterations)
+        study.optimize(objective, n_trials=self.num_iterations, n_jobs=self.n_jobs)
         setattr(self, 'study', study)
 
         self._plot()
@@ -1087,7 +1212,7 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
             else:
                 raise NotImplementedError
 
-        best = fmin_hyperopt(objective_f,
+        best = fmin_hyperopt(self.journaled(objective_f),
                     space=space,
                     algo=suggest_options[self.algorithm],
                     trials=trials,
@@ -1418,6 +1543,32 @@ Backend must be one of hyperopt, optuna or sklearn but is is {x}"""
             json.dump(dict(sorted(jsonized_iterations.items())), fp, sort_keys=True, indent=4, cls=JsonEncoder)
 
 
+def fit_ai4water(data, model, ai4water_args: dict, prefix: str, pp: bool = False, **kwargs):
+    """Builds and trains AI4Water's Model with `kwargs` as parameters of `model`
+    and returns the model and its mse on test data."""
+    if isinstance(model, dict):
+        model = list(model.keys())[0]
+    _model = Model(data=data,
+                   prefix=prefix,
+                   verbosity=1 if pp else 0,
+                   model={model: kwargs},
+                   **ai4water_args)
+
+    assert _model.config["model"] is not None, "Currently supported only for ml models. Make your own" \
+                                               " AI4Water model and pass it as custom model."
+    _model.fit(indices="random")
+
+    t, p = _model.predict(indices=_model.test_indices, pp=pp)
+    mse = RegressionMetrics(t, p).mse()
+
+    return _model, round(mse, 7)
+
+
+def ai4water_error(data, model, ai4water_args: dict, prefix: str, **kwargs):
+    """Same as `fit_ai4water` but returns only the error so that it can be used in worker processes."""
+    return fit_ai4water(data, model, ai4water_args, prefix, **kwargs)[1]
+
+
 def space_from_list(v:list, k:str)->Dimension:
     if len(v) > 2:
         if isinstance(v[0], int):
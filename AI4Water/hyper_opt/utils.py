@@ -1,5 +1,8 @@
 import os
 import json
+import hashlib
+import inspect
+import threading
 from skopt.utils import dump
 from itertools import islice
 from pickle import PicklingError
@@ -33,6 +36,7 @@ except ImportError:
     IntUniformDistribution, DiscreteUniformDistribution, LogUniformDistribution = None, None, None
 
 from AI4Water.utils.utils import Jsonize, clear_weights
+from AI4Water.utils.data_cache import fingerprint as data_fingerprint
 
 
 class Counter:
@@ -957,4 +961,119 @@ def plot_convergences(opt_dir, what='val_loss', show_whole=True, show_min=False,
 
     plt.savefig(fname, dpi=300, bbox_inches='tight')
 
-    return
\ No newline at end of file
+    return
+
+class Journal(object):
+    """
+    Append-only journal of the points at which the objective function has been
+    evaluated. Every evaluation is written as one json line consisting of `x` and `y`
+    as soon as it finishes, so that an interrupted optimization can be resumed
+    without evaluating the completed points again. The first line is a header with
+    the `fingerprint` of the optimization which wrote the journal. The records are
+    read only if `resume` is True and only if the fingerprints match, otherwise
+    the journal is started afresh.
+
+    Example
+    -------
+    ```python
+    >>>journal = Journal("results/opt/journal.jsonl", fingerprint='abc', resume=True)
+    >>>journal.append({'n_estimators': 100}, 0.5)
+    >>>journal.get({'n_estimators': 100})
+    0.5
+    ```
+    """
+    def __init__(self, path: str, fingerprint: str = None, resume: bool = False):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.lock = threading.Lock()
+        self.entries = {}
+
+        if resume and os.path.exists(path):
+            self.read()
+        else:
+            with open(path, 'w') as fp:
+                fp.write(json.dumps({'fingerprint': fingerprint}) + '\n')
+
+    def read(self):
+        with open(self.path, 'r') as fp:
+            for idx, line in enumerate(fp):
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:  # the last line may be incomplete if the process was killed
+                    continue
+                if idx == 0:
+                    if entry.get('fingerprint', None) != self.fingerprint:
+                        raise ValueError(f"""
+The journal {self.path} was written by an optimization with different objective
+function, parameter space or data. Use a different `opt_path` or set `resume` to False.""")
+                    continue
+                self.entries[self.key(entry['x'])] = entry['y']
+        return
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def key(x: dict) -> str:
+        return json.dumps(Jsonize(x)(), sort_keys=True, default=str)
+
+    def get(self, x: dict):
+        """Returns the value of objective function at `x` or None if it has not been evaluated yet."""
+        return self.entries.get(self.key(x), None)
+
+    def append(self, x: dict, y: float):
+        with self.lock:
+            self.entries[self.key(x)] = y
+            with open(self.path, 'a') as fp:
+                fp.write(json.dumps({'x': Jsonize(x)(), 'y': y}, default=str) + '\n')
+        return
+
+
+def fingerprint(objective_fn, param_space, data=None, **kwargs) -> str:
+    """Returns the hash of source code of `objective_fn`, of the `param_space` and
+    of the `data` so that the journals of different optimizations are not mixed.
+    kwargs: any other objects which change the value of objective function."""
+    try:
+        source = inspect.getsource(objective_fn)
+    except (TypeError, OSError):  # e.g. sklearn estimators or functools.partial
+        source = repr(objective_fn)
+
+    def _serialize(dim):
+        if isinstance(dim, (_Real, _Integer, _Categorical)):  # serialize() contains addresses of objects
+            return [repr(dim), dim.name, Jsonize(getattr(dim, 'grid', None))()]
+        return dim
+
+    if isinstance(param_space, dict):
+        space = {k: _serialize(v) for k, v in param_space.items()}
+    elif isinstance(param_space, (list, tuple)):
+        space = [_serialize(dim) for dim in param_space]
+    else:
+        space = param_space
+
+    h = hashlib.sha256(source.encode())
+    h.update(json.dumps(space, sort_keys=True, default=repr).encode())
+    h.update(json.dumps(kwargs, sort_keys=True, default=repr).encode())
+
+    if data is not None:
+        # the same hash which identifies the data of prepared examples, so the shape and dtype are included
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+        elif not isinstance(data, pd.DataFrame):
+            data = np.asarray(data)
+        h.update(data_fingerprint(data).encode())
+
+    return h.hexdigest()
+
+
+def run_trial(objective_fn, x: dict, how: str = 'kwargs'):
+    """Evaluates the `objective_fn` at `x`. This must be a module level function so that
+    it can be sent to worker processes.
+    how str:
+        `kwargs` if objective_fn takes parameters as keyword arguments, `args` if it
+        takes them as positional arguments and `list` if it takes one list of parameters.
+    """
+    if how == 'kwargs':
+        return objective_fn(**x)
+    elif how == 'args':
+        return objective_fn(*list(x.values()))
+    return objective_fn(list(x.values()))
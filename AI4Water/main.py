@@ -14,21 +14,26 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import FunctionTransformer
 
 from AI4Water.nn_tools import NN
-from AI4Water.backend import tf, keras, tcn, torch, VERSION_INFO, catboost_models, xgboost_models, lightgbm_models
-from AI4Water.backend import tpot_models
-from AI4Water.backend import imputations, sklearn_models
+from AI4Water import backend
+from AI4Water.backend import tf, keras
 from AI4Water.utils.utils import maybe_create_path, save_config_file, get_index, dateandtime_now
 from AI4Water.utils.utils import train_val_split, split_by_indices, ts_features, make_model, prepare_data
-from AI4Water.utils.utils import find_best_weight
+from AI4Water.utils.utils import find_best_weight, num_windows, label_mask, _strided_windows
 from AI4Water.utils.plotting_tools import Plots
 from AI4Water.utils.transformations import Transformations
 from AI4Water.utils.imputation import Imputation
+from AI4Water.utils.batch_generator import BatchSequence, WindowedSequence, CachedSequence
+from AI4Water.utils.data_cache import DATA_CACHE, fingerprint
 from AI4Water.models.custom_training import train_step, test_step
-from AI4Water.utils.SeqMetrics import RegressionMetrics
+from AI4Water.utils.SeqMetrics import BatchRegressionMetrics
 from AI4Water.utils.visualizations import Visualizations, Interpret
 
+# version of the file written by `Model.save_artifact`
+ARTIFACT_VERSION = 1
+
 
 def reset_seed(seed):
     np.random.seed(seed)
@@ -44,7 +49,7 @@ LOSSES = {}
 if tf is not None:
     import AI4Water.keract_mod as keract
     from AI4Water.tf_attributes import LOSSES, OPTIMIZERS
-elif torch is not None:  # TODO, what if both tf and torch are installed and we want to run pytorch-based model?
+elif backend.torch is not None:  # TODO, what if both tf and torch are installed and we want to run pytorch-based model?
     from AI4Water.torch_attributes import LOSSES as pt_losses
 
     LOSSES.update(pt_losses)
@@ -186,6 +191,18 @@ class Model(NN, Plots):
                 metrics to be monitored. e.g. ['nse', 'pbias']
             batches str:
                 either `2d` or 3d`.
+            lazy_batches bool: default is False.
+                If True, the training examples for deep learning models are cut
+                on demand from the 2d data one batch at a time during `fit`
+                using `WindowedSequence`. This avoids preparing the whole 3d array
+                of inputs in memory which grows with lookback x examples.
+            cache_data bool/str: default is False.
+                If True, the examples prepared by `fetch_data` are cached in memory
+                and as hdf5 files in `results/data_cache` directory. The cache is
+                keyed by the data and the config used to prepare the examples, so
+                that repeated calls to `train_data`, `test_data` etc. e.g. during
+                hyperparameter optimization, do not prepare same examples again. If
+                a string, it is the directory where the hdf5 files are written.
             seed int:
                 random seed for reproducibility
             data pd.DataFrame/dict: default is None
@@ -457,7 +474,8 @@ class Model(NN, Plots):
                    noise: int = 0,
                    indices: list = None,
                    scaler_key: str = '0',
-                   use_datetime_index=False):
+                   use_datetime_index=False,
+                   copy: bool = False):
         """
         :param data:
         :param inps,
@@ -473,23 +491,43 @@ class Model(NN, Plots):
                    MinMaxScaler object and can be saved with a unique key in memory.
         :param use_datetime_index: if True, first value in returned `x` will be datetime index. This can be used when
                                 fetching data during predict but must be separated before feeding in NN for prediction.
+        :param copy: if True, `data` is copied before processing. This is not necessary because `data` is never
+                     modified in place. The stages which have to modify it, copy only what they modify.
         :return:
         """
-        data = data.copy()
         if st is not None:
             assert isinstance(st, int), "starting point must be integer."
         if indices is not None:
             assert isinstance(np.array(indices), np.ndarray), "indices must be array like"
             if en is not None or st != 0:
                 raise ValueError(f'When using indices, st and en can not be used. while st:{st}, and en:{en}')
+
+        cache_key = None
+        if self.config['cache_data'] and not shuffle and noise == 0:
+            cache_key = self.data_cache_key(data, inps, outs, transformation, st, en, indices, use_datetime_index)
+            cached = DATA_CACHE.get(cache_key, self.data_cache_path)
+            if cached is not None:
+                x, y, label, state = cached
+                for suffix, scaler in state['scalers'].items():
+                    self.scalers[scaler_key + suffix] = scaler
+                # same as after preparing the examples
+                self.dropped_examples = state['dropped_examples']
+                if write_data:
+                    self.write_cache('data_' + scaler_key, x, y, label)
+                return self.conform_shape(x, datetime_index=use_datetime_index), y, label
+
+        if copy:
+            data = data.copy()
         if en is None:
             en = data.shape[0]
 
         # # add random noise in the data
         df = self.add_noise(data, noise)
 
+        scalers_before = dict(self.scalers)
         if transformation:  # TODO when train_dataand test_data are externally set, normalization can't be done.
-            df, _ = self.normalize(df, scaler_key, transformation)
+            # the transformations may modify `df` in place if it is not the caller's data
+            df, _ = self.normalize(df, scaler_key, transformation, copy=not copy and df is data)
 
         # indexification should happen after transformation, because datetime column should not be transformed.
         df = self.indexify_data(df, use_datetime_index)
@@ -505,40 +543,14 @@ class Model(NN, Plots):
                                            len(outs)
                                            )
             if indices is not None and not isinstance(indices, str):
-
-                if getattr(self, 'nans_removed_4m_st', 0) == 0:
-                    # Either NaNs were not present in outputs or present but not at the start
-                    if not hasattr(self, 'nans_removed_4m_st'):
-                        # NaNs were not present in outputs
-                        additional = self.config['forecast_length'] + 1 if self.config['forecast_length'] > 1 else 0
-                        to_subtract = self.lookback + additional - 1
-                    else:
-                        # Either not present at the start or ?
-                        # TODO
-                        # verify this situation
-                        to_subtract = 0
-                        # so that when get_batches is called next time, with new data, this should be False by default
-                        self.nans_removed_4m_st = 0
-                else:
-                    # nans were present in output columns which were removed
-                    if getattr(self, 'nans_removed_4m_st', 0) > 0:
-                        additional = self.config['forecast_length'] + 1 if self.config['forecast_length'] > 1 else 0
-                        self.offset = abs(self.lookback + additional - self.nans_removed_4m_st - 1)
-                        if self.lookback > 1:
-                            warnings.warn(f"""lookback is {self.lookback}, due to which first {self.nans_removed_4m_st}
-                                              nan containing values were skipped from start. This may lead to some wrong
-                                              examples at the start or an offset of {self.offset} in indices.""",
-                                          UserWarning)
-                        to_subtract = self.offset
-                        self.nans_removed_4m_st = 0
-                    # we don't want to subtract anything from indices, possibly because the number of nans removed from
-                    # start are > lookback.
-                    elif self.nans_removed_4m_st == -9999:
-                        to_subtract = 0
-                    else:
-                        # because the x,y,z have some initial values removed
-                        to_subtract = self.lookback - 1
-                indices = np.subtract(np.array(indices), to_subtract).tolist()
+                # the windows of examples which survived `check_nans`
+                dropped = getattr(self, 'dropped_examples', [])
+                windows = np.delete(np.arange(len(x) + len(dropped)), dropped)
+                # for 2d batches, the target lies at the same row as inputs
+                first_target = 0
+                if x.ndim > 2:
+                    first_target = (self.lookback - 1) * self.config['input_step'] + self.forecast_step
+                indices = self.examples_at_indices(df, indices, len(outs), windows + first_target)
 
                 # if indices are given then this should be done after `get_batches` method
                 x = x[indices]
@@ -549,7 +561,6 @@ class Model(NN, Plots):
             for _st, _en in self.intervals:
                 df1 = df[_st:_en]
 
-                df.columns = self.in_cols + self.out_cols
                 df1.columns = self.in_cols + self.out_cols
 
                 if df1.shape[0] > 0:
@@ -569,6 +580,13 @@ class Model(NN, Plots):
                 y = np.vstack(ys)[indices]
                 label = np.vstack(labels)[indices]
 
+        if cache_key is not None:
+            # scalers are saved relative to `scaler_key` so that they can be restored under a different key
+            scalers = {k[len(scaler_key):]: v for k, v in self.scalers.items()
+                       if k.startswith(scaler_key) and scalers_before.get(k) is not v}
+            state = {'scalers': scalers, 'dropped_examples': getattr(self, 'dropped_examples', np.array([], dtype=np.int64))}
+            DATA_CACHE.put(cache_key, x, y, label, state, path=self.data_cache_path, writer=self.write_cache)
+
         if shuffle:
             x, y, label = unison_shuffled_copies(x, y, label)
 
@@ -586,6 +604,42 @@ class Model(NN, Plots):
 
         return x, y, label
 
+    @property
+    def data_cache_path(self):
+        """directory where the examples prepared by `fetch_data` are cached when `cache_data` is True"""
+        if isinstance(self.config['cache_data'], str):
+            # absolute, so that the files are written by `write_cache` and read by `DATA_CACHE` at same place
+            return os.path.abspath(self.config['cache_data'])
+        return DATA_CACHE.default_path()
+
+    def data_cache_key(self, data, inps, outs, transformation, st, en, indices, use_datetime_index) -> str:
+        """Returns the key which identifies the examples prepared by `fetch_data` from `data`."""
+        if indices is not None and not isinstance(indices, str):
+            indices = np.asarray(indices).tolist()
+
+        batches = self.config['batches']
+        if self.num_input_layers == 1:
+            batches = f"{len(self.first_layer_shape())}d"
+
+        return fingerprint(data,
+                           model=self.__class__.__name__,
+                           inps=list(inps),
+                           outs=list(outs),
+                           lookback=self.lookback,
+                           input_step=self.config['input_step'],
+                           forecast_step=self.forecast_step,
+                           forecast_len=self.forecast_len,
+                           known_future_inputs=self.config['known_future_inputs'],
+                           transformation=transformation,
+                           input_nans=self.config['input_nans'],
+                           allow_nan_labels=self.config['allow_nan_labels'],
+                           intervals=self.intervals,
+                           batches=batches,
+                           st=st,
+                           en=en,
+                           indices=indices,
+                           use_datetime_index=use_datetime_index)
+
     def indexify_data(self, data, use_datetime_index: bool):
 
         if use_datetime_index:
@@ -598,7 +652,8 @@ class Model(NN, Plots):
             """
             dt_index = list(map(int, np.array(data.index.strftime('%Y%m%d%H%M'))))  # datetime index
             # pandas will add the 'datetime' column as first column. This columns will only be used to keep
-            # track of indices of train and test data.
+            # track of indices of train and test data. Inserting in a shallow copy leaves caller's data intact.
+            data = data.copy(deep=False)
             data.insert(0, 'dt_index', dt_index)
             self.in_cols = ['dt_index'] + self.in_cols
 
@@ -618,26 +673,30 @@ class Model(NN, Plots):
 
         return df
 
-    def normalize(self, df, key, transformation):
-        """ should return the transformed dataframe and the key with which scaler is put in memory. """
+    def normalize(self, df, key, transformation, copy: bool = True):
+        """ should return the transformed dataframe and the key with which scaler is put in memory.
+        If `copy` is False, `df` may be modified in place."""
         # todo, isn't it better to save the instance of Transformation class in the memory?
         scaler = None
 
         if transformation is not None:
 
             if isinstance(transformation, dict):
-                df, scaler = Transformations(data=df, **transformation)('transformation', return_key=True)
+                df, scaler = Transformations(data=df, copy=copy, **transformation)('transformation', return_key=True)
                 self.scalers[key] = scaler
 
             # we want to apply multiple transformations
             elif isinstance(transformation, list):
                 for idx, trans in enumerate(transformation):
                     if trans['method'] is not None:
-                        df, scaler = Transformations(data=df, **trans)('transformation', return_key=True)
+                        df, scaler = Transformations(data=df, copy=copy, **trans)('transformation', return_key=True)
                         self.scalers[f'{key}_{trans["method"]}_{idx}'] = scaler
+                        # the transformed data is a new dataframe which is owned by us
+                        copy = False
             else:
                 assert isinstance(transformation, str)
-                df, scaler = Transformations(data=df, method=transformation)('transformation', return_key=True)
+                df, scaler = Transformations(data=df, method=transformation, copy=copy)('transformation',
+                                                                                         return_key=True)
                 self.scalers[key] = scaler
 
         return df, scaler
@@ -801,10 +860,15 @@ class Model(NN, Plots):
         """If nans are present in y, then tf.keras.model.fit is called as it is otherwise it is called with custom
         train_step and test_step which avoids calculating loss at points containing nans."""
         if kwargs.pop('nans_in_y_exist'):
-            if not isinstance(args[0], tf.data.Dataset):  # when x is tf.Dataset, we don't have y in kwargs
+            # when x is tf.Dataset, we don't have y in kwargs and the masks are found from nans in it, while
+            # sequences yield the masks alongside y themselves.
+            if not isinstance(args[0], (tf.data.Dataset, BatchSequence)):
                 y = kwargs['y']
                 assert np.isnan(y).sum() > 0
-                kwargs['y'] = np.nan_to_num(y)  # In graph mode, masking of nans does not work
+                # in graph (v1) mode, keras does not use custom train_step and checks the shape of sample weights
+                if tf.compat.v1.executing_eagerly_outside_functions():
+                    kwargs['sample_weight'] = (~np.isnan(y)).astype(np.float32)  # mask of valid labels
+                kwargs['y'] = np.nan_to_num(y)
             self._model.train_step = MethodType(train_step, self._model)
             self._model.test_step = MethodType(test_step, self._model)
 
@@ -813,7 +877,9 @@ class Model(NN, Plots):
     def _fit(self, inputs, outputs, validation_data, validation_steps=None, **callbacks):
 
         nans_in_y_exist = False
-        if isinstance(outputs, np.ndarray):
+        if isinstance(inputs, BatchSequence):
+            nans_in_y_exist = inputs.nans_in_y
+        elif isinstance(outputs, np.ndarray):
             if np.isnan(outputs).sum() > 0:
                 nans_in_y_exist = True
         elif isinstance(outputs, list):
@@ -825,18 +891,21 @@ class Model(NN, Plots):
                 if np.isnan(out_array).sum() > 0:
                     nans_in_y_exist = True
 
-        inputs, outputs, validation_data = self.to_tf_data(inputs, outputs, validation_data)
+        if not isinstance(inputs, BatchSequence):
+            inputs, outputs, validation_data = self.to_tf_data(inputs, outputs, validation_data)
 
-        validation_split = 0.0 if isinstance(inputs, tf.data.Dataset) else self.config['val_fraction']
+        # validation data from generators has already been separated
+        generator = isinstance(inputs, (tf.data.Dataset, BatchSequence))
+        validation_split = 0.0 if generator else self.config['val_fraction']
 
         callbacks = self.get_callbacks(self.use_val_data(validation_split, validation_data), **callbacks)
 
         st = time.time()
 
         self.do_fit(inputs,
-                    y=None if isinstance(inputs, tf.data.Dataset) else outputs,
+                    y=None if generator else outputs,
                     epochs=self.config['epochs'],
-                    batch_size=None if isinstance(inputs, tf.data.Dataset) else self.config['batch_size'],
+                    batch_size=None if generator else self.config['batch_size'],
                     validation_split=validation_split,
                     validation_data=validation_data,
                     callbacks=callbacks,
@@ -971,8 +1040,7 @@ class Model(NN, Plots):
             if self.config['allow_nan_labels'] == 2:
                 tot_obs = self.data.shape[0]
             elif self.config['allow_nan_labels'] == 1:
-                label_y = self.data[self.out_cols].values
-                idx = ~np.array([all([np.isnan(x) for x in label_y[i]]) for i in range(len(label_y))])
+                idx, _ = label_mask(self.data[self.out_cols].values, allow_nan_labels=1)
                 tot_obs = np.sum(idx)
             else:
                 if self.outs == 1:
@@ -1106,6 +1174,180 @@ class Model(NN, Plots):
         else:
             raise ValueError
 
+    def fetch_sequence(self,
+                       data: pd.DataFrame,
+                       inps,
+                       outs,
+                       transformation=None,
+                       st: int = 0,
+                       en=None,
+                       indices: list = None,
+                       scaler_key: str = '0',
+                       shuffle: bool = False) -> WindowedSequence:
+        """
+        Same as `fetch_data` but instead of preparing the examples, returns a
+        `WindowedSequence` which cuts the examples from normalized and imputed
+        2d data one batch at a time.
+        """
+        if indices is not None:
+            assert isinstance(np.array(indices), np.ndarray), "indices must be array like"
+            if en is not None or st != 0:
+                raise ValueError(f'When using indices, st and en can not be used. while st:{st}, and en:{en}')
+
+        df = data
+        if transformation:
+            df, _ = self.normalize(df, scaler_key, transformation)
+
+        if en is None:
+            en = df.shape[0]
+
+        if self.intervals is None:
+            chunks = [df[st:en]]
+        else:
+            chunks = [df[_st:_en] for _st, _en in self.intervals if df[_st:_en].shape[0] > 0]
+
+        known_future_inputs = self.config['known_future_inputs']
+        # for 2d batches, the windows consist of only one step
+        lookback = 1 if len(self.first_layer_shape()) == 2 else self.lookback
+
+        # the windows must not cross the boundaries of intervals
+        arrays, examples, offset = [], [], 0
+        for chunk in chunks:
+            chunk = self.imputation(chunk, len(inps), len(outs))
+            windows = num_windows(len(chunk), lookback, self.config['input_step'], self.forecast_step,
+                                  self.forecast_len, known_future_inputs)
+            arrays.append(chunk)
+            examples.append(offset + np.arange(max(windows, 0)))
+            offset += len(chunk)
+
+        seq = WindowedSequence(np.vstack(arrays),
+                               num_outputs=len(outs),
+                               lookback_steps=lookback,
+                               input_steps=self.config['input_step'],
+                               forecast_step=self.forecast_step,
+                               forecast_len=self.forecast_len,
+                               known_future_inputs=known_future_inputs,
+                               examples=np.concatenate(examples),
+                               batch_size=self.config['batch_size'],
+                               shuffle=shuffle,
+                               drop_remainder=self.config['drop_remainder'],
+                               allow_nan_labels=self.config['allow_nan_labels'],
+                               x_shape=self.first_layer_shape(),
+                               seed=self.config['seed'])
+
+        if indices is not None and not isinstance(indices, str):
+            if self.intervals is None:
+                positions = self.examples_at_indices(seq.data, indices, len(outs), seq.target_rows)
+            else:
+                positions = indices
+            seq = seq.subset(positions)
+
+        return seq
+
+    def examples_at_indices(self, data: np.ndarray, indices, outs: int, target_rows: np.ndarray) -> np.ndarray:
+        """
+        Maps the `indices` to positions of the prepared examples. The index `k`
+        refers to the k'th row of `data` with valid (not missing) target, so
+        it selects the example whose (first) target lies at this row. The indices
+        pointing at rows for which no example could be prepared, e.g. rows within
+        first `lookback` steps, are skipped.
+
+        Arguments:
+            data np.ndarray: 2d array from which examples were prepared
+            indices list: indices to map
+            outs int: number of output columns in data
+            target_rows np.ndarray: sorted rows of data containing the first target
+                of each prepared example
+        Returns:
+            positions of examples
+        """
+        valid_rows = np.where(label_mask(data[:, -outs:], self.config['allow_nan_labels'])[0])[0]
+        rows = valid_rows[np.array(indices, dtype=np.int64)]
+
+        positions = np.minimum(np.searchsorted(target_rows, rows), len(target_rows) - 1)
+        found = target_rows[positions] == rows
+        if not found.all():
+            warnings.warn(f"{int((~found).sum())} indices do not correspond to any example and are skipped",
+                          UserWarning)
+        return positions[found]
+
+    def lazy_train_data(self, st=0, en=None, indices=None, data_keys=None, **kwargs):
+        """
+        Prepares the training and validation data as `WindowedSequence` when
+        `lazy_batches` is True.
+        Returns:
+            a tuple of training sequence and validation data. The validation
+            data is either `WindowedSequence` or whatever was provided as `val_data`.
+        """
+        if isinstance(self.data, dict) or data_keys is not None:
+            raise NotImplementedError("lazy_batches can not be used when data is a dictionary")
+        if self.num_input_layers > 1:
+            raise NotImplementedError("lazy_batches can not be used for models with more than one input layer")
+
+        train_seq = self.fetch_sequence(self.data, self.in_cols, self.out_cols,
+                                        transformation=self.config['transformation'],
+                                        st=st, en=en, indices=indices, shuffle=self.config['shuffle'], **kwargs)
+
+        val_data = self.config['val_data']
+        if isinstance(val_data, str):
+            assert val_data.lower() == "same"
+            if getattr(self, 'test_indices', None) is not None:
+                val_seq = self.fetch_sequence(self.data, self.in_cols, self.out_cols,
+                                              transformation=self.config['transformation'],
+                                              indices=self.test_indices, **kwargs)
+            else:
+                train_seq, val_seq = train_seq.split(self.config['test_fraction'])
+        elif val_data is None and self.config['val_fraction'] > 0.0:
+            train_seq, val_seq = train_seq.split(self.config['val_fraction'])
+        else:
+            val_seq = val_data
+
+        if self.verbosity > 0:
+            self.info['train_examples'] = train_seq.num_examples
+            if isinstance(val_seq, WindowedSequence):
+                self.info['val_examples'] = val_seq.num_examples
+            print(f"Train on {train_seq.num_examples} examples in {len(train_seq)} batches")
+
+        return train_seq, val_seq
+
+    def cached_sequence(self, path: str, shuffle: bool = False) -> CachedSequence:
+        """Returns `CachedSequence` which streams the examples from `path` written by `write_cache`."""
+        x_shape = None
+        if self.num_input_layers == 1:
+            x_shape = self.first_layer_shape()
+
+        return CachedSequence(path,
+                              batch_size=self.config['batch_size'],
+                              shuffle=shuffle,
+                              drop_remainder=self.config['drop_remainder'],
+                              allow_nan_labels=self.config['allow_nan_labels'],
+                              x_shape=x_shape,
+                              seed=self.config['seed'])
+
+    def cached_train_data(self, path: str):
+        """
+        Prepares the training and validation data as `CachedSequence` from the
+        examples written by `write_cache` at `path`. The last `val_fraction` of
+        examples are used for validation.
+        """
+        if self.num_input_layers > 1:
+            raise NotImplementedError("cached data can not be used for models with more than one input layer")
+
+        train_seq = self.cached_sequence(path, shuffle=self.config['shuffle'])
+
+        val_data = self.config['val_data']
+        if isinstance(val_data, str) or (val_data is None and self.config['val_fraction'] > 0.0):
+            fraction = self.config['test_fraction'] if isinstance(val_data, str) else self.config['val_fraction']
+            train_seq, val_seq = train_seq.split(fraction)
+        else:
+            val_seq = val_data
+
+        if self.verbosity > 0:
+            self.info['train_examples'] = train_seq.num_examples
+            print(f"Train on {train_seq.num_examples} examples in {len(train_seq)} batches")
+
+        return train_seq, val_seq
+
     def maybe_not_3d_data(self, true, predicted):
 
         if true.ndim < 3:
@@ -1134,6 +1376,9 @@ class Model(NN, Plots):
         # for cases if they are 2D/1D, add the third dimension.
         true, predicted = self.maybe_not_3d_data(true, predicted)
 
+        # metrics of all outputs and horizons of shape (outs, forecast_len)
+        errors = BatchRegressionMetrics(true, predicted, ignore_nan=remove_nans).calculate_all()
+
         out_cols = list(self.out_cols.values())[0] if isinstance(self.out_cols, dict) else self.out_cols
         for idx, out in enumerate(out_cols):
 
@@ -1160,14 +1405,13 @@ class Model(NN, Plots):
                     t = t.values[~nan_idx]
                     p = p.values[~nan_idx]
 
-                errors = RegressionMetrics(t, p)
-                errs[out + '_errors_' + str(h)] = errors.calculate_all()
+                errs[out + '_errors_' + str(h)] = {k: float(v[idx, h]) for k, v in errors.items()}
                 errs[out + 'true_stats_' + str(h)] = ts_features(t)
                 errs[out + 'predicted_stats_' + str(h)] = ts_features(p)
 
                 save_config_file(fpath, errors=errs, name=prefix)
 
-                [horizon_errors[p].append(getattr(errors, p)()) for p in horizon_errors.keys()]
+                [horizon_errors[p].append(float(errors[p][idx, h])) for p in horizon_errors.keys()]
 
             if self.forecast_len>1:
                 visualizer.horizon_plots(horizon_errors, f'{prefix}_{out}_horizons.png')
@@ -1187,7 +1431,7 @@ class Model(NN, Plots):
 
             if self.verbosity > 0:
                 if 'tcn' in self.config['model']['layers']:
-                    tcn.tcn_full_summary(self._model, expand_residual_blocks=True)
+                    backend.tcn.tcn_full_summary(self._model, expand_residual_blocks=True)
         else:
             self.build_ml_model()
 
@@ -1195,22 +1439,33 @@ class Model(NN, Plots):
             # fit main fail so better to save config before as well. This will be overwritten once the fit is complete
             self.save_config()
 
-        VERSION_INFO.update({'numpy': str(np.__version__),
-                             'pandas': str(pd.__version__),
-                             'matplotlib': str(matplotlib.__version__),
-                             'h5py': h5py.__version__,
-                            'joblib': joblib.__version__})
-        self.info['version_info'] = VERSION_INFO
+        backend.VERSION_INFO.update({'numpy': str(np.__version__),
+                                     'pandas': str(pd.__version__),
+                                     'matplotlib': str(matplotlib.__version__),
+                                     'h5py': h5py.__version__,
+                                     'joblib': joblib.__version__})
+        self.info['version_info'] = backend.VERSION_INFO
 
         return
 
     def build_ml_model(self):
         """ builds models that follow sklearn api such as xgboost, catboost, lightgbm and obviously sklearn."""
 
-        ml_models = {**sklearn_models, **xgboost_models, **catboost_models, **lightgbm_models, **tpot_models}
         _model = list(self.config['model'].keys())[0]
         regr_name = _model.upper()
 
+        # only the framework of the model is imported
+        if regr_name.startswith('XGBOOST'):
+            ml_models = backend.xgboost_models
+        elif regr_name.startswith('CATBOOST'):
+            ml_models = backend.catboost_models
+        elif regr_name.startswith('LGBM'):
+            ml_models = backend.lightgbm_models
+        elif regr_name.startswith('TPOT'):
+            ml_models = backend.tpot_models
+        else:
+            ml_models = backend.sklearn_models
+
         kwargs = list(self.config['model'].values())[0]
 
         if regr_name in ['HISTGRADIENTBOOSTINGREGRESSOR', 'SGDREGRESSOR', 'MLPREGRESSOR']:
@@ -1232,10 +1487,10 @@ class Model(NN, Plots):
         else:
             if regr_name in ['TWEEDIEREGRESSOR', 'POISSONREGRESSOR', 'LGBMREGRESSOR', 'LGBMCLASSIFIER',
                              'GAMMAREGRESSOR']:
-                if int(VERSION_INFO['sklearn'].split('.')[1]) < 23:
-                    raise ValueError(
-                        f"{regr_name} is available with sklearn version >= 0.23 but you have {VERSION_INFO['sklearn']}")
-            raise ValueError(f"model {regr_name} not found. {VERSION_INFO}")
+                if int(backend.VERSION_INFO['sklearn'].split('.')[1]) < 23:
+                    raise ValueError(f"{regr_name} is available with sklearn version >= 0.23 but you have "
+                                     f"{backend.VERSION_INFO['sklearn']}")
+            raise ValueError(f"model {regr_name} not found. {backend.VERSION_INFO}")
 
         self._model = model
 
@@ -1294,6 +1549,8 @@ class Model(NN, Plots):
             en int: end index of data to be used
             indices list: indices of data to be used. If given, `st` and `en` will be ignored.
             data : if not None, it will directlry passed to fit ignorign `st`, `en` and `indices`
+                If a string, it must be the path of h5 file or npy directory written by
+                `write_cache` from which the batches are streamed during training.
             data_keys list: allowed only if self.data is a dictionary. You can decided which to use
                 use for training by specifying the keys of self.data dictionary
         """
@@ -1304,8 +1561,15 @@ class Model(NN, Plots):
         else:
             indices = self.get_indices(indices)
 
-        train_data = self.train_data(st=st, en=en, indices=indices, data=data, data_keys=data_keys)
-        inputs, outputs = maybe_three_outputs(train_data)
+        if self.category.upper() == "DL" and isinstance(data, str):
+            inputs, lazy_val_data = self.cached_train_data(data)
+            outputs = None
+        elif self.category.upper() == "DL" and self.config['lazy_batches'] and data is None:
+            inputs, lazy_val_data = self.lazy_train_data(st=st, en=en, indices=indices, data_keys=data_keys)
+            outputs = None
+        else:
+            train_data = self.train_data(st=st, en=en, indices=indices, data=data, data_keys=data_keys)
+            inputs, outputs = maybe_three_outputs(train_data)
 
         if isinstance(outputs, np.ndarray) and self.category.upper() == "DL":
             if isinstance(self._model.outputs, list):
@@ -1322,7 +1586,10 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
         self.info['training_start'] = dateandtime_now()
 
         if self.category.upper() == "DL":
-            history = self._fit(inputs, outputs, self.val_data(), **callbacks)
+            if isinstance(inputs, BatchSequence):
+                history = self._fit(inputs, outputs, lazy_val_data, **callbacks)
+            else:
+                history = self._fit(inputs, outputs, self.val_data(), **callbacks)
 
             visualizer.plot_loss(history.history)
 
@@ -1361,7 +1628,9 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
         return self.train_data(scaler_key=scaler_key, data_keys=data_keys, **kwargs)
 
     def prediction_step(self, inputs):
-        if self.category.upper() == "DL":
+        if isinstance(inputs, BatchSequence):
+            predicted = self._model.predict(x=inputs, verbose=self.verbosity)
+        elif self.category.upper() == "DL":
             predicted = self._model.predict(x=inputs,
                                             batch_size=self.config['batch_size'],
                                             verbose=self.verbosity)
@@ -1396,6 +1665,8 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
                 that was used when the data was transformed. By default that is '0'.
                 If the data was not transformed with Model, then make sure that
                 data_config['transformation'] is None.
+                If a string, it must be the path of h5 file or npy directory
+                written by `write_cache` from which the batches are streamed.
             use_datetime_index bool: whether to sort the results. Should only be
                 used if the data is indexed by pd.DatetimeIndex and `indices` is random.
             prefix str: prefix used with names of saved results
@@ -1418,13 +1689,20 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
         if scaler_key is None:
             scaler_key = '5'
 
-        data = self.test_data(st=st, en=en, indices=indices, data=data,
-                              scaler_key=scaler_key,
-                              data_keys=data_keys,
-                              use_datetime_index=use_datetime_index)
-        inputs, true_outputs = maybe_three_outputs(data)
+        if isinstance(data, str):
+            # stream the examples from the cache, only the labels and last input step are held in memory
+            inputs = self.cached_sequence(data)
+            true_outputs = inputs.labels()
+            first_input = inputs.last_step_inputs()
+            dt_index = np.arange(inputs.num_examples)
+        else:
+            data = self.test_data(st=st, en=en, indices=indices, data=data,
+                                  scaler_key=scaler_key,
+                                  data_keys=data_keys,
+                                  use_datetime_index=use_datetime_index)
+            inputs, true_outputs = maybe_three_outputs(data)
 
-        first_input, inputs, dt_index = self.deindexify_input_data(inputs, use_datetime_index=use_datetime_index)
+            first_input, inputs, dt_index = self.deindexify_input_data(inputs, use_datetime_index=use_datetime_index)
 
         predicted = self.prediction_step(inputs)
 
@@ -1457,6 +1735,131 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
 
         return true_outputs, predicted
 
+    @property
+    def window_rows(self) -> int:
+        """number of rows of raw observations which make one input window of the model"""
+        window_len = self.lookback
+        if self.config['known_future_inputs']:
+            window_len += self.forecast_len
+        return (window_len - 1) * self.config['input_step'] + 1
+
+    def predict_on_window(self, data, scaler_key: str = '0') -> np.ndarray:
+        """
+        Makes prediction from the most recent window of raw observations. This is
+        meant for serving, see `predict_batch`.
+        Arguments:
+            data pd.DataFrame/np.ndarray: raw observations of inputs whose last
+                `window_rows` rows make the window. If `known_future_inputs` is True,
+                the last rows must be the known future inputs.
+            scaler_key str: key of the stored scalers to use, see `predict_batch`.
+        Returns:
+            array of shape (outs, forecast_len) in original units of outputs.
+        """
+        return self.predict_batch(data, scaler_key=scaler_key, last_window=True)[0]
+
+    def predict_batch(self, data, scaler_key: str = '0', last_window: bool = False) -> np.ndarray:
+        """
+        Makes predictions from all the windows in raw observations for serving. Unlike
+        `predict`, the data is not prepared by `fetch_data` and no labels are needed.
+        The inputs are scaled with the stored scalers which were fitted during training,
+        windowed in same way as in `prepare_data` and only the predictions are inversely
+        transformed. Nothing is written on disk or plotted, and the compiled prediction
+        function of keras model is reused between calls.
+        Arguments:
+            data pd.DataFrame/np.ndarray: raw observations. If dataframe, it must contain
+                `in_cols`. If array, its first `ins` columns are inputs in the order of
+                `in_cols`. Any other column e.g. of outputs, is ignored.
+            scaler_key str: key of the stored scalers to use. The scalers fitted on
+                training data are stored with key '0'.
+            last_window bool: if True, only the last window is used.
+        Returns:
+            array of shape (windows, outs, forecast_len) in original units of outputs.
+        """
+        x = self.serving_inputs(data, scaler_key=scaler_key, last_window=last_window)
+        return self.predict_scaled(x, scaler_key=scaler_key)
+
+    def predict_scaled(self, x: np.ndarray, scaler_key: str = '0') -> np.ndarray:
+        """Makes predictions from the scaled inputs `x` prepared as by `serving_inputs`
+        and returns them in original units of outputs."""
+        if self.category.upper() == "DL":
+            predicted = self._model.predict_on_batch(x)
+        else:
+            predicted = self._model.predict(x)
+
+        predicted = np.asarray(predicted).reshape(len(x), self.outs, -1)
+
+        if self.config['transformation']:
+            predicted = self.apply_scalers(predicted, scaler_key, inverse=True)
+        return predicted
+
+    def serving_inputs(self, data, scaler_key: str = '0', last_window: bool = False) -> np.ndarray:
+        """Scales, imputes and windows the raw observations of inputs for `predict_batch`."""
+        if isinstance(self.in_cols, dict) or self.num_input_layers not in (1, np.inf):
+            raise NotImplementedError("serving is supported only for models with one input layer")
+
+        ins = self.ins
+        if isinstance(data, pd.DataFrame):
+            data = data[self.in_cols].values
+        data = np.asarray(data)[:, :ins]
+
+        window_rows = self.window_rows
+        if last_window:
+            data = data[-window_rows:]
+        if len(data) < window_rows:
+            raise ValueError(f"at least {window_rows} rows are needed to make a window but data has {len(data)}")
+
+        # inputs and outputs are put together because the scalers are fitted on both of them.
+        # The outputs are unknown and remain nan.
+        arr = np.full((len(data), ins + self.outs), np.nan)
+        arr[:, :ins] = data
+
+        if self.config['transformation']:
+            arr = self.apply_scalers(arr, scaler_key)
+
+        if self.config['input_nans'] is not None:
+            arr = self.imputation(pd.DataFrame(arr, columns=self.in_cols + self.out_cols), ins, self.outs)
+
+        x = arr[:, :ins]
+        if self.category.upper() == "DL" and len(self.first_layer_shape()) > 2:
+            window_len = self.lookback + (self.forecast_len if self.config['known_future_inputs'] else 0)
+            x = _strided_windows(x, len(x) - window_rows + 1, window_len, self.config['input_step'])
+            x = self.conform_shape(x, datetime_index=False)
+
+        return x.astype(np.float32)
+
+    def apply_scalers(self, arr: np.ndarray, scaler_key: str = '0', inverse: bool = False) -> np.ndarray:
+        """
+        Transforms `arr`, whose columns are `in_cols` + `out_cols`, with the stored scalers.
+        If `inverse` is True, `arr` can also be of shape (examples, outs, forecast_len)
+        in which case only the outputs are inversely transformed.
+        """
+        cols = self.in_cols + self.out_cols
+        shape = arr.shape
+        if inverse and arr.ndim == 3:
+            # horizons become rows so that all of them are transformed at once
+            outputs = arr.transpose(0, 2, 1).reshape(-1, self.outs)
+            arr = np.full((len(outputs), len(cols)), np.nan)
+            arr[:, self.ins:] = outputs
+
+        transformation = self.config['transformation']
+        if isinstance(transformation, list):
+            steps = [(trans, self.scalers[f'{scaler_key}_{trans["method"]}_{idx}']['scaler'])
+                     for idx, trans in enumerate(transformation) if trans['method'] is not None]
+        elif isinstance(transformation, dict):
+            steps = [(transformation, self.scalers[scaler_key]['scaler'])]
+        else:
+            steps = [({'method': transformation}, self.scalers[scaler_key]['scaler'])]
+
+        for trans, scaler in (reversed(steps) if inverse else steps):
+            if trans['method'].lower() in Transformations.mod_dim_methods:
+                raise NotImplementedError(f"serving with {trans['method']} transformation is not supported")
+            features = [cols.index(f) for f in trans.get('features', None) or cols]
+            arr[:, features] = _apply_scaler(scaler, arr[:, features], inverse, trans.get('replace_zeros', False))
+
+        if inverse and len(shape) == 3:
+            arr = arr[:, self.ins:].reshape(shape[0], shape[2], shape[1]).transpose(0, 2, 1)
+        return arr
+
     def impute(self, method, imputer_args=None, inputs=False, outputs=False, cols=None):
         """impute the missing data. One of either inputs, outputs or cols can be used.
         method: imputation algorithm
@@ -1757,6 +2160,9 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
 
     def check_nans(self, data, input_x, input_y, label_y, outs, lookback, allow_nan_labels, allow_input_nans=False):
         """Checks whether anns are present or not and checks shapes of arrays being prepared.
+        The examples with nan labels are removed depending upon `allow_nan_labels`. The
+        indices of removed examples are saved in `dropped_examples` attribute so that the
+        number of removed examples is len(self.dropped_examples).
         """
         # TODO, nans in inputs should be ignored at all cost because this causes error in results,
         #  when we set allow_nan_labels to True, then this should apply only to target/labels, and examples with
@@ -1766,17 +2172,12 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
             data = data.values
         else:
             nans = np.isnan(data[:, -outs:])  # df[self.out_cols].isna().sum()
+        self.dropped_examples = np.array([], dtype=np.int64)
         if int(nans.sum()) > 0:
             if allow_nan_labels == 2:
                 print("\n{} Allowing NANs in predictions {}\n".format(10 * '*', 10 * '*'))
             elif allow_nan_labels == 1:
                 print("\n{} Ignoring examples whose all labels are NaNs {}\n".format(10 * '*', 10 * '*'))
-                idx = ~np.array([all([np.isnan(x) for x in label_y[i]]) for i in range(len(label_y))])
-                input_x = input_x[idx]
-                input_y = input_y[idx]
-                label_y = label_y[idx]
-                if int(np.isnan(data[:, -outs:][0:lookback]).sum() / outs) >= lookback:
-                    self.nans_removed_4m_st = -9999
             else:
                 if self.method == 'dual_attention':
                     raise ValueError
@@ -1790,17 +2191,17 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
 
                 if self.verbosity > 0:
                     print('\n{} Removing Samples with nan labels  {}\n'.format(10 * '*', 10 * '*'))
-                if outs == 1:
-                    # find out how many nans were present from start of data until lookback, these nans will be removed
-                    self.nans_removed_4m_st = np.isnan(data[:, -outs:][0:lookback]).sum()
-                nan_idx = np.isnan(label_y) if outs == 1 else np.isnan(label_y[:, 0])  # y.isna()
-                # nan_idx_t = nan_idx[self.lookback - 1:]
-                # non_nan_idx = ~nan_idx_t.values
-                non_nan_idx = np.array([all(i.reshape(-1,)) for i in np.invert(nan_idx)])
-                label_y = label_y[non_nan_idx]
-                input_x = input_x[non_nan_idx]
-                input_y = input_y[non_nan_idx]
 
+            if allow_nan_labels < 2:
+                keep, self.dropped_examples = label_mask(label_y, allow_nan_labels)
+                label_y = label_y[keep]
+                input_x = input_x[keep]
+                input_y = input_y[keep]
+
+                if self.verbosity > 0:
+                    print(f"Removed {len(self.dropped_examples)} examples with nan labels")
+
+            if allow_nan_labels == 0:
                 assert np.isnan(label_y).sum() < 1, "label still contains {} nans".format(np.isnan(label_y).sum())
 
         assert input_x.shape[0] == input_y.shape[0] == label_y.shape[0], "shapes are not same"
@@ -2266,14 +2667,118 @@ while the targets in prepared have shape {outputs.shape[1:]}."""
             print("{} Successfully loaded weights from {} file {}".format('*' * 10, weight_file, '*' * 10))
         return
 
-    def write_cache(self, _fname, input_x, input_y, label_y):
+    def save_artifact(self, fname: str = None, compress: int = 3) -> str:
+        """
+        Saves everything which is needed to make predictions from the model in a
+        single file which can be loaded by `Model.load`. The file contains the
+        config, the fitted scalers of `Transformations`, the input columns and
+        the parameters of the model i.e. the weights of neural network or the
+        fitted ML model. The imputation of missing inputs is defined by the
+        `input_nans` of config because the imputers are fitted on the data
+        which is being imputed.
+        Arguments:
+            fname str: path of the file. Default is `model.joblib` in model's path.
+            compress int: compression level of the file, passed to joblib.dump.
+        return:
+            the path of saved file
+        """
+        if fname is None:
+            fname = os.path.join(self.path, 'model.joblib')
+
+        if self.category.upper() == "DL":
+            weights = self._model.get_weights()
+        else:
+            weights = self._model
+
+        artifact = {
+            'artifact_version': ARTIFACT_VERSION,
+            'model_class': self.__class__.__name__,
+            'config': self.config,
+            'in_cols': self.in_cols,
+            'out_cols': self.out_cols,
+            'scalers': self.scalers,
+            'train_indices': getattr(self, 'train_indices', None),
+            'test_indices': getattr(self, 'test_indices', None),
+            'weights': weights,
+        }
+        joblib.dump(artifact, fname, compress=compress)
+        return fname
+
+    @classmethod
+    def load(cls, fname: str, path: str = None, verbosity: int = 0, **kwargs):
+        """
+        Loads the model from a file written by `save_artifact`. The model is built
+        from the saved config and its parameters and scalers are restored, so no
+        data is needed and no data is prepared. The loaded model can make predictions
+        with `predict` after providing data or with `predict_on_window`.
+        Arguments:
+            fname str: path of file written by `save_artifact`
+            path str: path where the results of loaded model are saved. Default is the
+                directory of `fname`.
+            verbosity int:
+            kwargs dict: any argument of Model which overwrites the saved config.
+        return:
+            Model
+        """
+        artifact = joblib.load(fname)
+
+        if artifact.get('artifact_version') != ARTIFACT_VERSION:
+            raise ValueError(f"{fname} is not a model artifact of version {ARTIFACT_VERSION}")
+        if artifact['model_class'] != cls.__name__:
+            warnings.warn(f"{fname} was saved by {artifact['model_class']} but is being loaded by {cls.__name__}")
+
+        config = dict(artifact['config'])
+        config.update({'inputs': artifact['in_cols'], 'outputs': artifact['out_cols']})
+        config.update(kwargs)
+
+        # the attributes are set on instance before __init__, so that the config is not saved again
+        # by `build` and the other Models are not affected.
+        model = cls.__new__(cls)
+        model.from_check_point = True
+        model.allow_weight_loading = True
+        model.train_indices = artifact['train_indices']
+        model.test_indices = artifact['test_indices']
+        model.__init__(data=None,
+                       path=path if path is not None else os.path.dirname(os.path.abspath(fname)),
+                       verbosity=verbosity,
+                       **config)
+
+        model.scalers = artifact['scalers']
+        if model.category.upper() == "DL":
+            model._model.set_weights(artifact['weights'])
+        else:
+            model._model = artifact['weights']
+
+        return model
+
+    def write_cache(self, _fname, input_x, input_y, label_y, fmt: str = 'h5'):
+        """
+        Writes the examples in h5 file or, if `fmt` is `npy`, as npy files in
+        `_fname` directory. The written examples can be streamed back by passing
+        the path as `data` to `fit` or `predict`.
+        """
+        if isinstance(input_x, list):
+            # `train_data` returns the inputs as list even when the model has one input layer
+            if len(input_x) > 1:
+                raise NotImplementedError("examples for more than one input layer can not be cached")
+            input_x = input_x[0]
+
         fname = os.path.join(self.path, _fname)
+        if fmt == 'npy':
+            if os.path.isfile(fname):
+                raise FileExistsError(f"npy files are written in a directory but {fname} is a file")
+            if not os.path.exists(fname):
+                os.makedirs(fname)
+            for name, array in zip(['input_X', 'input_Y', 'label_Y'], [input_x, input_y, label_y]):
+                np.save(os.path.join(fname, name + '.npy'), array)
+            return fname
+
         h5 = h5py.File(fname, 'w')
         h5.create_dataset('input_X', data=input_x)
         h5.create_dataset('input_Y', data=input_y)
         h5.create_dataset('label_Y', data=label_y)
         h5.close()
-        return
+        return fname
 
     def eda(self, freq=None, cols=None, **kwargs):
         """Performs comprehensive Exploratory Data Analysis.
@@ -2385,12 +2890,26 @@ def impute_df(df: pd.DataFrame, how: str, **kwargs):
         for col in df.columns:
             df[col] = getattr(df[col], how)(**kwargs)
     else:
-        imputer = imputations[how.upper()](**kwargs)
+        imputer = backend.imputations[how.upper()](**kwargs)
         df = imputer.fit_transform(df.values)
 
     return df
 
 
+def _apply_scaler(scaler, x: np.ndarray, inverse: bool = False, replace_zeros: bool = False) -> np.ndarray:
+    """Transforms `x` with a fitted scaler of `Transformations`. The unknown values in `x` can be nan,
+    therefore the functions of FunctionTransformer are called directly without validation."""
+    if isinstance(scaler, FunctionTransformer):
+        func, kw_args = (scaler.inverse_func, scaler.inv_kw_args) if inverse else (scaler.func, scaler.kw_args)
+        out = func(x, **(kw_args or {}))
+    else:
+        out = scaler.inverse_transform(x) if inverse else scaler.transform(x)
+
+    if replace_zeros:  # zeros are put back as is done by `Transformations`
+        out[x == 0.0] = 0.0
+    return out
+
+
 def unison_shuffled_copies(a, b, c):
     """makes sure that all the arrays are permuted similarly"""
     assert len(a) == len(b) == len(c)
@@ -2,52 +2,121 @@
 
 import tensorflow as tf
 
-#@tf.function
-def train_step(keras_model, data):
-    if int(''.join(tf.__version__.split('.')[0:2])) < 23:
-        raise NotImplementedError(f"ignoring nan in labels can not be done in tf version {tf.__version__}")
-    # Unpack the data. Its structure depends on your model and
-    # on what you pass to `fit()`.
-    x, y = data
-    # TODO, in graph mode, masking of nans does not work
+try:
+    from tensorflow.keras.utils import unpack_x_y_sample_weight
+except ImportError:  # it became public in tf 2.4
+    from tensorflow.python.keras.engine.data_adapter import unpack_x_y_sample_weight
 
-    with tf.GradientTape() as tape:
-        y_pred = keras_model(x, training=True)  # Forward pass
+# keras losses which reduce only the last axis i.e. they are mean of the losses of individual labels
+ELEMENTWISE_LOSSES = ['mean_squared_error', 'mean_absolute_error', 'mean_absolute_percentage_error',
+                      'mean_squared_logarithmic_error', 'huber', 'huber_loss', 'log_cosh', 'logcosh',
+                      'binary_crossentropy', 'hinge', 'squared_hinge', 'poisson']
+
+
+def nan_mask(y, mask=None):
+    """Returns the mask of valid (non-nan) labels as float and the labels with nans replaced by zeros.
+    If `mask` is given, the labels where it is zero are treated as missing as well."""
+    valid = tf.math.logical_not(tf.math.is_nan(y))
+    if mask is not None:
+        valid = tf.math.logical_and(valid, tf.greater(tf.cast(mask, y.dtype), 0.0))
+    return tf.cast(valid, y.dtype), tf.where(valid, y, tf.zeros_like(y))
+
+
+def masked_loss(loss_fn, y_true, y_pred, mask):
+    """
+    Calculates the loss only at the labels where `mask` is 1. For keras losses,
+    which reduce only the last axis, the loss of every label is calculated and
+    then averaged with `mask` as weights, so that the shape of tensors does not
+    depend upon the number of missing labels and the calculation can be
+    compiled with XLA. Other losses, such as nse and kge, which reduce the
+    whole arrays are calculated on the valid labels only.
+    """
+    if isinstance(loss_fn, str):
+        loss_fn = tf.keras.losses.get(loss_fn)
+    name = getattr(getattr(loss_fn, 'fn', loss_fn), '__name__', '')
+    if isinstance(loss_fn, tf.keras.losses.Loss):
+        loss_fn = loss_fn.call  # un-reduced loss
+
+    y_pred = tf.cast(y_pred, y_true.dtype)
+    if name in ELEMENTWISE_LOSSES:
+        losses = loss_fn(tf.expand_dims(y_true, -1), tf.expand_dims(y_pred, -1))  # loss of every label
+        losses = tf.reshape(tf.cast(losses, mask.dtype), tf.shape(mask))
+        return tf.math.divide_no_nan(tf.reduce_sum(losses * mask), tf.reduce_sum(mask))
+
+    valid = tf.greater(mask, 0.0)
+    return loss_fn(tf.boolean_mask(y_true, valid), tf.boolean_mask(y_pred, valid))
+
+
+def jit_compiled(fn):
+    """Returns `fn` as a tf.function which is compiled with XLA. The argument
+    `jit_compile` of tf.function was called `experimental_compile` before tf 2.5."""
+    try:
+        return tf.function(fn, jit_compile=True)
+    except TypeError:
+        return tf.function(fn, experimental_compile=True)
+
+
+def _unpack(data):
+    x, y, mask = unpack_x_y_sample_weight(data)
+    mask, y = nan_mask(y, mask)
+    return x, y, mask
 
-        mask = tf.greater(y, 0.0)
-        true_y = tf.boolean_mask(y, mask)
-        pred_y = tf.boolean_mask(y_pred, mask)
 
-        # Compute the loss value
-        # (the loss function is configured in `compile()`)
-        loss = keras_model.compiled_loss(true_y, pred_y, regularization_losses=keras_model.losses)
+def _update_metrics(keras_model, loss, y, y_pred, mask):
+    # the loss tracker of compiled loss is updated with the masked loss
+    if not keras_model.compiled_loss.built:
+        keras_model.compiled_loss.build(y_pred)
+    for metric in keras_model.compiled_loss.metrics:
+        metric.update_state(loss, sample_weight=tf.shape(y)[0])
+
+    valid = tf.greater(mask, 0.0)
+    keras_model.compiled_metrics.update_state(tf.boolean_mask(y, valid),
+                                              tf.boolean_mask(tf.cast(y_pred, y.dtype), valid))
+    return {m.name: m.result() for m in keras_model.metrics}
+
+
+def fit_batch(keras_model, x, y, mask):
+    """Forward and backward pass of `train_step` which returns the loss and predictions.
+    For elementwise losses, the shapes of all tensors are static, so this can be
+    compiled with XLA by wrapping it with `jit_compiled`."""
+    with tf.GradientTape() as tape:
+        y_pred = keras_model(x, training=True)  # Forward pass
+        loss = masked_loss(keras_model.loss, y, y_pred, mask)
+        if keras_model.losses:
+            loss = loss + tf.add_n(keras_model.losses)
 
     # Compute gradients
     trainable_vars = keras_model.trainable_variables
     gradients = tape.gradient(loss, trainable_vars)
     # Update weights
     keras_model.optimizer.apply_gradients(zip(gradients, trainable_vars))
-    # Update metrics (includes the metric that tracks the loss)
-    keras_model.compiled_metrics.update_state(true_y, pred_y)
-    # Return a dict mapping metric names to current value
-    return {m.name: m.result() for m in keras_model.metrics}
+    return loss, y_pred
 
 
-#@tf.function
-def test_step(keras_model, data):
-    if int(''.join(tf.__version__.split('.')[0:2])) < 23:
-        raise NotImplementedError(f"ignoring nan in labels can not be done in tf version {tf.__version__}")
-    print('custom test_step')
-    x, y = data
+def train_step(keras_model, data, fit_batch_fn=fit_batch):
+    """
+    Training step which ignores the missing labels. The mask of valid labels
+    is either passed alongside `y` as sample weights i.e. data is (x, y, mask),
+    or is found from the nans in `y`. Since the loss is reduced with the mask
+    as weights, the step is run by keras in graph mode. The metrics are calculated
+    on valid labels only, whose number varies from batch to batch, so only
+    `fit_batch_fn` can be compiled with XLA e.g.
+    `functools.partial(train_step, fit_batch_fn=jit_compiled(fit_batch))`.
+    """
+    x, y, mask = _unpack(data)
 
-    y_pred = keras_model(x, training=False)  # compute predictions
+    loss, y_pred = fit_batch_fn(keras_model, x, y, mask)
 
-    mask = tf.greater(y, 0.0)
-    true_y = tf.boolean_mask(y, mask)
-    pred_y = tf.boolean_mask(y_pred, mask)
+    return _update_metrics(keras_model, loss, y, y_pred, mask)
 
-    keras_model.compiled_loss(true_y, pred_y, regularization_losses=keras_model.losses)
 
-    keras_model.compiled_metrics.update_state(true_y, pred_y)
+def test_step(keras_model, data):
+    """Evaluation step which ignores the missing labels, same as `train_step`."""
+    x, y, mask = _unpack(data)
+
+    y_pred = keras_model(x, training=False)  # compute predictions
+    loss = masked_loss(keras_model.loss, y, y_pred, mask)
+    if keras_model.losses:
+        loss = loss + tf.add_n(keras_model.losses)
 
-    return {m.name: m.result() for m in keras_model.metrics}
\ No newline at end of file
+    return _update_metrics(keras_model, loss, y, y_pred, mask)
@@ -1,14 +1,13 @@
 import json
 import warnings
+import functools
 import numpy as np
-from math import sqrt
 from typing import Union
-from scipy.stats import gmean, kendalltau
+from scipy.stats import kendalltau
 
 from AI4Water.utils.utils import ts_features
-from AI4Water.utils.SeqMetrics.utils import _geometric_mean, _mean_tweedie_deviance, _foo, list_subclass_methods
+from AI4Water.utils.SeqMetrics.utils import _tweedie_deviance, list_subclass_methods
 
-# TODO remove repeated calculation of mse, std, mean etc
 # TODO make weights, class attribute
 # TODO write tests
 # TODO standardized residual sum of squares
@@ -37,7 +36,20 @@ EPS = 1e-10  # epsilon
 # log normal loss
 # skill score
 
-# TODO multi horizon metrics
+
+def cached_stat(func):
+    """Makes `func` a property whose value is computed only once and stored in
+    `_stats` of the instance. The `_stats` are cleared whenever `true` or
+    `predicted` arrays are set."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self):
+        if name not in self._stats:
+            self._stats[name] = func(self)
+        return self._stats[name]
+
+    return property(wrapper)
 
 
 class Metrics(object):
@@ -52,6 +64,14 @@ class Metrics(object):
     the method `treat_arrays` in order to have the changed values impact on true and
     predicted arrays.
 
+    The statistics which are shared by many metrics e.g. error, squared error,
+    means, standard deviations and sorted arrays are calculated only once and
+    then reused by all the metrics. The arrays must therefore not be modified
+    in place. Setting `true` or `predicted` clears these statistics.
+
+    All the statistics and metrics are reductions along the first axis, which
+    are done by `_sum`, `_mean`, `_std` etc. so that `BatchRegressionMetrics`
+    calculates the same metrics for all columns of 3d arrays at once.
     """
 
     def __init__(self,
@@ -84,6 +104,224 @@ class Metrics(object):
         self.remove_zero = remove_zero
         self.remove_neg = remove_neg
 
+    @property
+    def true(self):
+        return self._true
+
+    @true.setter
+    def true(self, x):
+        self._true = x
+        self._stats = {}
+
+    @property
+    def predicted(self):
+        return self._predicted
+
+    @predicted.setter
+    def predicted(self, x):
+        self._predicted = x
+        self._stats = {}
+
+    @cached_stat
+    def _err(self):
+        return self.true - self.predicted
+
+    @cached_stat
+    def _abs_err(self):
+        return np.abs(self._err)
+
+    @cached_stat
+    def _sq_err(self):
+        return self._err ** 2
+
+    @cached_stat
+    def _sum_err(self):
+        return self._sum(self._err)
+
+    @cached_stat
+    def _sae(self):
+        # sum of absolute errors
+        return self._sum(self._abs_err)
+
+    @cached_stat
+    def _sse(self):
+        # sum of squared errors
+        return self._sum(self._sq_err)
+
+    @cached_stat
+    def _rel_abs_err(self):
+        return np.abs(self._err / self.true)
+
+    @cached_stat
+    def _true_sum(self):
+        return self._sum(self.true)
+
+    @cached_stat
+    def _true_mean(self):
+        return self._mean(self.true)
+
+    @cached_stat
+    def _pred_mean(self):
+        return self._mean(self.predicted)
+
+    @cached_stat
+    def _true_std(self):
+        return self._std(self.true)
+
+    @cached_stat
+    def _pred_std(self):
+        return self._std(self.predicted)
+
+    @cached_stat
+    def _true_std1(self):
+        return self._std(self.true, ddof=1)
+
+    @cached_stat
+    def _pred_std1(self):
+        return self._std(self.predicted, ddof=1)
+
+    @cached_stat
+    def _true_dev(self):
+        # deviation of true from its mean
+        return self.true - self._true_mean
+
+    @cached_stat
+    def _pred_dev(self):
+        return self.predicted - self._pred_mean
+
+    @cached_stat
+    def _abs_true_dev(self):
+        return np.abs(self._true_dev)
+
+    @cached_stat
+    def _sst(self):
+        # total sum of squares of true
+        return self._sum(self._true_dev ** 2)
+
+    @cached_stat
+    def _pred_ss(self):
+        return self._sum(self._pred_dev ** 2)
+
+    @cached_stat
+    def _cross_dev_sum(self):
+        return self._sum(self._true_dev * self._pred_dev)
+
+    @cached_stat
+    def _corr(self):
+        return self._cross_dev_sum / np.sqrt(self._sst * self._pred_ss)
+
+    @cached_stat
+    def _sorted_true(self):
+        return np.sort(self.true, axis=0)
+
+    @cached_stat
+    def _sorted_pred(self):
+        return np.sort(self.predicted, axis=0)
+
+    @cached_stat
+    def _desc_true(self):
+        # sorted in descending order with NaNs at the end as by np.sort
+        return -np.sort(-self.true, axis=0)
+
+    @cached_stat
+    def _desc_pred(self):
+        return -np.sort(-self.predicted, axis=0)
+
+    @cached_stat
+    def _ranks(self):
+        # ordinal ranks of true and predicted, the ties in predicted are broken by rank of true
+        shape = (-1,) + (1,) * (self.true.ndim - 1)
+        ranks = np.broadcast_to(np.arange(1, len(self.true) + 1, dtype=np.float64).reshape(shape), self.true.shape)
+        rank_x = np.empty(self.true.shape)
+        np.put_along_axis(rank_x, np.argsort(self.true, axis=0, kind='stable'), ranks, axis=0)
+        rank_y = np.empty(self.true.shape)
+        np.put_along_axis(rank_y, np.lexsort((rank_x, self.predicted), axis=0), ranks, axis=0)
+        return rank_x, rank_y
+
+    @cached_stat
+    def _true_diff(self):
+        return self.true[1:] - self.true[:-1]
+
+    @cached_stat
+    def _pred_diff(self):
+        return self.predicted[1:] - self.predicted[:-1]
+
+    @cached_stat
+    def _log_true(self):
+        return np.log(self.true)
+
+    @cached_stat
+    def _log_pred(self):
+        return np.log(self.predicted)
+
+    @cached_stat
+    def _log1p_true(self):
+        return np.log1p(self.true)
+
+    @cached_stat
+    def _log1p_pred(self):
+        return np.log1p(self.predicted)
+
+    @cached_stat
+    def _log1p_err(self):
+        return self._log1p_true - self._log1p_pred
+
+    @cached_stat
+    def _willmott_dev(self):
+        # denominator of agreement indices
+        return np.abs(self.predicted - self._true_mean) + self._abs_true_dev
+
+    @cached_stat
+    def _abs_sum(self):
+        return np.abs(self.true) + np.abs(self.predicted)
+
+    @property
+    def _n(self):
+        # number of examples
+        return len(self.true)
+
+    def _sum(self, x):
+        return np.sum(x, axis=0)
+
+    def _mean(self, x):
+        return np.mean(x, axis=0)
+
+    def _average(self, x, weights=None):
+        if weights is None:
+            return self._mean(x)
+        return np.average(x, axis=0, weights=weights)
+
+    def _std(self, x, ddof=0):
+        return np.std(x, axis=0, ddof=ddof)
+
+    def _median(self, x):
+        return np.median(x, axis=0)
+
+    def _percentile(self, x, q):
+        return np.percentile(x, q, axis=0)
+
+    def _max(self, x):
+        return np.max(x, axis=0)
+
+    def _min(self, x):
+        return np.min(x, axis=0)
+
+    def _result(self, value, defined=True):
+        """The value of a metric as float or None if the metric is not defined."""
+        return float(value) if defined else None
+
+    @staticmethod
+    def _r2_score(numerator, denominator):
+        # 1 - numerator / denominator and 0 where only the denominator is zero
+        return np.where(denominator != 0, 1 - numerator / np.where(denominator != 0, denominator, 1), 0.)
+
+    def _naive_mae(self, seasonality: int = 1) -> float:
+        """mae of naive forecast which repeats previous samples"""
+        key = f"_naive_mae_{seasonality}"
+        if key not in self._stats:
+            self._stats[key] = self.mae(self.true[seasonality:], self._naive_prognose(seasonality))
+        return self._stats[key]
+
     @property
     def replace_nan(self):
         return self._replace_nan
@@ -191,6 +429,8 @@ class Metrics(object):
 
     def _error(self, true=None, predicted=None):
         """ simple difference """
+        if true is None and predicted is None:
+            return self._err
         if true is None:
             true = self.true
         if predicted is None:
@@ -201,7 +441,9 @@ class Metrics(object):
         """
         Percentage error
         """
-        return self._error() / (self.true + EPS) * 100
+        if '_percentage_error' not in self._stats:
+            self._stats['_percentage_error'] = self._err / (self.true + EPS) * 100
+        return self._stats['_percentage_error']
 
     def _naive_prognose(self, seasonality: int = 1):
         """ Naive forecasting method which just repeats previous samples """
@@ -209,12 +451,14 @@ class Metrics(object):
 
     def _relative_error(self, benchmark: np.ndarray = None):
         """ Relative Error """
-        if benchmark is None or isinstance(benchmark, int):
+        if benchmark is None:
+            if '_relative_error' not in self._stats:
+                self._stats['_relative_error'] = self._relative_error(1)
+            return self._stats['_relative_error']
+
+        if isinstance(benchmark, int):
             # If no benchmark prediction provided - use naive forecasting
-            if not isinstance(benchmark, int):
-                seasonality = 1
-            else:
-                seasonality = benchmark
+            seasonality = benchmark
             return self._error(self.true[seasonality:], self.predicted[seasonality:]) / \
                    (self._error(self.true[seasonality:], self._naive_prognose(seasonality)) + EPS)
 
@@ -222,12 +466,14 @@ class Metrics(object):
 
     def _bounded_relative_error(self, benchmark: np.ndarray = None):
         """ Bounded Relative Error """
-        if benchmark is None or isinstance(benchmark, int):
+        if benchmark is None:
+            if '_bounded_relative_error' not in self._stats:
+                self._stats['_bounded_relative_error'] = self._bounded_relative_error(1)
+            return self._stats['_bounded_relative_error']
+
+        if isinstance(benchmark, int):
             # If no benchmark prediction provided - use naive forecasting
-            if not isinstance(benchmark, int):
-                seasonality = 1
-            else:
-                seasonality = benchmark
+            seasonality = benchmark
 
             abs_err = np.abs(self._error(self.true[seasonality:], self.predicted[seasonality:]))
             abs_err_bench = np.abs(self._error(self.true[seasonality:], self._naive_prognose(seasonality)))
@@ -239,7 +485,15 @@ class Metrics(object):
 
     def _ae(self):
         """Absolute error """
-        return np.abs(self.true - self.predicted)
+        return self._abs_err
+
+    @staticmethod
+    def _scaled_fdc(array, sorted_array):
+        """flow duration curve of array normalized by its mean and length"""
+        scale = np.nanmean(array, axis=0) * len(array)
+        if np.all(scale > 0):  # scaling by a positive number does not change the order
+            return sorted_array / scale
+        return np.sort(array / scale, axis=0)
 
     def scale_free_metrics(self):
             pass
@@ -416,25 +670,23 @@ class RegressionMetrics(Metrics):
         """
     def abs_pbias(self) -> float:
         """ Absolute Percent bias"""
-        _apb = 100.0 * sum(abs(self.predicted - self.true)) / sum(self.true)  # Absolute percent bias
-        return float(_apb)
+        _apb = 100.0 * self._sae / self._true_sum  # Absolute percent bias
+        return self._result(_apb)
 
     def acc(self) -> float:
         """Anomaly correction coefficient.
         Reference: Langland et al., 2012. Miyakoda et al., 1972. Murphy et al., 1989."""
-        a = self.predicted - np.mean(self.predicted)
-        b = self.true - np.mean(self.true)
-        c = np.std(self.true, ddof=1) * np.std(self.predicted, ddof=1) * self.predicted.size
-        return float(np.dot(a, b / c))
+        c = self._true_std1 * self._pred_std1 * self._n
+        return self._result(self._cross_dev_sum / c)
 
     def adjusted_r2(self) -> float:
         """
         Adjusted R squared
         """
         k = 1
-        n = len(self.predicted)
+        n = self._n
         adj_r = 1 - ((1 - self.r2()) * (n - 1)) / (n - k - 1)
-        return float(adj_r)
+        return self._result(adj_r)
 
     def agreement_index(self) -> float:
         """
@@ -449,9 +701,8 @@ class RegressionMetrics(Metrics):
         [1] Moriasi et al., 2015
         [2] Legates and McCabe, 199
         """
-        agreement_index = 1 - (np.sum((self.true - self.predicted) ** 2)) / (np.sum(
-            (np.abs(self.predicted - np.mean(self.true)) + np.abs(self.true - np.mean(self.true))) ** 2))
-        return float(agreement_index)
+        agreement_index = 1 - self._sse / self._sum(self._willmott_dev ** 2)
+        return self._result(agreement_index)
 
     def aic(self, p=1) -> float:
         """
@@ -461,39 +712,37 @@ class RegressionMetrics(Metrics):
         assert p > 0
         self.assert_greater_than_one  # noac
 
-        n = len(self.true)
-        resid = np.subtract(self.predicted, self.true)
-        rss = np.sum(np.power(resid, 2))
-        return float(n * np.log(rss / n) + 2 * p)
+        n = self._n
+        return self._result(n * np.log(self._sse / n) + 2 * p)
 
     def aitchison(self, center='mean') -> float:
         """ Aitchison distance. used in https://hess.copernicus.org/articles/24/2505/2020/hess-24-2505-2020.pdf"""
-        lx = np.log(self.true)
-        ly = np.log(self.predicted)
+        lx = self._log_true
+        ly = self._log_pred
         if center.upper() == 'MEAN':
-            m = np.mean
+            m = self._mean
         elif center.upper() == 'MEDIAN':
-            m = np.median
+            m = self._median
         else:
             raise ValueError
 
         clr_x = lx - m(lx)
         clr_y = ly - m(ly)
-        d = (sum((clr_x - clr_y) ** 2)) ** 0.5
-        return float(d)
+        d = (self._sum((clr_x - clr_y) ** 2)) ** 0.5
+        return self._result(d)
 
     def amemiya_adj_r2(self) -> float:
         """Amemiya’s Adjusted R-squared"""
         k = 1
-        n = len(self.predicted)
+        n = self._n
         adj_r = 1 - ((1 - self.r2()) * (n + k)) / (n - k - 1)
-        return float(adj_r)
+        return self._result(adj_r)
 
     def amemiya_pred_criterion(self) -> float:
         """Amemiya’s Prediction Criterion"""
         k = 1
-        n = len(self.predicted)
-        return float(((n + k) / (n - k)) * (1/n) * self.sse())
+        n = self._n
+        return self._result(((n + k) / (n - k)) * (1/n) * self.sse())
 
     def bias(self) -> float:
         """
@@ -501,8 +750,8 @@ class RegressionMetrics(Metrics):
             .. math::
             Bias=\\frac{1}{N}\\sum_{i=1}^{N}(e_{i}-s_{i})
         """
-        bias = np.nansum(self.true - self.predicted) / len(self.true)
-        return float(bias)
+        bias = np.nansum(self._err, axis=0) / self._n
+        return self._result(bias)
 
     def bic(self, p=1) -> float:
         """
@@ -516,8 +765,8 @@ class RegressionMetrics(Metrics):
         """
         assert p >= 0
 
-        n = len(self.true)
-        return float(n * np.log(self.sse() / n) + p * np.log(n))
+        n = self._n
+        return self._result(n * np.log(self.sse() / n) + p * np.log(n))
 
     def brier_score(self) -> float:
         """
@@ -567,8 +816,8 @@ class RegressionMetrics(Metrics):
             r = \\frac{\\sum ^n _{i=1}(e_i - \\bar{e})(s_i - \\bar{s})}{\\sqrt{\\sum ^n _{i=1}(e_i - \\bar{e})^2}
              \\sqrt{\\sum ^n _{i=1}(s_i - \\bar{s})^2}}
         """
-        correlation_coefficient = np.corrcoef(self.true, self.predicted)[0, 1]
-        return float(correlation_coefficient)
+        correlation_coefficient = self._corr
+        return self._result(correlation_coefficient)
 
     def covariance(self) -> float:
         """
@@ -576,10 +825,8 @@ class RegressionMetrics(Metrics):
             .. math::
             Covariance = \\frac{1}{N} \\sum_{i=1}^{N}((e_{i} - \\bar{e}) * (s_{i} - \\bar{s}))
         """
-        obs_mean = np.mean(self.true)
-        sim_mean = np.mean(self.predicted)
-        covariance = np.mean((self.true - obs_mean) * (self.predicted - sim_mean))
-        return float(covariance)
+        covariance = self._cross_dev_sum / self._n
+        return self._result(covariance)
 
     def cronbach_alpha(self) -> float:
         """
@@ -587,11 +834,10 @@ class RegressionMetrics(Metrics):
         https://stats.idre.ucla.edu/spss/faq/what-does-cronbachs-alpha-mean/
         https://stackoverflow.com/a/20799687/5982232
         """
-        itemscores = np.stack([self.true, self.predicted])
-        itemvars = itemscores.var(axis=1, ddof=1)
-        tscores = itemscores.sum(axis=0)
-        nitems = len(itemscores)
-        return float(nitems / (nitems - 1.) * (1 - itemvars.sum() / tscores.var(ddof=1)))
+        itemvars = self._true_std1 ** 2 + self._pred_std1 ** 2
+        tscores = self.true + self.predicted
+        nitems = 2
+        return self._result(nitems / (nitems - 1.) * (1 - itemvars / self._std(tscores, ddof=1) ** 2))
 
     def centered_rms_dev(self) -> float:
         """
@@ -605,16 +851,12 @@ class RegressionMetrics(Metrics):
         Output:
         CRMSDIFF : centered root-mean-square (RMS) difference (E')^2
         """
-        # Calculate means
-        pmean = np.mean(self.predicted)
-        rmean = np.mean(self.true)
-
         # Calculate (E')^2
-        crmsd = np.square((self.predicted - pmean) - (self.true - rmean))
-        crmsd = np.sum(crmsd) / self.predicted.size
+        crmsd = np.square(self._pred_dev - self._true_dev)
+        crmsd = self._sum(crmsd) / self._n
         crmsd = np.sqrt(crmsd)
 
-        return float(crmsd)
+        return self._result(crmsd)
 
     def decomposed_mse(self) -> float:
         """
@@ -625,8 +867,8 @@ class RegressionMetrics(Metrics):
             LCS = 2 \\sigma(e) \\sigma(s) * (1 - \\frac{\\sum ^n _{i=1}(e_i - \\bar{e})(s_i - \\bar{s})}
             {\\sqrt{\\sum ^n _{i=1}(e_i - \\bar{e})^2} \\sqrt{\\sum ^n _{i=1}(s_i - \\bar{s})^2}})
         """
-        e_std = np.std(self.true)
-        s_std = np.std(self.predicted)
+        e_std = self._true_std
+        s_std = self._pred_std
 
         bias_squared = self.bias() ** 2
         sdsd = (e_std - s_std) ** 2
@@ -634,14 +876,14 @@ class RegressionMetrics(Metrics):
 
         decomposed_mse = bias_squared + sdsd + lcs
 
-        return float(decomposed_mse)
+        return self._result(decomposed_mse)
 
     def euclid_distance(self) -> float:
         """Euclidian distance
 
         Referneces: Kennard et al., 2010
         """
-        return float(np.linalg.norm(self.true - self.predicted))
+        return self._result(np.sqrt(self._sse))
 
     def exp_var_score(self, weights=None) -> Union[float, None]:
         """
@@ -649,19 +891,19 @@ class RegressionMetrics(Metrics):
         https://stackoverflow.com/questions/24378176/python-sci-kit-learn-metrics-difference-between-r2-score-and-explained-varian
         best value is 1, lower values are less accurate.
         """
-        y_diff_avg = np.average(self.true - self.predicted, weights=weights, axis=0)
-        numerator = np.average((self.true - self.predicted - y_diff_avg) ** 2,
-                               weights=weights, axis=0)
-
-        y_true_avg = np.average(self.true, weights=weights, axis=0)
-        denominator = np.average((self.true - y_true_avg) ** 2,
-                                 weights=weights, axis=0)
+        if weights is None:
+            numerator = self._std(self._err) ** 2
+            denominator = self._sst / self._n
+        else:
+            y_diff_avg = np.average(self._err, weights=weights, axis=0)
+            numerator = np.average((self._err - y_diff_avg) ** 2,
+                                   weights=weights, axis=0)
 
-        if numerator == 0.0:
-            return None
-        output_scores = _foo(denominator, numerator)
+            y_true_avg = np.average(self.true, weights=weights, axis=0)
+            denominator = np.average((self.true - y_true_avg) ** 2,
+                                     weights=weights, axis=0)
 
-        return float(np.average(output_scores, weights=weights))
+        return self._result(self._r2_score(numerator, denominator), defined=numerator != 0.0)
 
     def expanded_uncertainty(self, cov_fact=1.96) -> float:
         """By default it calculates uncertainty with 95% confidence interval. 1.96 is the coverage factor
@@ -671,8 +913,8 @@ class RegressionMetrics(Metrics):
         [1] https://doi.org/10.1016/j.enconman.2015.03.067
         [2] https://doi.org/10.1016/j.rser.2014.07.117
         """
-        sd = np.std(self._error(self.true, self.predicted))
-        return float(cov_fact * np.sqrt(sd ** 2 + self.rmse() ** 2))
+        sd = self._std(self._err)
+        return self._result(cov_fact * np.sqrt(sd ** 2 + self.rmse() ** 2))
 
     def fdc_fhv(self, h: float = 0.02) -> float:
         """
@@ -694,16 +936,16 @@ class RegressionMetrics(Metrics):
             raise RuntimeError("h has to be in the range (0,1)")
 
         # sort both in descending order
-        obs = -np.sort(-self.true)
-        sim = -np.sort(-self.predicted)
+        obs = self._desc_true
+        sim = self._desc_pred
 
         # subset data to only top h flow values
         obs = obs[:np.round(h * len(obs)).astype(int)]
         sim = sim[:np.round(h * len(sim)).astype(int)]
 
-        fhv = np.sum(sim - obs) / (np.sum(obs) + 1e-6)
+        fhv = self._sum(sim - obs) / (self._sum(obs) + 1e-6)
 
-        return float(fhv * 100)
+        return self._result(fhv * 100)
 
     def fdc_flv(self, low_flow: float = 0.3) -> float:
         """
@@ -728,20 +970,17 @@ class RegressionMetrics(Metrics):
         """
 
         low_flow = 1.0 - low_flow
-        # make sure that metric is calculated over the same dimension
-        obs = self.true.flatten()
-        sim = self.predicted.flatten()
 
         if (low_flow <= 0) or (low_flow >= 1):
             raise RuntimeError("l has to be in the range (0,1)")
 
         # for numerical reasons change 0s to 1e-6
-        sim[sim == 0] = 1e-6
-        obs[obs == 0] = 1e-6
+        sim = np.where(self.predicted == 0, 1e-6, self.predicted)
+        obs = np.where(self.true == 0, 1e-6, self.true)
 
         # sort both in descending order
-        obs = -np.sort(-obs)
-        sim = -np.sort(-sim)
+        obs = -np.sort(-obs, axis=0)
+        sim = -np.sort(-sim, axis=0)
 
         # subset data to only top h flow values
         obs = obs[np.round(low_flow * len(obs)).astype(int):]
@@ -752,43 +991,39 @@ class RegressionMetrics(Metrics):
         sim = np.log(sim + 1e-6)
 
         # calculate flv part by part
-        qsl = np.sum(sim - sim.min())
-        qol = np.sum(obs - obs.min())
+        qsl = self._sum(sim - self._min(sim))
+        qol = self._sum(obs - self._min(obs))
 
         flv = -1 * (qsl - qol) / (qol + 1e-6)
 
-        return float(flv * 100)
+        return self._result(flv * 100)
 
     def gmae(self) -> float:
         """ Geometric Mean Absolute Error """
-        return _geometric_mean(np.abs(self._error()))
+        return self._result(np.exp(self._mean(np.log(self._abs_err))))
 
     def gmean_diff(self) -> float:
         """Geometric mean difference. First geometric mean is calculated for each of two samples and their difference
         is calculated."""
-        sim_log = np.log1p(self.predicted)
-        obs_log = np.log1p(self.true)
-        return float(np.exp(gmean(sim_log) - gmean(obs_log)))
+        gmean_pred = np.exp(self._mean(np.log(self._log1p_pred)))
+        gmean_true = np.exp(self._mean(np.log(self._log1p_true)))
+        return self._result(np.exp(gmean_pred - gmean_true))
 
     def gmrae(self, benchmark: np.ndarray = None) -> float:
         """ Geometric Mean Relative Absolute Error """
-        return _geometric_mean(np.abs(self._relative_error(benchmark)))
+        return self._result(np.exp(self._mean(np.log(np.abs(self._relative_error(benchmark))))))
 
     def inrse(self) -> float:
         """ Integral Normalized Root Squared Error """
-        return float(np.sqrt(np.sum(np.square(self._error())) / np.sum(np.square(self.true - np.mean(self.true)))))
+        return self._result(np.sqrt(self._sse / self._sst))
 
     def irmse(self) -> float:
         """Inertial RMSE. RMSE divided by standard deviation of the gradient of true."""
-        # Getting the gradient of the observed data
-        obs_len = self.true.size
-        obs_grad = self.true[1:obs_len] - self.true[0:obs_len - 1]
-
-        # Standard deviation of the gradient
-        obs_grad_std = np.std(obs_grad, ddof=1)
+        # Standard deviation of the gradient of the observed data
+        obs_grad_std = self._std(self._true_diff, ddof=1)
 
         # Divide RMSE by the standard deviation of the gradient of the observed data
-        return float(self.rmse() / obs_grad_std)
+        return self._result(self.rmse() / obs_grad_std)
 
     def JS(self) -> float:
         """Jensen-shannon divergence"""
@@ -797,8 +1032,8 @@ class RegressionMetrics(Metrics):
         d2 = self.predicted * np.log2(2 * self.predicted / (self.true + self.predicted))
         d1[np.isnan(d1)] = 0
         d2[np.isnan(d2)] = 0
-        d = 0.5 * sum(d1 + d2)
-        return float(d)
+        d = 0.5 * self._sum(d1 + d2)
+        return self._result(d)
 
     def kendaull_tau(self, return_p=False):
         """Kendall's tau
@@ -808,7 +1043,7 @@ class RegressionMetrics(Metrics):
         coef, p = kendalltau(self.true, self.predicted)
         if return_p:
             return coef, p
-        return p
+        return float(p)
 
     def kge(self, return_all=False):
         """
@@ -821,10 +1056,10 @@ class RegressionMetrics(Metrics):
             alpha: ratio of the standard deviation
             beta: ratio of the mean
         """
-        cc = np.corrcoef(self.true, self.predicted)[0, 1]
-        alpha = np.std(self.predicted) / np.std(self.true)
-        beta = np.sum(self.predicted) / np.sum(self.true)
-        kge = float(1 - np.sqrt((cc - 1) ** 2 + (alpha - 1) ** 2 + (beta - 1) ** 2))
+        cc = self._corr
+        alpha = self._pred_std / self._true_std
+        beta = self._sum(self.predicted) / self._true_sum
+        kge = self._result(1 - np.sqrt((cc - 1) ** 2 + (alpha - 1) ** 2 + (beta - 1) ** 2))
         if return_all:
             return np.vstack((kge, cc, alpha, beta))
         else:
@@ -835,28 +1070,26 @@ class RegressionMetrics(Metrics):
         Bounded Version of the Original Kling-Gupta Efficiency
         https://iahs.info/uploads/dms/13614.21--211-219-41-MATHEVET.pdf
         """
-        kge_ = self.kge(return_all=True)[0, :]
+        kge_ = self.kge()
         kge_c2m_ = kge_ / (2 - kge_)
 
-        return float(kge_c2m_)
+        return self._result(kge_c2m_)
 
     def kge_mod(self, return_all=False):
         """
         Modified Kling-Gupta Efficiency (Kling et al. 2012 - https://doi.org/10.1016/j.jhydrol.2012.01.011)
         """
         # calculate error in timing and dynamics r (Pearson's correlation coefficient)
-        sim_mean = np.mean(self.predicted, axis=0, dtype=np.float64)
-        obs_mean = np.mean(self.true, dtype=np.float64)
-        r = np.sum((self.predicted - sim_mean) * (self.true - obs_mean), axis=0, dtype=np.float64) / \
-            np.sqrt(np.sum((self.predicted - sim_mean) ** 2, axis=0, dtype=np.float64) *
-                    np.sum((self.true - obs_mean) ** 2, dtype=np.float64))
+        r = self._corr
+
         # calculate error in spread of flow gamma (avoiding cross correlation with bias by dividing by the mean)
-        gamma = (np.std(self.predicted, axis=0, dtype=np.float64) / sim_mean) / \
-                (np.std(self.true, dtype=np.float64) / obs_mean)
+        gamma = (self._pred_std / self._pred_mean) / (self._true_std / self._true_mean)
+
         # calculate error in volume beta (bias of mean discharge)
-        beta = np.mean(self.predicted, axis=0, dtype=np.float64) / np.mean(self.true, axis=0, dtype=np.float64)
+        beta = self._pred_mean / self._true_mean
+
         # calculate the modified Kling-Gupta Efficiency KGE'
-        kgeprime_ = float(1 - np.sqrt((r - 1) ** 2 + (gamma - 1) ** 2 + (beta - 1) ** 2))
+        kgeprime_ = self._result(1 - np.sqrt((r - 1) ** 2 + (gamma - 1) ** 2 + (beta - 1) ** 2))
 
         if return_all:
             return np.vstack((kgeprime_, r, gamma, beta))
@@ -879,12 +1112,12 @@ class RegressionMetrics(Metrics):
         # # self-made formula
         cc = self.spearmann_corr()
 
-        fdc_sim = np.sort(self.predicted / (np.nanmean(self.predicted) * len(self.predicted)))
-        fdc_obs = np.sort(self.true / (np.nanmean(self.true) * len(self.true)))
-        alpha = 1 - 0.5 * np.nanmean(np.abs(fdc_sim - fdc_obs))
+        fdc_sim = self._scaled_fdc(self.predicted, self._sorted_pred)
+        fdc_obs = self._scaled_fdc(self.true, self._sorted_true)
+        alpha = 1 - 0.5 * np.nanmean(np.abs(fdc_sim - fdc_obs), axis=0)
 
-        beta = np.mean(self.predicted) / np.mean(self.true)
-        kge = float(1 - np.sqrt((cc - 1) ** 2 + (alpha - 1) ** 2 + (beta - 1) ** 2))
+        beta = self._pred_mean / self._true_mean
+        kge = self._result(1 - np.sqrt((cc - 1) ** 2 + (alpha - 1) ** 2 + (beta - 1) ** 2))
         if return_all:
             return np.vstack((kge, cc, alpha, beta))
         else:
@@ -895,62 +1128,60 @@ class RegressionMetrics(Metrics):
         https://iahs.info/uploads/dms/13614.21--211-219-41-MATHEVET.pdf
          Bounded Version of the Modified Kling-Gupta Efficiency
         """
-        kgeprime_ = self.kge_mod(return_all=True)[0, :]
+        kgeprime_ = self.kge_mod()
         kgeprime_c2m_ = kgeprime_ / (2 - kgeprime_)
 
-        return float(kgeprime_c2m_)
+        return self._result(kgeprime_c2m_)
 
     def kgenp_bound(self):
         """
         Bounded Version of the Non-Parametric Kling-Gupta Efficiency
         """
-        kgenp_ = self.kge_np(return_all=True)[0, :]
+        kgenp_ = self.kge_np()
         kgenp_c2m_ = kgenp_ / (2 - kgenp_)
 
-        return float(kgenp_c2m_)
+        return self._result(kgenp_c2m_)
 
     def KLsym(self) -> Union[float, None]:
         """Symmetric kullback-leibler divergence"""
-        if not all((self.true == 0) == (self.predicted == 0)):
-            return None  # ('KL divergence not defined when only one distribution is 0.')
-        x, y = self.true, self.predicted
+        # KL divergence not defined when only one distribution is 0.
+        defined = np.all((self.true == 0) == (self.predicted == 0), axis=0)
         # set values where both distributions are 0 to the same (positive) value.
         # This will not contribute to the final distance.
-        x[x == 0] = 1
-        y[y == 0] = 1
-        d = 0.5 * np.sum((x - y) * (np.log2(x) - np.log2(y)))
-        return float(d)
+        x = np.where(self.true == 0, 1, self.true)
+        y = np.where(self.predicted == 0, 1, self.predicted)
+        d = 0.5 * self._sum((x - y) * (np.log2(x) - np.log2(y)))
+        return self._result(d, defined=defined)
 
     def lm_index(self, obs_bar_p=None) -> float:
         """Legate-McCabe Efficiency Index.
         Less sensitive to outliers in the data.
         obs_bar_p: float, Seasonal or other selected average. If None, the mean of the observed array will be used.
         """
-        mean_obs = np.mean(self.true)
-        a = np.abs(self.predicted - self.true)
-
         if obs_bar_p is not None:
 
             b = np.abs(self.true - obs_bar_p)
         else:
-            b = np.abs(self.true - mean_obs)
+            b = self._abs_true_dev
 
-        return float(1 - (np.sum(a) / np.sum(b)))
+        return self._result(1 - (self._sae / self._sum(b)))
 
     def maape(self) -> float:
         """
         Mean Arctangent Absolute Percentage Error
         Note: result is NOT multiplied by 100
         """
-        return float(np.mean(np.arctan(np.abs((self.true - self.predicted) / (self.true + EPS)))))
+        return self._result(self._mean(np.arctan(np.abs(self._err / (self.true + EPS)))))
 
     def mae(self, true=None, predicted=None) -> float:
         """ Mean Absolute Error """
+        if true is None and predicted is None:
+            return self._result(self._mean(self._abs_err))
         if true is None:
             true = self.true
         if predicted is None:
             predicted = self.predicted
-        return float(np.mean(np.abs(true - predicted)))
+        return self._result(self._mean(np.abs(true - predicted)))
 
     def mape(self) -> float:
         """ Mean Absolute Percentage Error.
@@ -963,7 +1194,7 @@ class RegressionMetrics(Metrics):
         [2] https://doi.org/10.1088/1742-6596/930/1/012002
         [3] https://doi.org/10.1016/j.ijforecast.2015.12.003
         """
-        return float(np.mean(np.abs((self.true - self.predicted) / self.true)) * 100)
+        return self._result(self._mean(self._rel_abs_err) * 100)
 
     def mbe(self) -> float:
         """Mean bias error. This indicator expresses a tendency of model to underestimate (negative value)
@@ -974,17 +1205,16 @@ class RegressionMetrics(Metrics):
 
         [1] https://doi.org/10.1016/j.rser.2015.08.035
         """
-        return float(np.mean(self._error(self.true, self.predicted)))
+        return self._result(self._mean(self._err))
 
     def mbrae(self, benchmark: np.ndarray = None) -> float:
         """ Mean Bounded Relative Absolute Error """
-        return float(np.mean(self._bounded_relative_error(benchmark)))
+        return self._result(self._mean(self._bounded_relative_error(benchmark)))
 
     def mapd(self) -> float:
         """Mean absolute percentage deviation."""
-        a = np.sum(np.abs(self.predicted - self.true))
-        b = np.sum(np.abs(self.true))
-        return float(a / b)
+        b = self._sum(np.abs(self.true))
+        return self._result(self._sae / b)
 
     def mase(self, seasonality: int = 1):
         """
@@ -994,19 +1224,19 @@ class RegressionMetrics(Metrics):
         Hyndman, R. J. (2006). Another look at forecast-accuracy metrics for intermittent demand.
         Foresight: The International Journal of Applied Forecasting, 4(4), 43-46.
         """
-        return self.mae() / self.mae(self.true[seasonality:], self._naive_prognose(seasonality))
+        return self.mae() / self._naive_mae(seasonality)
 
     def mare(self) -> float:
         """ Mean Absolute Relative Error. When expressed in %age, it is also known as mape. [1]
         https://doi.org/10.1016/j.rser.2015.08.035
         """
-        return float(np.mean(np.abs(self._error(self.true, self.predicted) / self.true)))
+        return self._result(self._mean(self._rel_abs_err))
 
     def max_error(self) -> float:
         """
         maximum error
         """
-        return float(np.max(self._ae()))
+        return self._result(self._max(self._abs_err))
 
     def mb_r(self) -> float:
         """Mielke-Berry R value.
@@ -1015,39 +1245,50 @@ class RegressionMetrics(Metrics):
          Springer Science & Business Media.
         """
         # Calculate metric
-        n = self.predicted.size
-        tot = 0.0
-        for i in range(n):
-            tot = tot + np.sum(np.abs(self.predicted - self.true[i]))
-        mae_val = np.sum(np.abs(self.predicted - self.true)) / n
+        n = len(self.true)
+        # sum of |predicted[j] - true[i]| over all i and j. In the sorted concatenation of true and
+        # predicted, each value contributes its distance from all the values of other array before it.
+        merged = np.concatenate([self.true, self.predicted], axis=0)
+        order = np.argsort(merged, axis=0)
+        values = np.take_along_axis(merged, order, axis=0)
+        is_true = order < n
+        true_values = np.where(is_true, values, 0.)
+        pred_values = values - true_values
+        true_before = np.cumsum(is_true, axis=0) - is_true
+        pred_before = np.cumsum(~is_true, axis=0) - ~is_true
+        true_sum_before = np.cumsum(true_values, axis=0) - true_values
+        pred_sum_before = np.cumsum(pred_values, axis=0) - pred_values
+        tot = np.sum(np.where(is_true, values * pred_before - pred_sum_before,
+                              values * true_before - true_sum_before), axis=0)
+        mae_val = self._sae / n
         mb = 1 - ((n ** 2) * mae_val / tot)
 
-        return float(mb)
+        return self._result(mb)
 
     def mda(self) -> float:
         """ Mean Directional Accuracy
          modified after https://gist.github.com/bshishov/5dc237f59f019b26145648e2124ca1c9
          """
-        dict_acc = np.sign(self.true[1:] - self.true[:-1]) == np.sign(self.predicted[1:] - self.predicted[:-1])
-        return float(np.mean(dict_acc))
+        dict_acc = np.sign(self._true_diff) == np.sign(self._pred_diff)
+        return self._result(self._mean(dict_acc))
 
     def mde(self) -> float:
         """Median Error"""
-        return float(np.median(self.predicted - self.true))
+        return self._result(-self._median(self._err))
 
     def mdape(self) -> float:
         """
         Median Absolute Percentage Error
         """
-        return float(np.median(np.abs(self._percentage_error())) * 100)
+        return self._result(self._median(np.abs(self._percentage_error())) * 100)
 
     def mdrae(self, benchmark: np.ndarray = None) -> float:
         """ Median Relative Absolute Error """
-        return float(np.median(np.abs(self._relative_error(benchmark))))
+        return self._result(self._median(np.abs(self._relative_error(benchmark))))
 
     def me(self):
         """Mean error """
-        return float(np.mean(self._error()))
+        return self._result(self._mean(self._err))
 
     def mean_bias_error(self) -> float:
         """
@@ -1067,73 +1308,71 @@ class RegressionMetrics(Metrics):
          http://dx.doi.org/10.1061/(ASCE)HE.1943-5584.0001066
     [3]  https://doi.org/10.1016/j.rser.2015.08.035
          """
-        return float(np.sum(self.true - self.predicted) / len(self.true))
+        return self._result(self._sum_err / self._n)
 
     def mean_var(self) -> float:
         """Mean variance"""
-        return float(np.var(np.log1p(self.true) - np.log1p(self.predicted)))
+        return self._result(self._std(self._log1p_err) ** 2)
 
     def mean_poisson_deviance(self, weights=None) -> float:
         """
         mean poisson deviance
         """
-        return _mean_tweedie_deviance(self.true, self.predicted, weights=weights, power=1)
+        return self._result(self._average(_tweedie_deviance(self.true, self.predicted, power=1), weights))
 
     def mean_gamma_deviance(self, weights=None) -> float:
         """
         mean gamma deviance
         """
-        return _mean_tweedie_deviance(self.true, self.predicted, weights=weights, power=2)
+        return self._result(self._average(_tweedie_deviance(self.true, self.predicted, power=2), weights))
 
     def median_abs_error(self) -> float:
         """
         median absolute error
         """
-        return float(np.median(np.abs(self.predicted - self.true), axis=0))
+        return self._result(self._median(self._abs_err))
 
     def med_seq_error(self) -> float:
         """Median Squared Error
         Same as mse but it takes median which reduces the impact of outliers.
         """
-        return float(np.median((self.predicted - self.true) ** 2))
+        return self._result(self._median(self._sq_err))
 
     def mle(self) -> float:
         """Mean log error"""
-        return float(np.mean(np.log1p(self.predicted) - np.log1p(self.true)))
+        return self._result(-self._mean(self._log1p_err))
 
     def mod_agreement_index(self, j=1) -> float:
         """Modified agreement of index.
         j: int, when j==1, this is same as agreement_index. Higher j means more impact of outliers."""
-        a = (np.abs(self.predicted - self.true)) ** j
-        b = np.abs(self.predicted - np.mean(self.true))
-        c = np.abs(self.true - np.mean(self.true))
-        e = (b + c) ** j
-        return float(1 - (np.sum(a) / np.sum(e)))
+        a = self._abs_err ** j
+        e = self._willmott_dev ** j
+        return self._result(1 - (self._sum(a) / self._sum(e)))
 
     def mpe(self) -> float:
         """ Mean Percentage Error """
-        return float(np.mean(self._percentage_error()))
+        return self._result(self._mean(self._percentage_error()))
 
     def mrae(self, benchmark: np.ndarray = None):
         """ Mean Relative Absolute Error """
-        return float(np.mean(np.abs(self._relative_error(benchmark))))
+        return self._result(self._mean(np.abs(self._relative_error(benchmark))))
 
     def mse(self, weights=None) -> float:
         """ mean square error """
-        return float(np.average((self.true - self.predicted) ** 2, axis=0, weights=weights))
+        return self._result(self._average(self._sq_err, weights))
 
     def msle(self, weights=None) -> float:
         """
         mean square logrithmic error
         """
-        return float(np.average((np.log1p(self.true) - np.log1p(self.predicted)) ** 2, axis=0, weights=weights))
+        return self._result(self._average(self._log1p_err ** 2, weights))
 
     def norm_euclid_distance(self) -> float:
         """Normalized Euclidian distance"""
 
-        a = self.true / np.mean(self.true)
-        b = self.predicted / np.mean(self.predicted)
-        return float(np.linalg.norm(a - b))
+        a = self.true / self._true_mean
+        b = self.predicted / self._pred_mean
+        return self._result(np.sqrt(self._sum((a - b) ** 2)))
 
     def nrmse_range(self) -> float:
         """Range Normalized Root Mean Squared Error.
@@ -1143,7 +1382,7 @@ class RegressionMetrics(Metrics):
         Reference: Pontius et al., 2008
         """
 
-        return float(self.rmse() / (np.max(self.true) - np.min(self.true)))
+        return self._result(self.rmse() / (self._max(self.true) - self._min(self.true)))
 
     def nrmse_ipercentile(self, q1=25, q2=75) -> float:
         """
@@ -1153,11 +1392,11 @@ class RegressionMetrics(Metrics):
         Reference: Pontius et al., 2008.
         """
 
-        q1 = np.percentile(self.true, q1)
-        q3 = np.percentile(self.true, q2)
+        q1 = self._percentile(self.true, q1)
+        q3 = self._percentile(self.true, q2)
         iqr = q3 - q1
 
-        return float(self.rmse() / iqr)
+        return self._result(self.rmse() / iqr)
 
     def nrmse_mean(self) -> float:
         """Mean Normalized RMSE
@@ -1165,19 +1404,19 @@ class RegressionMetrics(Metrics):
 
         Reference: Pontius et al., 2008
         """
-        return float(self.rmse() / np.mean(self.true))
+        return self._result(self.rmse() / self._true_mean)
 
     def norm_ae(self) -> float:
         """ Normalized Absolute Error """
-        return float(np.sqrt(np.sum(np.square(self._error() - self.mae())) / (len(self.true) - 1)))
+        return self._result(np.sqrt(self._sum(np.square(self._error() - self.mae())) / (self._n - 1)))
 
     def norm_ape(self) -> float:
         """ Normalized Absolute Percentage Error """
-        return float(np.sqrt(np.sum(np.square(self._percentage_error() - self.mape())) / (len(self.true) - 1)))
+        return self._result(np.sqrt(self._sum(np.square(self._percentage_error() - self.mape())) / (self._n - 1)))
 
     def nrmse(self) -> float:
         """ Normalized Root Mean Squared Error """
-        return float(self.rmse() / (np.max(self.true) - np.min(self.true)))
+        return self._result(self.rmse() / (self._max(self.true) - self._min(self.true)))
 
     def nse(self) -> float:
         """Nash-Sutcliff Efficiency.
@@ -1191,8 +1430,8 @@ class RegressionMetrics(Metrics):
         [2] Krause, P., Boyle, D., & Bäse, F. (2005). Comparison of different efficiency criteria for hydrological
             model assessment. Adv. Geosci., 5, 89-97. http://dx.doi.org/10.5194/adgeo-5-89-2005.
         """
-        _nse = 1 - sum((self.predicted - self.true) ** 2) / sum((self.true - np.mean(self.true)) ** 2)
-        return float(_nse)
+        _nse = 1 - self._sse / self._sst
+        return self._result(_nse)
 
     def nse_alpha(self) -> float:
         """
@@ -1204,7 +1443,7 @@ class RegressionMetrics(Metrics):
             Alpha decomposition of the NSE
 
         """
-        return float(np.std(self.predicted) / np.std(self.true))
+        return self._result(self._pred_std / self._true_std)
 
     def nse_beta(self) -> float:
         """
@@ -1215,25 +1454,25 @@ class RegressionMetrics(Metrics):
         float
             Beta decomposition of the NSE
         """
-        return float((np.mean(self.predicted) - np.mean(self.true)) / np.std(self.true))
+        return self._result((self._pred_mean - self._true_mean) / self._true_std)
 
     def nse_mod(self, j=1) -> float:
         """
         Gives less weightage of outliers if j=1 and if j>1, gives more weightage to outliers.
         Reference: Krause et al., 2005
         """
-        a = (np.abs(self.predicted - self.true)) ** j
-        b = (np.abs(self.true - np.mean(self.true))) ** j
-        return float(1 - (np.sum(a) / np.sum(b)))
+        a = self._abs_err ** j
+        b = self._abs_true_dev ** j
+        return self._result(1 - (self._sum(a) / self._sum(b)))
 
     def nse_rel(self) -> float:
         """
         Relative NSE.
         """
 
-        a = (np.abs((self.predicted - self.true) / self.true)) ** 2
-        b = (np.abs((self.true - np.mean(self.true)) / np.mean(self.true))) ** 2
-        return float(1 - (np.sum(a) / np.sum(b)))
+        a = self._rel_abs_err ** 2
+        b = (self._abs_true_dev / np.abs(self._true_mean)) ** 2
+        return self._result(1 - (self._sum(a) / self._sum(b)))
 
     def nse_bound(self) -> float:
         """
@@ -1251,19 +1490,17 @@ class RegressionMetrics(Metrics):
             .. math::
             NSE = 1-\\frac{\\sum_{i=1}^{N}(log(e_{i})-log(s_{i}))^2}{\\sum_{i=1}^{N}(log(e_{i})-log(\\bar{e})^2}-1)*-1
         """
-        s, o = self.predicted + epsilon, self.true + epsilon
-        return float(1 - sum((np.log(o) - np.log(o)) ** 2) / sum((np.log(o) - np.mean(np.log(o))) ** 2))
+        log_o = self._log_true if epsilon == 0.0 else np.log(self.true + epsilon)
+        return self._result(1 - self._sum((log_o - log_o) ** 2) / self._sum((log_o - self._mean(log_o)) ** 2))
 
     def log_prob(self) -> float:
         """
         Logarithmic probability distribution
         """
-        scale = np.mean(self.true) / 10
-        if scale < .01:
-            scale = .01
-        y = (self.true - self.predicted) / scale
+        scale = np.maximum(self._true_mean / 10, .01)
+        y = self._err / scale
         normpdf = -y ** 2 / 2 - np.log(np.sqrt(2 * np.pi))
-        return float(np.mean(normpdf))
+        return self._result(self._mean(normpdf))
 
     def pbias(self) -> float:
         """
@@ -1276,7 +1513,7 @@ class RegressionMetrics(Metrics):
         PBIAS will be close to zero even though the model simulation is poor. [1]
         [1] Moriasi et al., 2015
         """
-        return float(100.0 * sum(self.predicted - self.true) / sum(self.true))
+        return self._result(100.0 * -self._sum_err / self._true_sum)
 
     def pearson_r(self) -> float:
         """
@@ -1284,14 +1521,11 @@ class RegressionMetrics(Metrics):
         Measures linear correlatin. Sensitive to outliers.
         Reference: Pearson, K 1895.
         """
-        sim_mean = np.mean(self.predicted)
-        obs_mean = np.mean(self.true)
-
-        top = np.sum((self.true - obs_mean) * (self.predicted - sim_mean))
-        bot1 = np.sqrt(np.sum((self.true - obs_mean) ** 2))
-        bot2 = np.sqrt(np.sum((self.predicted - sim_mean) ** 2))
+        top = self._cross_dev_sum
+        bot1 = np.sqrt(self._sst)
+        bot2 = np.sqrt(self._pred_ss)
 
-        return float(top / (bot1 * bot2))
+        return self._result(top / (bot1 * bot2))
 
     def rmsle(self) -> float:
         """Root mean square log error. Compared to RMSE, RMSLE only considers the relative error between predicted and
@@ -1301,47 +1535,42 @@ class RegressionMetrics(Metrics):
 
          [1] https://doi.org/10.1016/j.scitotenv.2020.137894
          """
-        return float(np.sqrt(np.mean(np.power(np.log1p(self.predicted) - np.log1p(self.true), 2))))
+        return self._result(np.sqrt(self._mean(self._log1p_err ** 2)))
 
     def rmdspe(self) -> float:
         """
         Root Median Squared Percentage Error
         """
-        return float(np.sqrt(np.median(np.square(self._percentage_error()))) * 100.0)
+        return self._result(np.sqrt(self._median(np.square(self._percentage_error()))) * 100.0)
 
     def rse(self) -> float:
         """Relative Squared Error"""
-        return float(np.sum(np.square(self.true - self.predicted)) / np.sum(np.square(self.true - np.mean(self.true))))
+        return self._result(self._sse / self._sst)
 
     def rrse(self) -> float:
         """ Root Relative Squared Error """
-        return float(np.sqrt(self.rse()))
+        return self._result(np.sqrt(self.rse()))
 
     def rae(self) -> float:
         """ Relative Absolute Error (aka Approximation Error) """
-        return float(np.sum(self._ae()) / (np.sum(np.abs(self.true - np.mean(self.true))) + EPS))
+        return self._result(self._sae / (self._sum(self._abs_true_dev) + EPS))
 
     def ref_agreement_index(self) -> float:
         """Refined Index of Agreement. From -1 to 1. Larger the better.
         Refrence: Willmott et al., 2012"""
-        a = np.sum(np.abs(self.predicted - self.true))
-        b = 2 * np.sum(np.abs(self.true - self.true.mean()))
-        if a <= b:
-            return float(1 - (a / b))
-        else:
-            return float((b / a) - 1)
+        a = self._sae
+        b = 2 * self._sum(self._abs_true_dev)
+        return self._result(np.where(a <= b, 1 - (a / b), (b / a) - 1))
 
     def rel_agreement_index(self) -> float:
         """Relative index of agreement. from 0 to 1. larger the better."""
-        a = ((self.predicted - self.true) / self.true) ** 2
-        b = np.abs(self.predicted - np.mean(self.true))
-        c = np.abs(self.true - np.mean(self.true))
-        e = ((b + c) / np.mean(self.true)) ** 2
-        return float(1 - (np.sum(a) / np.sum(e)))
+        a = self._rel_abs_err ** 2
+        e = (self._willmott_dev / self._true_mean) ** 2
+        return self._result(1 - (self._sum(a) / self._sum(e)))
 
     def rmse(self, weights=None) -> float:
         """ root mean square error"""
-        return sqrt(np.average((self.true - self.predicted) ** 2, axis=0, weights=weights))
+        return self._result(np.sqrt(self._average(self._sq_err, weights)))
 
     def r2(self) -> float:
         """
@@ -1351,10 +1580,8 @@ class RegressionMetrics(Metrics):
         than pearson correlatin r.
         https://data.library.virginia.edu/is-r-squared-useless/
         """
-        zx = (self.true - np.mean(self.true)) / np.std(self.true, ddof=1)
-        zy = (self.predicted - np.mean(self.predicted)) / np.std(self.predicted, ddof=1)
-        r = np.sum(zx * zy) / (len(self.true) - 1)
-        return float(r ** 2)
+        r = self._cross_dev_sum / (self._true_std1 * self._pred_std1 * (self._n - 1))
+        return self._result(r ** 2)
 
     def r2_mod(self, weights=None):
         """
@@ -1371,20 +1598,16 @@ class RegressionMetrics(Metrics):
             return None
 
         if weights is None:
-            weight = 1.
+            numerator = np.asarray(self._sse, dtype=np.float64)
+            denominator = np.asarray(self._sst, dtype=np.float64)
         else:
             weight = weights[:, np.newaxis]
 
-        numerator = (weight * (self.true - self.predicted) ** 2).sum(axis=0,
-                                                                     dtype=np.float64)
-        denominator = (weight * (self.true - np.average(
-            self.true, axis=0, weights=weights)) ** 2).sum(axis=0, dtype=np.float64)
-
-        if numerator == 0.0:
-            return None
-        output_scores = _foo(denominator, numerator)
+            numerator = (weight * self._sq_err).sum(axis=0, dtype=np.float64)
+            denominator = (weight * (self.true - np.average(
+                self.true, axis=0, weights=weights)) ** 2).sum(axis=0, dtype=np.float64)
 
-        return float(np.average(output_scores, weights=weights))
+        return self._result(self._r2_score(numerator, denominator), defined=numerator != 0.0)
 
     def relative_rmse(self) -> float:
         """
@@ -1392,53 +1615,53 @@ class RegressionMetrics(Metrics):
             .. math::
             RRMSE=\\frac{\\sqrt{\\frac{1}{N}\\sum_{i=1}^{N}(e_{i}-s_{i})^2}}{\\bar{e}}
         """
-        rrmse = self.rmse() / np.mean(self.true)
-        return float(rrmse)
+        rrmse = self.rmse() / self._true_mean
+        return self._result(rrmse)
 
     def rmspe(self) -> float:
         """
         Root Mean Square Percentage Error
         https://stackoverflow.com/a/53166790/5982232
         """
-        return float(np.sqrt(np.mean(np.square(((self.true - self.predicted) / self.true)), axis=0)))
+        return self._result(np.sqrt(self._mean(np.square(self._rel_abs_err))))
 
     def rsr(self) -> float:
         """
         Moriasi et al., 2007.
         It incorporates the benefits of error index statistics andincludes a scaling/normalization factor,
         so that the resulting statistic and reported values can apply to various constitu-ents."""
-        return float(self.rmse() / np.std(self.true))
+        return self._result(self.rmse() / self._true_std)
 
     def rmsse(self, seasonality: int = 1) -> float:
         """ Root Mean Squared Scaled Error """
-        q = np.abs(self._error()) / self.mae(self.true[seasonality:], self._naive_prognose(seasonality))
-        return float(np.sqrt(np.mean(np.square(q))))
+        q = self._abs_err / self._naive_mae(seasonality)
+        return self._result(np.sqrt(self._mean(np.square(q))))
 
     def sa(self) -> float:
         """Spectral angle. From -pi/2 to pi/2. Closer to 0 is better.
         It measures angle between two vectors in hyperspace indicating how well the shape of two arrays match instead
         of their magnitude.
         Reference: Robila and Gershman, 2005."""
-        a = np.dot(self.predicted, self.true)
-        b = np.linalg.norm(self.predicted) * np.linalg.norm(self.true)
-        return float(np.arccos(a / b))
+        a = self._sum(self.predicted * self.true)
+        b = np.sqrt(self._sum(self.predicted ** 2)) * np.sqrt(self._sum(self.true ** 2))
+        return self._result(np.arccos(a / b))
 
     def sc(self) -> float:
         """Spectral correlation.
          From -pi/2 to pi/2. Closer to 0 is better.
         """
-        a = np.dot(self.true - np.mean(self.true), self.predicted - np.mean(self.predicted))
-        b = np.linalg.norm(self.true - np.mean(self.true))
-        c = np.linalg.norm(self.predicted - np.mean(self.predicted))
+        a = self._cross_dev_sum
+        b = np.sqrt(self._sst)
+        c = np.sqrt(self._pred_ss)
         e = b * c
-        return float(np.arccos(a / e))
+        return self._result(np.arccos(a / e))
 
     def smdape(self) -> float:
         """
         Symmetric Median Absolute Percentage Error
         Note: result is NOT multiplied by 100
         """
-        return float(np.median(2.0 * self._ae() / ((np.abs(self.true) + np.abs(self.predicted)) + EPS)))
+        return self._result(self._median(2.0 * self._abs_err / (self._abs_sum + EPS)))
 
     def sse(self) -> float:
         """Sum of squared errors (model vs actual).
@@ -1448,8 +1671,7 @@ class RegressionMetrics(Metrics):
         This is also called residual sum of squares (RSS) or sum of squared residuals as per
         https://www.tutorialspoint.com/statistics/residual_sum_of_squares.htm
         """
-        squared_errors = (self.true - self.predicted) ** 2
-        return float(np.sum(squared_errors))
+        return self._result(self._sse)
 
     def smape(self) -> float:
         """
@@ -1457,50 +1679,41 @@ class RegressionMetrics(Metrics):
          https://en.wikipedia.org/wiki/Symmetric_mean_absolute_percentage_error
          https://stackoverflow.com/a/51440114/5982232
         """
-        _temp = np.sum(2 * np.abs(self.predicted - self.true) / (np.abs(self.true) + np.abs(self.predicted)))
-        return float(100 / len(self.true) * _temp)
+        _temp = self._sum(2 * self._abs_err / self._abs_sum)
+        return self._result(100 / self._n * _temp)
 
     def spearmann_corr(self) -> float:
         """Separmann correlation coefficient
         https://hess.copernicus.org/articles/24/2505/2020/hess-24-2505-2020.pdf
         """
-        col = [list(a) for a in zip(self.true, self.predicted)]
-        xy = sorted(col, key=lambda _x: _x[0], reverse=False)
-        # rang of x-value
-        for i, row in enumerate(xy):
-            row.append(i + 1)
-
-        a = sorted(xy, key=lambda _x: _x[1], reverse=False)
-        # rang of y-value
-        for i, row in enumerate(a):
-            row.append(i + 1)
+        rank_x, rank_y = self._ranks
 
-        mw_rank_x = np.nanmean(np.array(a)[:, 2])
-        mw_rank_y = np.nanmean(np.array(a)[:, 3])
+        mw_rank_x = np.nanmean(rank_x, axis=0)
+        mw_rank_y = np.nanmean(rank_y, axis=0)
 
-        numerator = np.nansum([float((a[j][2] - mw_rank_x) * (a[j][3] - mw_rank_y)) for j in range(len(a))])
-        denominator1 = np.sqrt(np.nansum([(a[j][2] - mw_rank_x) ** 2. for j in range(len(a))]))
-        denominator2 = np.sqrt(np.nansum([(a[j][3] - mw_rank_x) ** 2. for j in range(len(a))]))
-        return float(numerator / (denominator1 * denominator2))
+        numerator = np.nansum((rank_x - mw_rank_x) * (rank_y - mw_rank_y), axis=0)
+        denominator1 = np.sqrt(np.nansum((rank_x - mw_rank_x) ** 2., axis=0))
+        denominator2 = np.sqrt(np.nansum((rank_y - mw_rank_x) ** 2., axis=0))
+        return self._result(numerator / (denominator1 * denominator2))
 
     def sid(self) -> float:
         """Spectral Information Divergence.
         From -pi/2 to pi/2. Closer to 0 is better. """
-        first = (self.true / np.mean(self.true)) - (
-                self.predicted / np.mean(self.predicted))
-        second1 = np.log10(self.true) - np.log10(np.mean(self.true))
-        second2 = np.log10(self.predicted) - np.log10(np.mean(self.predicted))
-        return float(np.dot(first, second1 - second2))
+        first = (self.true / self._true_mean) - (
+                self.predicted / self._pred_mean)
+        second1 = np.log10(self.true) - np.log10(self._true_mean)
+        second2 = np.log10(self.predicted) - np.log10(self._pred_mean)
+        return self._result(self._sum(first * (second1 - second2)))
 
     def sga(self) -> float:
         """Spectral gradient angle.
         From -pi/2 to pi/2. Closer to 0 is better.
         """
-        sgx = self.true[1:] - self.true[:self.true.size - 1]
-        sgy = self.predicted[1:] - self.predicted[:self.predicted.size - 1]
-        a = np.dot(sgx, sgy)
-        b = np.linalg.norm(sgx) * np.linalg.norm(sgy)
-        return float(np.arccos(a / b))
+        sgx = self._true_diff
+        sgy = self._pred_diff
+        a = self._sum(sgx * sgy)
+        b = np.sqrt(self._sum(sgx ** 2)) * np.sqrt(self._sum(sgy ** 2))
+        return self._result(np.arccos(a / b))
 
     def skill_score_murphy(self) -> float:
         """
@@ -1532,12 +1745,12 @@ class RegressionMetrics(Metrics):
         rmse2 = self.rmse() ** 2
 
         # Calculate standard deviation
-        sdev2 = np.std(self.true, ddof=1) ** 2
+        sdev2 = self._true_std1 ** 2
 
         # Calculate skill score
         ss = 1 - rmse2 / sdev2
 
-        return float(ss)
+        return self._result(ss)
 
     def umbrae(self, benchmark: np.ndarray = None):
         """ Unscaled Mean Bounded Relative Absolute Error """
@@ -1548,9 +1761,7 @@ class RegressionMetrics(Metrics):
         Volumetric efficiency. from 0 to 1. Smaller the better.
         Reference: Criss and Winston 2008.
         """
-        a = np.sum(np.abs(self.predicted - self.true))
-        b = np.sum(self.true)
-        return float(1 - (a / b))
+        return self._result(1 - (self._sae / self._true_sum))
 
     def volume_error(self) -> float:
         """
@@ -1566,24 +1777,24 @@ class RegressionMetrics(Metrics):
             Sum(self.predicted- true)/sum(self.predicted)
         """
         # TODO written formula and executed formula are different.
-        ve = np.sum(self.predicted - self.true) / np.sum(self.true)
-        return float(ve)
+        ve = -self._sum_err / self._true_sum
+        return self._result(ve)
 
     def wape(self) -> float:
         """
         weighted absolute percentage error
         https://mattdyor.wordpress.com/2018/05/23/calculating-wape/
         """
-        return float(np.sum(self._ae() / np.sum(self.true)))
+        return self._result(self._sum(self._abs_err / self._true_sum))
 
     def watt_m(self) -> float:
         """Watterson's M.
         Refrence: Watterson., 1996"""
         a = 2 / np.pi
-        c = np.std(self.true, ddof=1) ** 2 + np.std(self.predicted, ddof=1) ** 2
-        e = (np.mean(self.predicted) - np.mean(self.true)) ** 2
+        c = self._true_std1 ** 2 + self._pred_std1 ** 2
+        e = (self._pred_mean - self._true_mean) ** 2
         f = c + e
-        return float(a * np.arcsin(1 - (self.mse() / f)))
+        return self._result(a * np.arcsin(1 - (self.mse() / f)))
 
     def wmape(self) -> float:
         """
@@ -1594,21 +1805,263 @@ class RegressionMetrics(Metrics):
         # for each forecast. Output shape is (1, num_forecasts)
 
         # Make an array of mape (same shape as forecast)
-        se_mape = abs(self.true - self.predicted) / self.true
+        se_mape = self._abs_err / self.true
 
         # Calculate sum of actual values
-        ft_actual_sum = self.true.sum(axis=0)
+        ft_actual_sum = self._true_sum
 
         # Multiply the actual values by the mape
         se_actual_prod_mape = self.true * se_mape
 
         # Take the sum of the product of actual values and mape
         # Make sure to sum down the rows (1 for each column)
-        ft_actual_prod_mape_sum = se_actual_prod_mape.sum(axis=0)
+        ft_actual_prod_mape_sum = self._sum(se_actual_prod_mape)
 
         # Calculate the wmape for each forecast and return as a dictionary
         ft_wmape_forecast = ft_actual_prod_mape_sum / ft_actual_sum
-        return float(ft_wmape_forecast)
+        return self._result(ft_wmape_forecast)
+
+
+def per_column_with_nans(func):
+    """The metric is calculated by `RegressionMetrics` for each output and horizon
+    when the examples with NaNs are to be ignored. This is for metrics which
+    depend upon the order or ranks of examples which are different for each
+    output and horizon after removing NaNs."""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.nan_aware:
+            return self._per_column(func.__name__)
+        return func(self, *args, **kwargs)
+
+    wrapper.per_column_with_nans = True
+    return wrapper
+
+
+class BatchRegressionMetrics(RegressionMetrics):
+    """
+    Calculates the regression metrics of `RegressionMetrics` for all outputs and
+    horizons at once. The `true` and `predicted` arrays are of shape
+    (examples, outs, forecast_len) and every metric is returned as an array of
+    shape (outs, forecast_len). The metrics of `RegressionMetrics` are used as
+    they are, only the reductions along the first axis e.g. `_sum` and `_mean`
+    and thus the shared statistics are arrays here.
+
+    If `ignore_nan` is True, the examples in which either true or predicted value
+    is NaN are ignored for that output and horizon only, which is same as
+    removing those examples before using `RegressionMetrics`. The few metrics
+    which depend upon the order or ranks of examples are then calculated by
+    `RegressionMetrics` for each output and horizon.
+
+    As in `RegressionMetrics`, the metrics which can not be calculated for the
+    given arrays e.g. `mean_gamma_deviance` for negative values, raise ValueError.
+    `calculate_all` returns NaN for those outputs and horizons for which such a
+    metric can not be calculated.
+
+    Example
+    ---------
+    ```python
+    import numpy as np
+    from AI4Water.utils.SeqMetrics import BatchRegressionMetrics
+    t = np.random.random((100, 2, 3))
+    p = np.random.random((100, 2, 3))
+    errors = BatchRegressionMetrics(t, p)
+    errors.nse()  # array of shape (2, 3)
+    all_errors = errors.calculate_all()
+    ```
+    """
+    def __init__(self, true, predicted, ignore_nan: bool = True):
+        """
+        Arguments:
+            true array: true values of shape (examples, outs, forecast_len). 1D
+                and 2D arrays are considered to have one horizon and one output.
+            predicted array: predicted values of same shape as `true`
+            ignore_nan bool: whether to ignore the examples with NaNs
+        """
+        true, predicted = self._pre_process(true, predicted)
+
+        nans = np.isnan(true) | np.isnan(predicted)
+        self.nan_aware = ignore_nan and bool(nans.any())
+        if self.nan_aware:
+            true = np.where(nans, np.nan, true)
+            predicted = np.where(nans, np.nan, predicted)
+            self.n = (~nans).sum(axis=0)
+        else:
+            self.n = np.full(true.shape[1:], len(true))
+
+        self.true = true
+        self.predicted = predicted
+
+        self.all_methods = [m for m in list_subclass_methods(RegressionMetrics, True) if m != "brier_score"]
+
+    @staticmethod
+    def _pre_process(true, predicted):
+        true = np.asarray(true, dtype=np.float64)
+        predicted = np.asarray(predicted, dtype=np.float64)
+        assert true.shape == predicted.shape, f"shapes of true {true.shape} and predicted {predicted.shape} mismatch"
+        if true.ndim == 1:
+            true, predicted = true.reshape(-1, 1, 1), predicted.reshape(-1, 1, 1)
+        elif true.ndim == 2:
+            true, predicted = true[..., np.newaxis], predicted[..., np.newaxis]
+        assert true.ndim == 3, f"arrays must be 3d of shape (examples, outs, forecast_len) but are {true.ndim}d"
+        assert len(true) > 0, "Input arrays should not be empty"
+        return true, predicted
+
+    @property
+    def shape(self) -> tuple:
+        return self.true.shape[1:]
+
+    @property
+    def _n(self):
+        return self.n
+
+    def _sum(self, x):
+        return np.nansum(x, axis=0) if self.nan_aware else np.sum(x, axis=0)
+
+    def _mean(self, x):
+        return np.nanmean(x, axis=0) if self.nan_aware else np.mean(x, axis=0)
+
+    def _std(self, x, ddof=0):
+        return np.nanstd(x, axis=0, ddof=ddof) if self.nan_aware else np.std(x, axis=0, ddof=ddof)
+
+    def _median(self, x):
+        # partitioning contiguous columns is much faster than along the first axis
+        x = self._columns(x)
+        median = np.nanmedian(x, axis=1) if self.nan_aware else np.median(x, axis=1)
+        return median.reshape(self.shape)
+
+    def _percentile(self, x, q):
+        x = self._columns(x)
+        percentile = np.nanpercentile(x, q, axis=1) if self.nan_aware else np.percentile(x, q, axis=1)
+        return percentile.reshape(self.shape)
+
+    def _max(self, x):
+        return np.nanmax(x, axis=0) if self.nan_aware else np.max(x, axis=0)
+
+    def _min(self, x):
+        return np.nanmin(x, axis=0) if self.nan_aware else np.min(x, axis=0)
+
+    def _result(self, value, defined=True):
+        """The value of a metric as array of shape (outs, forecast_len) which is
+        NaN where the metric is not defined."""
+        return np.where(np.broadcast_to(defined, self.shape), value, np.nan).astype(np.float64)
+
+    def _columns(self, x):
+        """Returns x as contiguous 2d array of shape (outs * forecast_len, examples)"""
+        return np.ascontiguousarray(x.reshape(len(x), -1).T)
+
+    def _per_column(self, metric: str) -> np.ndarray:
+        """Calculates the `metric` using `RegressionMetrics` for each output and horizon."""
+        return self._per_column_all([metric])[metric]
+
+    def _per_column_all(self, metrics: list) -> dict:
+        errors = {m: np.full(self.shape, np.nan) for m in metrics}
+        if len(metrics) == 0:
+            return errors
+        for out in range(self.shape[0]):
+            for h in range(self.shape[1]):
+                t, p = self.true[:, out, h], self.predicted[:, out, h]
+                if self.nan_aware:
+                    valid = ~np.isnan(t)
+                    t, p = t[valid], p[valid]
+                if len(t) == 0:
+                    continue
+                er = RegressionMetrics(t, p)
+                for m in metrics:
+                    if m in er.all_methods:
+                        error = getattr(er, m)()
+                        errors[m][out, h] = np.nan if error is None else float(error)
+        return errors
+
+    def calculate_all(self) -> dict:
+        """Calculates all the metrics of `RegressionMetrics` and returns a dictionary
+        whose values are arrays of shape (outs, forecast_len)."""
+        per_column = [m for m in self.all_methods
+                      if self.nan_aware and getattr(getattr(self, m), 'per_column_with_nans', False)]
+
+        errors = {}
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            with np.errstate(all='ignore'):
+                for m in self.all_methods:
+                    if m not in per_column:
+                        try:
+                            errors[m] = getattr(self, m)()
+                        except ValueError:  # not defined for some outputs or horizons
+                            per_column.append(m)
+                errors.update(self._per_column_all(per_column))
+
+        return {m: errors[m] for m in sorted(errors)}
+
+    @per_column_with_nans
+    def fdc_fhv(self, h: float = 0.02) -> np.ndarray:
+        return super().fdc_fhv(h)
+
+    @per_column_with_nans
+    def fdc_flv(self, low_flow: float = 0.3) -> np.ndarray:
+        return super().fdc_flv(low_flow)
+
+    @per_column_with_nans
+    def gmrae(self, benchmark: np.ndarray = None) -> np.ndarray:
+        return super().gmrae(benchmark)
+
+    @per_column_with_nans
+    def irmse(self) -> np.ndarray:
+        return super().irmse()
+
+    def kendaull_tau(self, return_p=False) -> np.ndarray:
+        nan_policy = 'omit' if self.nan_aware else 'propagate'
+        coef, p = kendalltau(self.true, self.predicted, axis=0, nan_policy=nan_policy)
+        if return_p:
+            return coef, p
+        return self._result(p)
+
+    @per_column_with_nans
+    def kge_np(self, return_all=False) -> np.ndarray:
+        return super().kge_np(return_all)
+
+    @per_column_with_nans
+    def kgenp_bound(self) -> np.ndarray:
+        return super().kgenp_bound()
+
+    @per_column_with_nans
+    def mase(self, seasonality: int = 1) -> np.ndarray:
+        return super().mase(seasonality)
+
+    @per_column_with_nans
+    def mb_r(self) -> np.ndarray:
+        return super().mb_r()
+
+    @per_column_with_nans
+    def mbrae(self, benchmark: np.ndarray = None) -> np.ndarray:
+        return super().mbrae(benchmark)
+
+    @per_column_with_nans
+    def mda(self) -> np.ndarray:
+        return super().mda()
+
+    @per_column_with_nans
+    def mdrae(self, benchmark: np.ndarray = None) -> np.ndarray:
+        return super().mdrae(benchmark)
+
+    @per_column_with_nans
+    def mrae(self, benchmark: np.ndarray = None) -> np.ndarray:
+        return super().mrae(benchmark)
+
+    @per_column_with_nans
+    def rmsse(self, seasonality: int = 1) -> np.ndarray:
+        return super().rmsse(seasonality)
+
+    @per_column_with_nans
+    def sga(self) -> np.ndarray:
+        return super().sga()
+
+    @per_column_with_nans
+    def spearmann_corr(self) -> np.ndarray:
+        return super().spearmann_corr()
+
+    @per_column_with_nans
+    def umbrae(self, benchmark: np.ndarray = None) -> np.ndarray:
+        return super().umbrae(benchmark)
 
 
 class ClassificationMetrics(Metrics):
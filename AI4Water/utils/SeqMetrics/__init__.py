@@ -1 +1,2 @@
-from .SeqMetrics import RegressionMetrics
\ No newline at end of file
+from .SeqMetrics import RegressionMetrics
+from .SeqMetrics import BatchRegressionMetrics
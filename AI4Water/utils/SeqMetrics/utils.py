@@ -280,6 +280,10 @@ def _foo(denominator, numerator):
 
 
 def _mean_tweedie_deviance(y_true, y_pred, power=0, weights=None):
+    return float(np.average(_tweedie_deviance(y_true, y_pred, power=power), weights=weights))
+
+
+def _tweedie_deviance(y_true, y_pred, power=0):
     # copying from https://github.com/scikit-learn/scikit-learn/blob/95d4f0841d57e8b5f6b2a570312e9d832e69debc/sklearn/metrics/_regression.py#L659
 
     message = ("Mean Tweedie deviance error with power={} can only be used on "
@@ -324,7 +328,7 @@ def _mean_tweedie_deviance(y_true, y_pred, power=0, weights=None):
                    - y_true * np.power(y_pred, 1 - power) / (1 - power)
                    + np.power(y_pred, 2 - power) / (2 - power))
 
-    return float(np.average(dev, weights=weights))
+    return dev
 
 
 def _geometric_mean(a, axis=0, dtype=None):
@@ -1,5 +1,21 @@
-from AI4Water.utils.utils import make_model
-from AI4Water.utils.transformations import Transformations
-from AI4Water.utils.visualizations import Visualizations
+import importlib
 
-from AI4Water.utils.taylor_diagram import taylor_plot
\ No newline at end of file
+# imported on first use, so that e.g. importing the datasets does not import tensorflow through visualizations
+_LAZY_ATTRIBUTES = {
+    'make_model': 'AI4Water.utils.utils',
+    'Transformations': 'AI4Water.utils.transformations',
+    'Visualizations': 'AI4Water.utils.visualizations',
+    'taylor_plot': 'AI4Water.utils.taylor_diagram',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
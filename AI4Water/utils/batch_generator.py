@@ -0,0 +1,368 @@
+__all__ = ["BatchSequence", "WindowedSequence", "CachedSequence"]
+
+import os
+import copy
+import math
+
+import h5py
+import numpy as np
+
+from AI4Water.backend import tf
+from AI4Water.utils.utils import make_windows, label_mask, _strided_windows
+
+
+Sequence = tf.keras.utils.Sequence if tf is not None else object
+
+
+class BatchSequence(Sequence):
+    """
+    Base class of sequences which yield batches of (x, y) for a subset of
+    `examples` in an order which is shuffled at the end of every epoch, if
+    `shuffle` is True. If `allow_nan_labels` > 0, the batches are (x, y, mask)
+    where mask is 0 at the missing labels. Shuffling only permutes the indices of examples and the
+    sub-classes read the examples of only the current batch in `read_batch`.
+    """
+    def __init__(self,
+                 batch_size: int = 32,
+                 shuffle: bool = False,
+                 drop_remainder: bool = False,
+                 allow_nan_labels: int = 0,
+                 x_shape: list = None,
+                 seed: int = None):
+        super().__init__()
+
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_remainder = drop_remainder
+        self.allow_nan_labels = allow_nan_labels
+        self.x_shape = x_shape
+        self.rng = np.random.RandomState(seed)
+
+    @property
+    def examples(self):
+        return self._examples
+
+    @examples.setter
+    def examples(self, x):
+        self._examples = x
+        self._order = x.copy()
+        if self.shuffle:
+            self.rng.shuffle(self._order)
+
+    @property
+    def num_examples(self) -> int:
+        return len(self.examples)
+
+    @property
+    def nans_in_y(self) -> bool:
+        raise NotImplementedError
+
+    def read_batch(self, batch: np.ndarray):
+        """Returns the inputs and labels of examples in `batch`"""
+        raise NotImplementedError
+
+    def subset(self, positions, shuffle: bool = None):
+        """Returns a new sequence consisting of examples at `positions` of this
+        sequence. The underlying data is shared and not copied."""
+        seq = copy.copy(self)
+        if shuffle is not None:
+            seq.shuffle = shuffle
+        seq.examples = self.examples[np.asarray(positions, dtype=np.int64)]
+        return seq
+
+    def split(self, fraction: float):
+        """Splits the sequence into two sequences. The second sequence consists of
+        last `fraction` of examples and is not shuffled."""
+        split_at = int(self.num_examples * (1. - fraction))
+        return (self.subset(np.arange(split_at)),
+                self.subset(np.arange(split_at, self.num_examples), shuffle=False))
+
+    def __len__(self):
+        if self.drop_remainder:
+            return math.floor(self.num_examples / self.batch_size)
+        return math.ceil(self.num_examples / self.batch_size)
+
+    def __getitem__(self, idx):
+        batch = self._order[idx * self.batch_size:(idx + 1) * self.batch_size]
+        x, y = self.read_batch(batch)
+
+        if self.x_shape is not None:
+            x = x.reshape(self.x_shape)
+
+        if self.allow_nan_labels > 0:
+            # mask of valid labels is yielded as sample weights for the masked training step
+            mask = (~np.isnan(y)).astype(np.float32)
+            return x, np.nan_to_num(y), mask
+
+        return x, y
+
+    def on_epoch_end(self):
+        if self.shuffle:
+            self.rng.shuffle(self._order)
+
+    def to_tf_data(self):
+        """Returns the sequence as `tf.data.Dataset` which yields the same batches as the sequence."""
+        batch = self[0]
+
+        def generator():
+            for i in range(len(self)):
+                yield self[i]
+            self.on_epoch_end()
+
+        dataset = tf.data.Dataset.from_generator(generator,
+                                                 output_types=tuple(tf.float32 for _ in batch),
+                                                 output_shapes=tuple(tf.TensorShape((None,) + arr.shape[1:])
+                                                                     for arr in batch))
+        return dataset.prefetch(tf.data.experimental.AUTOTUNE)
+
+
+class WindowedSequence(BatchSequence):
+    """
+    Cuts the windows/examples from a 2d array on demand, one batch at a time,
+    instead of preparing the complete 3d array of shape (examples, lookback, ins)
+    in memory. The windows are exactly the same as those prepared by
+    `AI4Water.utils.utils.prepare_data` because both use same strided views
+    of the 2d data. Only the current batch is ever copied.
+
+    It can be passed directly to `tf.keras.Model.fit` or converted to `tf.data.Dataset`
+    using `to_tf_data` method.
+
+    Example
+    -------
+    ```python
+    >>>import numpy as np
+    >>>from AI4Water.utils.batch_generator import WindowedSequence
+    >>>data = np.random.random((1000, 4))
+    >>>seq = WindowedSequence(data, num_outputs=1, lookback_steps=10, batch_size=32)
+    >>>x, y = seq[0]
+    >>>x.shape, y.shape
+       ((32, 10, 3), (32, 1, 1))
+    ```
+    """
+    def __init__(self,
+                 data: np.ndarray,
+                 num_outputs: int,
+                 lookback_steps: int,
+                 input_steps: int = 1,
+                 forecast_step: int = 0,
+                 forecast_len: int = 1,
+                 known_future_inputs: bool = False,
+                 examples: np.ndarray = None,
+                 batch_size: int = 32,
+                 shuffle: bool = False,
+                 drop_remainder: bool = False,
+                 allow_nan_labels: int = 0,
+                 x_shape: list = None,
+                 seed: int = None):
+        """
+        Arguments:
+            data np.ndarray: 2d array whose last `num_outputs` columns are outputs.
+            num_outputs int, lookback_steps int, input_steps int, forecast_step int,
+            forecast_len int, known_future_inputs bool:
+                same as in `prepare_data`
+            examples np.ndarray: indices of windows which are to be used. The window
+                `i` is the i'th example prepared by `prepare_data` from `data`.
+                If None, all the windows will be used. This can be used to
+                skip the windows which cross the boundaries of `intervals`.
+            batch_size int: number of examples in one batch
+            shuffle bool: whether to shuffle the examples at the end of every epoch
+            drop_remainder bool: whether to skip the last batch if it is smaller
+                than `batch_size`
+            allow_nan_labels int: same as in `Model`. The examples are removed
+                accordingly and the nans in labels are replaced with zeros if > 0.
+            x_shape list: shape to which the inputs of each batch are reshaped.
+                The first dimension must be -1.
+            seed int: seed for shuffling
+        """
+        super().__init__(batch_size=batch_size,
+                         shuffle=shuffle,
+                         drop_remainder=drop_remainder,
+                         allow_nan_labels=allow_nan_labels,
+                         x_shape=x_shape,
+                         seed=seed)
+
+        # converting once to float32 so that prev_y and y are also views
+        self.data = np.asarray(data, dtype=np.float32)
+        self.num_outputs = num_outputs
+        self.lookback_steps = lookback_steps
+        self.input_steps = input_steps
+        self.forecast_step = forecast_step
+        self.forecast_len = forecast_len
+        self.known_future_inputs = known_future_inputs
+
+        self.x, self.prev_y, self.y = make_windows(self.data,
+                                                   lookback_steps=lookback_steps,
+                                                   num_outputs=num_outputs,
+                                                   input_steps=input_steps,
+                                                   forecast_step=forecast_step,
+                                                   forecast_len=forecast_len,
+                                                   known_future_inputs=known_future_inputs,
+                                                   copy=False)
+
+        if examples is None:
+            examples = np.arange(len(self.x))
+        self.examples = self.remove_nans(np.asarray(examples, dtype=np.int64))
+
+    @property
+    def target_rows(self) -> np.ndarray:
+        """Rows of `data` which contain the first target of each example."""
+        return self.examples + (self.lookback_steps - 1) * self.input_steps + self.forecast_step
+
+    @property
+    def nans_in_y(self) -> bool:
+        return bool(np.isnan(self.y[self.examples]).any())
+
+    def remove_nans(self, examples: np.ndarray) -> np.ndarray:
+        """Removes the examples with nans in labels depending upon `allow_nan_labels`
+        and makes sure that inputs do not contain nans."""
+        num_inputs = self.data.shape[1] - self.num_outputs
+        nan_rows = np.isnan(self.data[:, 0:num_inputs]).any(axis=1)
+        if nan_rows.any():
+            # reduction over the strided view does not materialize the windows
+            window_len = self.x.shape[1]
+            nan_windows = _strided_windows(nan_rows.reshape(-1, 1), len(self.x), window_len, self.input_steps)
+            nans = int(nan_windows[examples].any(axis=(1, 2)).sum())
+            assert nans == 0, f"input still contains nans in {nans} examples"
+
+        keep, _ = label_mask(self.y[examples], self.allow_nan_labels)
+        return examples[keep]
+
+    def read_batch(self, batch: np.ndarray):
+        # fancy indexing the strided views copies only the windows in this batch
+        return self.x[batch], self.y[batch]
+
+
+class CachedSequence(BatchSequence):
+    """
+    Streams batches of examples which were written by `Model.write_cache` either
+    as an h5 file with `input_X`, `input_Y` and `label_Y` datasets or as a
+    directory of `input_X.npy`, `input_Y.npy` and `label_Y.npy` files. The npy
+    files are memory-mapped, so the operating system shares their pages between
+    all the processes which read the same files. Only the examples of current
+    batch are read from disk and, in h5 files, they are read in increasing order
+    so that each chunk is read at most once per batch.
+
+    Example
+    -------
+    ```python
+    >>>from AI4Water.utils.batch_generator import CachedSequence
+    >>>seq = CachedSequence("results/data_0.h5", batch_size=32, shuffle=True)
+    >>>x, y = seq[0]
+    ```
+    """
+    # number of examples read at once when a whole dataset has to be scanned
+    chunk_size = 65536
+
+    def __init__(self,
+                 path: str,
+                 examples: np.ndarray = None,
+                 batch_size: int = 32,
+                 shuffle: bool = False,
+                 drop_remainder: bool = False,
+                 allow_nan_labels: int = 0,
+                 x_shape: list = None,
+                 seed: int = None):
+        """
+        Arguments:
+            path str: h5 file or the directory containing npy files
+            examples np.ndarray: indices of examples which are to be used. If None,
+                all the examples will be used.
+            others: same as in `WindowedSequence`
+        """
+        super().__init__(batch_size=batch_size,
+                         shuffle=shuffle,
+                         drop_remainder=drop_remainder,
+                         allow_nan_labels=allow_nan_labels,
+                         x_shape=x_shape,
+                         seed=seed)
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"cache {path} does not exist")
+
+        self.path = path
+        self.is_h5 = os.path.isfile(path)
+        self._h5 = None
+        self._arrays = None
+
+        if examples is None:
+            examples = np.arange(len(self.x))
+        self.examples = np.asarray(examples, dtype=np.int64)
+
+    def __getstate__(self):
+        # open file handles can not be sent to other processes, each process opens its own.
+        state = self.__dict__.copy()
+        state['_h5'] = None
+        state['_arrays'] = None
+        return state
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """closes the h5 file, it is opened again when the examples are read next time."""
+        if getattr(self, '_h5', None) is not None:
+            self._h5.close()
+            self._h5 = None
+            self._arrays = None
+        return
+
+    def on_epoch_end(self):
+        super().on_epoch_end()
+        # so that the file is not kept open by the sequence between epochs
+        self.close()
+
+    @property
+    def arrays(self) -> dict:
+        if self._arrays is None:
+            names = ['input_X', 'input_Y', 'label_Y']
+            if self.is_h5:
+                self._h5 = h5py.File(self.path, 'r')
+                self._arrays = {name: self._h5[name] for name in names}
+            else:
+                self._arrays = {name: np.load(os.path.join(self.path, name + '.npy'), mmap_mode='r')
+                                for name in names}
+        return self._arrays
+
+    @property
+    def x(self):
+        return self.arrays['input_X']
+
+    @property
+    def y(self):
+        return self.arrays['label_Y']
+
+    def read(self, array, examples: np.ndarray) -> np.ndarray:
+        """Reads the `examples` from `array` in the order in which they are given."""
+        order = np.argsort(examples, kind='stable')
+        sorted_examples = examples[order]
+        if self.is_h5:
+            # h5py only supports increasing indices without duplicates
+            unique, inverse = np.unique(sorted_examples, return_inverse=True)
+            values = array[unique][inverse]
+        else:
+            values = array[sorted_examples]
+
+        out = np.empty_like(values)
+        out[order] = values
+        return out
+
+    def read_batch(self, batch: np.ndarray):
+        return (self.read(self.x, batch).astype(np.float32),
+                self.read(self.y, batch).astype(np.float32))
+
+    def labels(self) -> np.ndarray:
+        """Returns the labels of all the examples in chunks of `chunk_size`."""
+        return np.concatenate([self.read(self.y, self.examples[st:st + self.chunk_size])
+                               for st in range(0, max(self.num_examples, 1), self.chunk_size)])
+
+    def last_step_inputs(self) -> np.ndarray:
+        """Returns the inputs at last lookback step of all the examples which are
+        required to inverse transform the predictions."""
+        if self.x.ndim == 3:
+            return np.concatenate([self.read(self.x, self.examples[st:st + self.chunk_size])[:, -1]
+                                   for st in range(0, max(self.num_examples, 1), self.chunk_size)])
+        return self.read(self.x, self.examples)
+
+    @property
+    def nans_in_y(self) -> bool:
+        return bool(np.isnan(self.labels()).any())
@@ -0,0 +1,179 @@
+__all__ = ["DataCache", "DATA_CACHE", "fingerprint"]
+
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+import h5py
+import joblib
+import numpy as np
+import pandas as pd
+
+
+def fingerprint(data, **config) -> str:
+    """
+    Returns a hash which identifies the `data` and the `config` used to prepare
+    examples from it. The data is hashed in a vectorized way, so this is much
+    cheaper than preparing the examples again.
+
+    Arguments:
+        data : pd.DataFrame or np.ndarray
+        config : any json serializable (or representable as string) arguments
+    """
+    hasher = hashlib.sha1()
+
+    if isinstance(data, pd.DataFrame):
+        hasher.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        hasher.update(json.dumps(list(map(str, data.columns))).encode())
+    elif isinstance(data, np.ndarray):
+        hasher.update(np.ascontiguousarray(data).view(np.uint8))
+        hasher.update(str(data.shape).encode())
+        hasher.update(str(data.dtype).encode())
+    else:
+        raise TypeError(f"can not make fingerprint of data of type {data.__class__.__name__}")
+
+    hasher.update(json.dumps(config, sort_keys=True, default=str).encode())
+
+    return hasher.hexdigest()
+
+
+class DataCache(object):
+    """
+    In-memory and on-disk cache of prepared (x, prev_y, label) arrays along with
+    the state of model, such as the scalers which were fitted, while preparing them. The entries are keyed by
+    `fingerprint` of data and the data preparation config. The least recently used
+    entries are evicted when the size of the cache exceeds `max_memory` bytes in
+    memory or `max_disk` bytes on disk.
+
+    The on-disk entries are h5 files written by `Model.write_cache` and can
+    therefore be shared between different `Model` instances and processes.
+
+    Example
+    -------
+    ```python
+    >>>from AI4Water import Model
+    >>>from AI4Water.utils.data_cache import DATA_CACHE
+    >>>DATA_CACHE.max_memory = 4 * 1024**3  # 4 GB
+    >>>model = Model(data=df, cache_data=True)
+    ```
+    """
+    def __init__(self, max_memory: int = 1024**3, max_disk: int = 10 * 1024**3):
+        """
+        Arguments:
+            max_memory int: maximum size of cached arrays in memory in bytes
+            max_disk int: maximum size of cached files in a cache directory in bytes
+        """
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+        self.memory = OrderedDict()
+
+    @staticmethod
+    def default_path() -> str:
+        return os.path.join(os.getcwd(), "results", "data_cache")
+
+    @property
+    def memory_size(self) -> int:
+        return sum(sum(a.nbytes for a in arrays) for arrays, _ in self.memory.values())
+
+    def get(self, key: str, path: str = None):
+        """
+        Returns a tuple of (x, prev_y, label, state) if `key` is found in
+        memory or in `path` directory, otherwise None. The arrays are read-only.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            arrays, state = self.memory[key]
+            return (*arrays, state)
+
+        if path is None:
+            return None
+
+        fname = os.path.join(path, key + ".h5")
+        sname = os.path.join(path, key + ".joblib")
+        if not (os.path.exists(fname) and os.path.exists(sname)):
+            return None
+
+        with h5py.File(fname, 'r') as h5:
+            arrays = (h5['input_X'][()], h5['input_Y'][()], h5['label_Y'][()])
+        state = joblib.load(sname)
+        # so that this file is evicted last
+        os.utime(fname)
+
+        self._put_in_memory(key, arrays, state)
+
+        return (*arrays, state)
+
+    def put(self, key: str, x, prev_y, label, state: dict, path: str = None, writer=None):
+        """
+        Puts the arrays in cache.
+        Arguments:
+            key str: key returned by `fingerprint`
+            x, prev_y, label : arrays to cache. They are made read-only.
+            state dict: e.g. scalers, which is to be restored when the arrays are fetched
+            path str: directory in which to write the arrays. If None, arrays are
+                cached only in memory.
+            writer callable: which writes the arrays in h5 file. It must accept
+                file name, x, prev_y and label as arguments.
+        """
+        if not all(isinstance(a, np.ndarray) for a in (x, prev_y, label)):
+            return
+
+        self._put_in_memory(key, (x, prev_y, label), state)
+
+        if path is not None and writer is not None:
+            if not os.path.exists(path):
+                os.makedirs(path)
+            sname = os.path.join(path, key + ".joblib")
+            try:
+                joblib.dump(state, sname)
+            except Exception:  # scalers with lambda functions can not be pickled
+                if os.path.exists(sname):
+                    os.remove(sname)
+                return
+            writer(os.path.join(path, key + ".h5"), x, prev_y, label)
+            self.evict_disk(path)
+        return
+
+    def _put_in_memory(self, key, arrays, state):
+        # the same arrays are returned by every `get`, so they must not be modified in place
+        for a in arrays:
+            a.setflags(write=False)
+        self.memory[key] = (arrays, state)
+        self.memory.move_to_end(key)
+        self.evict_memory()
+        return
+
+    def evict_memory(self):
+        """Removes least recently used entries until the cache fits in `max_memory`."""
+        while len(self.memory) > 0 and self.memory_size > self.max_memory:
+            self.memory.popitem(last=False)
+        return
+
+    def evict_disk(self, path: str):
+        """Removes least recently used files from `path` until they fit in `max_disk`."""
+        files = [os.path.join(path, f) for f in os.listdir(path) if f.endswith(".h5")]
+        files = sorted(files, key=os.path.getmtime)
+        total = sum(os.path.getsize(f) for f in files)
+
+        while len(files) > 0 and total > self.max_disk:
+            fname = files.pop(0)
+            total -= os.path.getsize(fname)
+            os.remove(fname)
+            sname = fname[:-len(".h5")] + ".joblib"
+            if os.path.exists(sname):
+                os.remove(sname)
+        return
+
+    def clear(self, path: str = None):
+        """Clears the cache from memory and optionally from `path` directory as well."""
+        self.memory.clear()
+        if path is not None and os.path.exists(path):
+            for f in os.listdir(path):
+                if f.endswith(".h5") or f.endswith(".joblib"):
+                    os.remove(os.path.join(path, f))
+        return
+
+
+# one cache shared by all the models in a process e.g. during hyperparameter optimization
+DATA_CACHE = DataCache()
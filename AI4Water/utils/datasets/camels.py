@@ -1,7 +1,12 @@
 import os
 import glob
+import json
 import random
+import warnings
 from typing import Union
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+import h5py
 
 try:
     import netCDF4
@@ -12,7 +17,7 @@ import numpy as np
 import pandas as pd
 
 from .datasets import Datasets
-from .utils import check_attributes, download, sanity_check
+from .utils import check_attributes, sanity_check
 
 try:  # shapely may not be installed, as it may be difficult to isntall and is only needed for plotting data.
     from AI4Water.utils.spatial_utils import plot_shapefile
@@ -22,6 +27,9 @@ except ModuleNotFoundError:
 
 SEP = os.sep
 
+# errors in reading or parsing the files of a station, which do not stop fetching of other stations
+STATION_ERRORS = (OSError, KeyError, ValueError)
+
 
 def gb_message():
     link = "https://doi.org/10.5285/8344e4f3-d2ea-44f5-8afa-86d2987543a9"
@@ -50,7 +58,8 @@ class Camels(Datasets):
             station/gauge_ids or a speficified station. It can also be used to
             fetch all attributes of a number of stations ids either by providing
             their guage_id or  by just saying that we need data of 20 stations
-            which will then be chosen randomly.
+            which will then be chosen randomly. If the dynamic attributes have
+            been cached using `write_cache`, they are read from the cache.
 
         fetch_dynamic_attributes :
             fetches speficied dynamic attributes of one specified station. If the
@@ -63,6 +72,10 @@ class Camels(Datasets):
             Here if the `category` is not specified then static attributes of
             the specified station for all categories are returned.
         stations : returns list of stations
+
+        write_cache :
+            converts the dynamic attributes of all stations into an h5 file so
+            that the raw files are not parsed again by `fetch`.
     """
 
     DATASETS = {
@@ -77,9 +90,75 @@ class Camels(Datasets):
     def fetch_dynamic_attributes(self, station, dynamic_attributes, **kwargs):
         raise NotImplementedError
 
-    def fetch_static_attributes(self, station, static_attributes, st=None, en=None, as_ts=False):
+    def fetch_static_attributes(self, station, static_attributes='all', st=None, en=None, as_ts=False):
+        return self._fetch_static(station, static_attributes, st=st, en=en, as_ts=as_ts)
+
+    def _read_static_table(self) -> pd.DataFrame:
+        """reads static attributes of all stations as a dataframe whose index is station ids"""
         raise NotImplementedError
 
+    @property
+    def static_table(self) -> pd.DataFrame:
+        """Static attributes of all stations as a dataframe whose index is
+        station ids as strings. The files are read only once per instance."""
+        if getattr(self, '_static_table', None) is None:
+            df = self._read_static_table()
+            df.index = df.index.astype(str).str.strip()
+            self._static_table = df
+        return self._static_table
+
+    def _fetch_static(self, stations, attributes='all', st=None, en=None, as_ts=False) -> pd.DataFrame:
+        """
+        Fetches static attributes of one or more stations at once from `static_table`.
+        Returns:
+            dataframe of shape (stations, attributes). If `as_ts` is True, then
+            the static attributes are repeated for each day between `st` and `en`.
+            For more than one station, the index is then (station, time).
+        """
+        single = not isinstance(stations, list)
+        if single:
+            stations = [stations]
+
+        attributes = check_attributes(attributes, self.static_table.columns.to_list())
+        df = self.static_table.loc[[str(stn).strip() for stn in stations], attributes]
+        df.index = stations
+
+        if not as_ts:
+            return df
+
+        st, en = self._check_length(st, en)
+        idx = pd.date_range(st, en, freq='D')
+        index = idx if single else pd.MultiIndex.from_product([stations, idx])
+        return pd.DataFrame({col: np.repeat(df[col].values, len(idx)) for col in attributes}, index=index)
+
+    def _static_frame(self, stations: list, static_attributes) -> pd.DataFrame:
+        """static attributes of stations as dataframe of shape (stations, static_attributes)"""
+        try:
+            return self._fetch_static(stations, static_attributes)
+        except NotImplementedError:  # the dataset can fetch static attributes only station by station
+            return pd.concat([self.fetch_static_attributes(stn, static_attributes) for stn in stations])
+
+    def _add_static(self, dynamic: dict, static_attributes, as_ts=False) -> dict:
+        """Adds static attributes to the dataframes of dynamic attributes of
+        stations. The static attributes of all stations are fetched at once. If
+        `as_ts` is True, they are broadcasted as constant columns of dynamic
+        dataframes, otherwise a dictionary of `dynamic` and `static` is returned
+        for each station."""
+        if len(dynamic) == 0:
+            return dynamic
+
+        static = self._static_frame(list(dynamic.keys()), static_attributes)
+
+        stations_attributes = {}
+        for pos, (station, stn_df) in enumerate(dynamic.items()):
+            row = static.iloc[[pos]]
+            if as_ts:
+                stations_attributes[station] = stn_df.assign(**{col: row[col].iloc[0] for col in static.columns})
+            else:
+                stations_attributes[station] = {'dynamic': stn_df, 'static': row}
+
+        return stations_attributes
+
     @property
     def start(self):  # start of data
         raise NotImplementedError
@@ -106,6 +185,11 @@ class Camels(Datasets):
         else:
             return static
 
+    @property
+    def cache_path(self) -> str:
+        """path of h5 file in which the dynamic attributes are cached by `write_cache`"""
+        return os.path.join(self.ds_dir, f'{self.name}_dynamic.h5')
+
     @property
     def camels_dir(self):
         """Directory where all camels datasets will be saved. This will under datasets directory"""
@@ -132,6 +216,7 @@ class Camels(Datasets):
               static_attributes: Union[str, list, None] = None,
               st: Union[None, str] = None,
               en: Union[None, str] = None,
+              n_workers: int = 1,
               **kwargs
               ) -> dict:
         """
@@ -152,12 +237,27 @@ class Camels(Datasets):
                 returned from where it is available.
             en : end date of data to be returned. If None, then the data will be
                 returned till the date data is available.
+            n_workers : number of stations to be fetched concurrently. See
+                `fetch_stations_attributes`.
             kwargs : keyword arguments to read the files
 
         returns:
             dictionary whose keys are station/gauge_ids and values are the attributes and dataframes.
 
         """
+        stations = self._resolve_stations(stations)
+
+        if dynamic_attributes and self._cache_has(dynamic_attributes, st, en):
+            return self._fetch_from_cache(stations, dynamic_attributes, static_attributes,
+                                          st=st, en=en, n_workers=n_workers,
+                                          **kwargs)
+
+        return self.fetch_stations_attributes(stations, dynamic_attributes, static_attributes,
+                                              st=st, en=en, n_workers=n_workers,
+                                              **kwargs)
+
+    def _resolve_stations(self, stations) -> list:
+        """converts the `stations` argument of `fetch` into a list of stations"""
         if isinstance(stations, int):
             # the user has asked to randomly provide data for some specified number of stations
             stations = random.sample(self.stations(), stations)
@@ -173,15 +273,282 @@ class Camels(Datasets):
             stations = self.stations()
         else:
             raise TypeError(f"Unknown value provided for stations {stations}")
+        return stations
 
-        return self.fetch_stations_attributes(stations, dynamic_attributes, static_attributes,
-                                              st=st, en=en,
-                                              **kwargs)
+    def fetch_as_array(self,
+                       stations: Union[str, list, int, float, None] = None,
+                       dynamic_attributes: Union[list, str] = 'all',
+                       static_attributes: Union[str, list, None] = None,
+                       st: Union[None, str] = None,
+                       en: Union[None, str] = None,
+                       freq: str = 'D',
+                       memmap_path: str = None,
+                       batch_size: int = 64,
+                       **kwargs) -> tuple:
+        """
+        Fetches the attributes of stations as dense arrays instead of a dictionary
+        of dataframes, so that they can be fed to a model trained on many stations.
+        The dynamic attributes of all stations are aligned on a common date index
+        from `st` to `en` and the missing dates are nan.
+
+        Arguments:
+            stations : same as for `fetch`
+            dynamic_attributes : dynamic attributes to be fetched
+            static_attributes : static attributes to be fetched. If None, then
+                no static attribute is fetched. The attributes which are not
+                numeric are nan.
+            st : start of the common date index
+            en : end of the common date index
+            freq : frequency of the common date index
+            memmap_path : if given, the dynamic array is written to this `.npy`
+                file and returned as a memory mapped array. It can be loaded
+                again with `np.load(memmap_path, mmap_mode='r')`.
+            batch_size : number of stations which are fetched at once. The
+                memory used by dataframes is limited to this many stations.
+            kwargs : any other keyword arguments for `fetch` e.g. `n_workers`
+        Returns:
+            a tuple of
+                dynamic : float32 array of shape (stations, time, dynamic_attributes)
+                    whose last dimension is in the order of `dynamic_attributes`,
+                    or of `self.dynamic_attributes` if it is 'all'. The attributes
+                    which a station does not have are nan.
+                static : float32 array of shape (stations, static_attributes) or
+                    None if `static_attributes` is None
+                index : common date index of the `time` dimension
+                stations : list of stations in the order of first dimension
+        Example
+        -------
+        ```python
+        >>>dataset = CAMELS_AUS()
+        >>>dynamic, static, index, stations = dataset.fetch_as_array(dynamic_attributes=['streamflow_mmd'],
+        ...                                                          static_attributes='all')
+        ```
+        """
+        stations = self._resolve_stations(stations)
+        st, en = self._check_length(st, en)
+        index = pd.date_range(st, en, freq=freq)
+        # the columns of stations' dataframes may be in any order
+        attributes = check_attributes(dynamic_attributes, self.dynamic_attributes)
+
+        dynamic = None
+        for b in range(0, len(stations), batch_size):
+            batch = stations[b:b + batch_size]
+            data = self.fetch(batch, attributes, None, st=st, en=en, **kwargs)
+
+            for row, stn in enumerate(batch, start=b):
+                if stn not in data:  # could have failed
+                    continue
+                if dynamic is None:
+                    shape = (len(stations), len(index), len(attributes))
+                    if memmap_path is None:
+                        dynamic = np.full(shape, np.nan, dtype=np.float32)
+                    else:
+                        dynamic = np.lib.format.open_memmap(memmap_path, mode='w+', dtype=np.float32, shape=shape)
+                        dynamic[:] = np.nan
+
+                stn_df = data[stn].reindex(index=index, columns=attributes)
+                dynamic[row] = stn_df.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float32)
+
+        if dynamic is None:
+            raise ValueError("data of none of the stations could be fetched")
+
+        if memmap_path is not None:
+            dynamic.flush()
+
+        static = None
+        if static_attributes is not None:
+            static = self._static_frame(stations, static_attributes)
+            static = static.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float32)
+
+        return dynamic, static, index, stations
+
+    def write_cache(self,
+                    stations: list = None,
+                    batch_size: int = 64,
+                    n_workers: int = 1,
+                    overwrite: bool = False) -> str:
+        """
+        Converts the dynamic attributes of stations into an h5 file at `cache_path`.
+        The raw files are parsed only once here and afterwards `fetch` reads the
+        dynamic attributes from this file. The data is saved as one array of shape
+        (dynamic_attributes, stations, time) which is chunked so that each chunk
+        contains the time series of one attribute of one station. Thus reading
+        some attributes of some stations reads only those time series. The time
+        index of the cache is the union of time index of all stations. The
+        stations, attributes and period for which the cache is written are saved
+        in it and `fetch` reads from raw files whatever the cache does not contain.
+
+        Arguments:
+            stations : stations to be cached. If None, then all stations are cached.
+            batch_size : number of stations whose raw data is read at once.
+            n_workers : number of stations to be read concurrently. The stations
+                which could not be read are not cached.
+            overwrite : if True, an existing cache is written again. Otherwise
+                an existing cache written for other stations raises ValueError.
+        Returns:
+            path of the cache
+        """
+        if stations is None:
+            stations = self.stations()
+        attributes = list(self.dynamic_attributes)
+        st, en = self._check_length(None, None)
+        params = {'stations': [str(stn) for stn in stations], 'attributes': attributes, 'st': str(st), 'en': str(en)}
+
+        if os.path.exists(self.cache_path) and not overwrite:
+            if self._cache_params() != params:
+                raise ValueError(f"{self.cache_path} was written for other stations or attributes. "
+                                 f"Use overwrite=True to write it again")
+            return self.cache_path
+
+        tmp_path = self.cache_path + '.tmp'
+        with h5py.File(tmp_path, 'w') as h5:
+            dset = None
+            rows = {}
+            for b in range(0, len(stations), batch_size):
+                batch = stations[b:b + batch_size]
+                try:
+                    data = self.fetch_stations_attributes(batch, attributes, None, n_workers=n_workers)
+                except STATION_ERRORS:  # none of the stations in this batch could be read
+                    data = {}
+
+                for row, stn in enumerate(batch, start=b):
+                    if stn not in data:
+                        continue
+                    stn_df = self._cache_frame(data[stn])
+
+                    if dset is None:
+                        # attributes which the raw files of this dataset do not have are not cached
+                        columns = [attr for attr in attributes if attr in stn_df.columns]
+                        index = pd.DatetimeIndex([])
+                        chunk = max(1, min(len(stn_df), 2**16))
+                        time = h5.create_dataset('time', shape=(0,), maxshape=(None,), dtype=np.int64,
+                                                 chunks=(chunk,))
+                        dset = h5.create_dataset('dynamic',
+                                                 shape=(len(columns), len(stations), 0),
+                                                 maxshape=(len(columns), len(stations), None),
+                                                 dtype=np.float64,
+                                                 chunks=(1, 1, chunk),
+                                                 fillvalue=np.nan)
+
+                    # dates which are not in the cache yet are appended to its time axis
+                    new_dates = pd.DatetimeIndex(stn_df.index).difference(index)
+                    if len(new_dates) > 0:
+                        index = index.append(new_dates)
+                        time.resize((len(index),))
+                        time[-len(new_dates):] = new_dates.values.astype('datetime64[ns]').astype(np.int64)
+                        dset.resize(len(index), axis=2)
+
+                    values = np.full((len(columns), len(index)), np.nan)
+                    stn_df = stn_df.reindex(columns=columns).apply(pd.to_numeric, errors='coerce')
+                    values[:, index.get_indexer(stn_df.index)] = stn_df.values.T
+                    dset[:, row, :] = values
+                    rows[str(stn)] = row
+
+            if dset is None:
+                raise ValueError("data of none of the stations could be read")
+
+            h5.attrs['stations'] = json.dumps(rows)
+            h5.attrs['attributes'] = json.dumps(columns)
+            h5.attrs['params'] = json.dumps(params)
+
+        os.replace(tmp_path, self.cache_path)
+
+        return self.cache_path
+
+    def _cache_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """makes the columns of a dataframe returned by `fetch_dynamic_attributes`
+        same as `dynamic_attributes` before it is written in the cache"""
+        return df
+
+    def _cache_params(self) -> Union[dict, None]:
+        """stations, attributes and period for which the cache was written"""
+        if not os.path.exists(self.cache_path):
+            return None
+        with h5py.File(self.cache_path, 'r') as h5:
+            params = h5.attrs.get('params', None)
+        return None if params is None else json.loads(params)
+
+    def _cache_has(self, dynamic_attributes, st=None, en=None) -> bool:
+        """whether the cache contains these dynamic attributes from `st` to `en`"""
+        params = self._cache_params()
+        if params is None:
+            return False
+        st, en = self._check_length(st, en)
+        attributes = check_attributes(dynamic_attributes, list(self.dynamic_attributes))
+        with h5py.File(self.cache_path, 'r') as h5:
+            cached_attrs = json.loads(h5.attrs['attributes'])
+        return (all(attr in cached_attrs for attr in attributes)
+                and pd.Timestamp(params['st']) <= pd.Timestamp(st)
+                and pd.Timestamp(en) <= pd.Timestamp(params['en']))
+
+    def _fetch_from_cache(self,
+                          stations: list,
+                          dynamic_attributes: Union[str, list] = 'all',
+                          static_attributes: Union[str, list, None] = None,
+                          as_ts: bool = False,
+                          st: Union[str, None] = None,
+                          en: Union[str, None] = None,
+                          n_workers: int = 1,
+                          **kwargs) -> dict:
+        """fetches attributes of stations with dynamic attributes read from the
+        cache. The stations which are not in the cache are read from raw files."""
+        st, en = self._check_length(st, en)
+
+        with h5py.File(self.cache_path, 'r') as h5:
+            rows = json.loads(h5.attrs['stations'])  # station -> row
+            cached_attrs = json.loads(h5.attrs['attributes'])
+            attributes = check_attributes(dynamic_attributes, cached_attrs)
+
+            # the time axis is in the order in which the dates were added to the cache
+            time = h5['time'][:]
+            order = np.argsort(time, kind='stable')
+            index = pd.DatetimeIndex(time[order].astype('datetime64[ns]'))
+            selected = index.slice_indexer(st, en)
+            index, positions = index[selected], order[selected]
+
+            time_slice, take = slice(None), positions
+            if len(positions) == 0 or (np.diff(positions) == 1).all():  # only the selected dates are read
+                start = positions[0] if len(positions) > 0 else 0
+                time_slice, take = slice(start, start + len(positions)), None
+
+            # h5py reads only increasing indices without duplicates
+            cached = sorted({rows[str(stn)] for stn in stations if str(stn) in rows})
+            arrays = {}
+            if len(cached) > 0:
+                arrays = {attr: h5['dynamic'][cached_attrs.index(attr), cached, time_slice] for attr in attributes}
+                if take is not None:
+                    arrays = {attr: array[:, take] for attr, array in arrays.items()}
+
+        not_cached = [stn for stn in stations if str(stn) not in rows]
+        if len(not_cached) > 0:
+            not_cached = self.fetch_stations_attributes(not_cached, dynamic_attributes, static_attributes,
+                                                        as_ts=as_ts, st=st, en=en, n_workers=n_workers, **kwargs)
+
+        position = {row: pos for pos, row in enumerate(cached)}
+        from_cache = {}
+        for stn in stations:
+            if str(stn) in rows:
+                pos = position[rows[str(stn)]]
+                from_cache[stn] = pd.DataFrame({attr: arrays[attr][pos] for attr in attributes}, index=index)
+
+        if static_attributes is not None:
+            from_cache = self._add_static(from_cache, static_attributes, as_ts)
+
+        stations_attributes = {}
+        for stn in stations:
+            if stn in from_cache:
+                stations_attributes[stn] = from_cache[stn]
+            elif stn in not_cached:  # could have failed
+                stations_attributes[stn] = not_cached[stn]
+
+        return stations_attributes
 
     def fetch_stations_attributes(self,
                                   stations: list,
                                   dynamic_attributes: Union[str, list, None] = 'all',
                                   static_attributes: Union[str, list, None] = None,
+                                  n_workers: int = 1,
+                                  use_processes: bool = False,
                                   **kwargs) -> dict:
         """fetches attributes of multiple stations.
         Arguments:
@@ -191,14 +558,55 @@ class Camels(Datasets):
             static_attributes : list of static attributes to be fetched.
                 If `all`, then all static attributes will be fetched. If None,
                 then no static attribute will be fetched.
+            n_workers : number of stations to be fetched concurrently. A
+                station whose files can not be read or parsed does not stop
+                fetching of others. Such stations are left out of the returned
+                dictionary with a warning and the errors of the latest call are
+                saved in `failed_stations` attribute. If none of the stations
+                could be fetched, the error of the first one is raised. Other
+                errors e.g. for invalid attributes are always raised.
+            use_processes : if True, a pool of `n_workers` processes is used
+                instead of threads. This is useful when reading the files is
+                limited by parsing in python e.g. for CAMELS_US.
             kwargs dict: additional keyword arguments
         """
         assert isinstance(stations, list)
 
+        static = None
+        if dynamic_attributes and static_attributes is not None:
+            # static attributes of all stations are added together after reading dynamic attributes
+            static, static_attributes = static_attributes, None
+
         stations_attributes = {}
-        for station in stations:
-            stations_attributes[station] = self.fetch_station_attributes(
-                station, dynamic_attributes, static_attributes, **kwargs)
+        self.failed_stations = {}
+        if n_workers == 1:
+            for station in stations:
+                try:
+                    stations_attributes[station] = self.fetch_station_attributes(
+                        station, dynamic_attributes, static_attributes, **kwargs)
+                except STATION_ERRORS as e:
+                    self.failed_stations[station] = e
+        else:
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with pool(max_workers=n_workers) as executor:
+                futures = {station: executor.submit(self.fetch_station_attributes,
+                                                    station, dynamic_attributes, static_attributes, **kwargs)
+                           for station in stations}
+
+            for station, future in futures.items():  # in the order of stations
+                try:
+                    stations_attributes[station] = future.result()
+                except STATION_ERRORS as e:
+                    self.failed_stations[station] = e
+
+        if 0 < len(self.failed_stations) == len(stations):
+            raise next(iter(self.failed_stations.values()))
+        elif len(self.failed_stations) > 0:
+            warnings.warn(f"could not fetch data of {len(self.failed_stations)} stations "
+                          f"{list(self.failed_stations.keys())}. See failed_stations for errors.")
+
+        if static is not None:
+            stations_attributes = self._add_static(stations_attributes, static, kwargs.get('as_ts', False))
 
         return stations_attributes
 
@@ -265,14 +673,35 @@ class LamaH(Camels):
         self.data_type = data_type
         super().__init__(**kwargs)
 
-        self._download()
+        if self.stream and os.path.exists(self.ds_dir) and not self._has_time_series():
+            # files of another data_type or time_step were streamed before
+            self._download_and_unzip()
+        else:
+            self._download()
 
     """
     Arguments:
         time_step str:
         data_type str:
+        stream bool: if True, only the files of `data_type` and `time_step`
+            are extracted while the archives are downloaded.
     """
 
+    def _select_member(self, member: str) -> bool:
+        parts = member.split('/')
+        for idx, part in enumerate(parts):
+            if any(dt in part for dt in self._data_types) and self.data_type not in part:
+                return False
+            if part == '2_timeseries' and idx + 1 < len(parts) - 1 and parts[idx + 1] != self.time_step:
+                return False
+        return True
+
+    def _has_time_series(self) -> bool:
+        try:
+            return len(os.listdir(os.path.join(self.data_type_dir, '2_timeseries', self.time_step))) > 0
+        except (FileNotFoundError, IndexError):
+            return False
+
     @property
     def dynamic_attributes(self):
         station = self.stations()[0]
@@ -290,6 +719,10 @@ class LamaH(Camels):
         """Directory where a particular dataset will be saved. """
         return os.path.join(self.camels_dir, self.name)
 
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.ds_dir, f'{self.name}_{self.data_type}_{self.time_step}_dynamic.h5')
+
     @property
     def data_type_dir(self):
         # self.ds_dir/CAMELS_AT/data_type_dir
@@ -335,16 +768,11 @@ class LamaH(Camels):
                                 en=None,
                                 as_ts=False):
 
-        fname = os.path.join(self.data_type_dir, f'1_attributes{SEP}Catchment_attributes.csv')
-
-        df = pd.read_csv(fname, sep=';', index_col='ID')
+        return self._fetch_static(station, static_attributes, st=st, en=en, as_ts=as_ts)
 
-        if static_attributes is not None:
-            static_attributes = check_attributes(static_attributes, self.static_attributes)
-
-        df = df[static_attributes]
-
-        return self.to_ts(df, st, en, as_ts)
+    def _read_static_table(self) -> pd.DataFrame:
+        fname = os.path.join(self.data_type_dir, f'1_attributes{SEP}Catchment_attributes.csv')
+        return pd.read_csv(fname, sep=';', index_col='ID')
 
     def fetch_dynamic_attributes(self,
                                  station,
@@ -435,11 +863,15 @@ class HYSETS(Camels):
 
     @property
     def static_attributes(self):
-        df = self.read_static_data()
-        return df.columns.to_list()
+        return self.static_table.columns.to_list()
+
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.ds_dir, f'{self.name}_{self.source}_dynamic.h5')
 
     def stations(self) -> list:
-        return self.read_static_data().index.to_list()
+        # static_table has ids as strings but the watershed ids of HYSETS are integers
+        return self.static_table.index.astype(int).to_list()
 
     @property
     def start(self):
@@ -456,23 +888,57 @@ class HYSETS(Camels):
                                  en=None,
                                  **kwargs):
 
+        return self.fetch_stations_dynamic_attributes([station], dynamic_attributes, st=st, en=en)[station]
+
+    def fetch_stations_dynamic_attributes(self,
+                                          stations: list,
+                                          dynamic_attributes='all',
+                                          st=None,
+                                          en=None) -> dict:
+        """fetches dynamic attributes of multiple stations. The netCDF file is
+        opened only once and only the rows of `stations` between `st` and `en`
+        are read from it.
+        Returns:
+            a dictionary whose keys are stations and values are dataframes.
+        """
         st, en = self._check_length(st, en)
         attrs = check_attributes(dynamic_attributes, self.dynamic_attributes)
 
-        nc = netCDF4.Dataset(os.path.join(self.ds_dir, f'HYSETS_2020_{self.source}.nc'))
+        fname = os.path.join(self.ds_dir, f'HYSETS_2020_{self.source}.nc')
+        nc = netCDF4.Dataset(fname)
+        attrs = [attr for attr in attrs if attr in nc.variables]  # SWE sources do not have tasmin and tasmax
+        nc.close()
 
-        stn_df = pd.DataFrame(columns=attrs)
+        return self._read_nc_stations(fname, stations, attrs, id_var='watershedID',
+                                      index=pd.date_range(self.start, self.end, freq='D'),
+                                      st=st, en=en)
 
-        for var in nc.variables:
-            if var in attrs:
-                ma = np.array(nc[var][:])
-                ma[ma == nc[var]._FillValue] = np.nan
-                ta = ma[station, :]  # target array of on station
-                s = pd.Series(ta, index=pd.date_range(self.start, self.end, freq='D'), name=var)
-                stn_df[var] = s[st:en]
-        nc.close()
+    def fetch_stations_attributes(self,
+                                  stations: list,
+                                  dynamic_attributes: Union[str, list, None] = 'all',
+                                  static_attributes: Union[str, list, None] = None,
+                                  as_ts: bool = False,
+                                  st=None,
+                                  en=None,
+                                  n_workers: int = 1,
+                                  **kwargs) -> dict:
+        """fetches attributes of multiple stations. The dynamic attributes of
+        all the stations are read in one pass over the netCDF file and static
+        attributes are read only once, so `n_workers` is used only when no
+        dynamic attribute is fetched."""
+        assert isinstance(stations, list)
+
+        if not dynamic_attributes:
+            return super().fetch_stations_attributes(stations, dynamic_attributes, static_attributes,
+                                                     as_ts=as_ts, st=st, en=en, n_workers=n_workers, **kwargs)
 
-        return
+        st, en = self._check_length(st, en)
+        dynamic = self.fetch_stations_dynamic_attributes(stations, dynamic_attributes, st=st, en=en)
+
+        if static_attributes is None:
+            return dynamic
+
+        return self._add_static(dynamic, static_attributes, as_ts)
 
     def fetch_static_attributes(self,
                                 station,
@@ -481,16 +947,15 @@ class HYSETS(Camels):
                                 en=None,
                                 as_ts=False):
 
-        df = self.read_static_data()
-
-        static_attributes = check_attributes(static_attributes, self.static_attributes)
-
-        return self.to_ts(df.loc[station][static_attributes], st=st, en=en, as_ts=as_ts)
+        return self._fetch_static(station, static_attributes, st=st, en=en, as_ts=as_ts)
 
     def read_static_data(self):
         fname = os.path.join(self.ds_dir, 'HYSETS_watershed_properties.txt')
         return pd.read_csv(fname, index_col='Watershed_ID', sep=';')
 
+    def _read_static_table(self) -> pd.DataFrame:
+        return self.read_static_data()
+
 
 class CAMELS_US(Camels):
     """
@@ -513,19 +978,17 @@ class CAMELS_US(Camels):
     dynamic_attributes = ['dayl(s)', 'prcp(mm/day)', 'srad(W/m2)',
                           'swe(mm)', 'tmax(C)', 'tmin(C)', 'vp(Pa)', 'Flow']
 
-    def __init__(self, data_source='basin_mean_daymet'):
+    def __init__(self, data_source='basin_mean_daymet', stream=False):
 
         assert data_source in self.folders, f'allwed data sources are {self.folders.keys()}'
         self.data_source = data_source
 
-        super().__init__("CAMELS_US")
+        super().__init__("CAMELS_US", stream=stream)
 
         if os.path.exists(self.ds_dir):
             print(f"dataset is already downloaded at {self.ds_dir}")
         else:
-            download(self.url, os.path.join(self.camels_dir, f'CAMELS_US{SEP}CAMELS_US.zip'))
-            download(self.catchment_attr_url, os.path.join(self.camels_dir, f"CAMELS_US{SEP}catchment_attrs.zip"))
-            self._unzip()
+            self._download_files([(self.url, 'CAMELS_US.zip'), (self.catchment_attr_url, 'catchment_attrs.zip')])
 
         self.attr_dir = os.path.join(self.ds_dir, f'catchment_attrs{SEP}camels_attributes_v2.0')
         self.dataset_dir = os.path.join(self.ds_dir, f'CAMELS_US{SEP}basin_dataset_public_v1p2')
@@ -535,6 +998,10 @@ class CAMELS_US(Camels):
         """Directory where a particular dataset will be saved. """
         return os.path.join(self.camels_dir, self.name)
 
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.ds_dir, f'{self.name}_{self.data_source}_dynamic.h5')
+
     @property
     def start(self):
         return "19800101"
@@ -620,9 +1087,9 @@ class CAMELS_US(Camels):
                                 en=None,
                                 as_ts=False
                                 ):
-        attributes = check_attributes(static_attributes, self.static_attributes)
-        st, en = self._check_length(st, en)
+        return self._fetch_static(station, static_attributes, st=st, en=en, as_ts=as_ts)
 
+    def _read_static_table(self) -> pd.DataFrame:
         static_fpath = os.path.join(self.ds_dir, 'static_attributes.csv')
         if not os.path.exists(static_fpath):
             files = glob.glob(f"{os.path.join(self.ds_dir, 'catchment_attrs', 'camels_attributes_v2.0')}/*.txt")
@@ -638,7 +1105,7 @@ class CAMELS_US(Camels):
             static_df = pd.read_csv(static_fpath, index_col='gauge_id')
             static_df.index = idx['gauge_id']
 
-        return self.to_ts(pd.DataFrame(static_df.loc[station][attributes]).transpose(), st, en, as_ts)
+        return static_df
 
 
 class CAMELS_BR(Camels):
@@ -829,8 +1296,9 @@ class CAMELS_BR(Camels):
         ```
         """
 
-        attributes = check_attributes(attributes, self.static_attributes)
+        return self._fetch_static(stn_id, attributes, st=st, en=en, as_ts=as_ts)
 
+    def _read_static_table(self) -> pd.DataFrame:
         static_fpath = os.path.join(self.ds_dir, 'static_attributes.csv')
         if not os.path.exists(static_fpath):
             files = glob.glob(f"{os.path.join(self.ds_dir, '01_CAMELS_BR_attributes','01_CAMELS_BR_attributes')}/*.txt")
@@ -842,7 +1310,7 @@ class CAMELS_BR(Camels):
         else:
             static_df = pd.read_csv(static_fpath, index_col='gauge_id')
 
-        return self.to_ts(pd.DataFrame(static_df.loc[int(stn_id)][attributes]).transpose(), st, en, as_ts)
+        return static_df
 
 
 class CAMELS_GB(Camels):
@@ -941,7 +1409,9 @@ class CAMELS_GB(Camels):
                                 **kwargs) -> pd.DataFrame:
         """Fetches static attributes of one station for one or more category as dataframe."""
 
-        attributes = check_attributes(attributes, self.static_attributes)
+        return self._fetch_static(stn_id, attributes, st=st, en=en, as_ts=as_ts)
+
+    def _read_static_table(self) -> pd.DataFrame:
         static_fname = 'static_attributes.csv'
         static_fpath = os.path.join(self.ds_dir, 'data', static_fname)
         if os.path.exists(static_fpath):
@@ -954,7 +1424,7 @@ class CAMELS_GB(Camels):
                 static_df = pd.concat([static_df, _df], axis=1)
             static_df.to_csv(static_fpath)
 
-        return self.to_ts(pd.DataFrame(static_df.loc[int(stn_id)][attributes]).transpose(), st, en, as_ts)
+        return static_df
 
 
 class CAMELS_AUS(Camels):
@@ -1006,28 +1476,25 @@ class CAMELS_AUS(Camels):
         'vp_SILO': f'05_hydrometeorology{SEP}05_hydrometeorology{SEP}03_Other{SEP}SILO{SEP}vp_SILO',
     }
 
-    def __init__(self, path=None):
+    def __init__(self, path=None, stream=False):
         """
         Arguments:
             path: path where the CAMELS-AUS dataset has been downloaded. This path
                 must contain five zip files and one xlsx file. If None, then the
                 data will downloaded.
+            stream: if True, the zip files are extracted while they are downloaded.
         """
         if path is not None:
             if not os.path.exists(path) or len(os.listdir(path)) < 2:
                 raise FileNotFoundError(f"The path {path} does not exist")
         self.ds_dir = path
 
-        super().__init__()
+        super().__init__(stream=stream)
         if not os.path.exists(self.ds_dir):
             os.makedirs(self.ds_dir)
 
-        for _file, url in self.urls.items():
-            fpath = os.path.join(self.ds_dir, _file)
-            if not os.path.exists(fpath):
-                download(url + _file, fpath)
-
-        self._unzip()
+        self._download_files([(url + _file, _file) for _file, url in self.urls.items()
+                              if not os.path.exists(os.path.join(self.ds_dir, _file))])
 
     @property
     def start(self):
@@ -1085,7 +1552,10 @@ class CAMELS_AUS(Camels):
                                   st=None,
                                   en=None,
                                   as_ts=False,
+                                  n_workers: int = 1,
                                   **kwargs) -> dict:
+        # one file contains one dynamic attribute of all stations, so all stations are read together
+        # and n_workers is not used
         stns = {}
         dyn_attrs = {}
 
@@ -1107,24 +1577,15 @@ class CAMELS_AUS(Camels):
                 stns[stn] = stn_df
 
             if static_attributes is not None:
-                static = self._read_static(stations, static_attributes, st, en, as_ts=as_ts)
-                for k, v in stns.items():
-                    if as_ts:
-                        stns[k] = pd.concat([stns[k], static], axis=1)
-                    else:
-                        stns[k] = {'dynamic': stns[k], 'static': static}
+                stns = self._add_static(stns, static_attributes, as_ts)
 
         elif static_attributes is not None:
-            _stns = self._read_static(stations, static_attributes, st, en, as_ts=as_ts)
             for k in stations:
-                stns[k] = pd.DataFrame(_stns.loc[k]).transpose()
+                stns[k] = self._fetch_static(k, static_attributes, st, en, as_ts=as_ts)
 
         return stns
 
-    def _read_static(self, stations, attributes,
-                     st=None, en=None, as_ts=False):
-
-        attributes = check_attributes(attributes, self.static_attributes)
+    def _read_static_table(self) -> pd.DataFrame:
         static_fname = 'static_attributes.csv'
         static_fpath = os.path.join(self.ds_dir, static_fname)
         if os.path.exists(static_fpath):
@@ -1137,7 +1598,7 @@ class CAMELS_AUS(Camels):
                 static_df = pd.concat([static_df, _df], axis=1)
             static_df.to_csv(static_fpath)
 
-        return self.to_ts(pd.DataFrame(static_df.loc[stations][attributes]), st, en, as_ts)
+        return static_df
 
     def fetch_dynamic_attributes(self,
                                  stn_id,
@@ -1174,7 +1635,7 @@ class CAMELS_AUS(Camels):
                                 **kwargs) -> pd.DataFrame:
         """Fetches static attribuets of one station as dataframe."""
 
-        return self._read_static(stn_id, attribute)
+        return self._fetch_static(stn_id, attribute, **kwargs)
 
     def plot(self, what, stations=None, **kwargs):
         assert what in ['outlets', 'boundaries']
@@ -1221,23 +1682,22 @@ class CAMELS_CL(Camels):
     Arguments:
         path: path where the CAMELS-AUS dataset has been downloaded. This path must
               contain five zip files and one xlsx file.
+        stream: if True, the zip files are extracted while they are downloaded.
     """
     def __init__(self,
-                 path: str = None
+                 path: str = None,
+                 stream: bool = False
                  ):
 
         self.ds_dir = path
 
-        super().__init__()
+        super().__init__(stream=stream)
 
         if not os.path.exists(self.ds_dir):
             os.makedirs(self.ds_dir)
 
-        for _file, url in self.urls.items():
-            fpath = os.path.join(self.ds_dir, _file)
-            if not os.path.exists(fpath):
-                download(url+_file, fpath)
-        self._unzip()
+        self._download_files([(url + _file, _file) for _file, url in self.urls.items()
+                              if not os.path.exists(os.path.join(self.ds_dir, _file))])
 
     @property
     def _all_dirs(self):
@@ -1254,9 +1714,7 @@ class CAMELS_CL(Camels):
 
     @property
     def static_attributes(self) -> list:
-        path = os.path.join(self.ds_dir, f"1_CAMELScl_attributes{SEP}1_CAMELScl_attributes.txt")
-        df = pd.read_csv(path, sep='\t', index_col='gauge_id')
-        return df.index.to_list()
+        return self.static_table.columns.to_list()
 
     def stations(self) -> list:
         """Tells all station ids for which a data of a specific attribute is available."""
@@ -1277,8 +1735,9 @@ class CAMELS_CL(Camels):
                                   st=None,
                                   en=None,
                                   as_ts=False,
+                                  n_workers: int = 1,
                                   **kwargs) -> dict:
-        """Overwitten for speed"""
+        """Overwitten for speed. All stations are read together so `n_workers` is not used."""
         stns = {}
         st, en = self._check_length(st, en)
 
@@ -1311,34 +1770,18 @@ class CAMELS_CL(Camels):
                 stns[stn] = stn_df[st:en]
 
             if static_attributes is not None:
-                static = self._read_static(stations, static_attributes, st, en, as_ts=as_ts)
-                for k, v in stns.items():
-                    if as_ts:
-                        stns[k] = pd.concat([stns[k], static[k]], axis=1)
-                    else:
-                        stns[k] = {'dynamic': stns[k], 'static': static[k]}
+                stns = self._add_static(stns, static_attributes, as_ts)
 
         elif static_attributes is not None:
-            return self._read_static(stations, static_attributes, st, en, as_ts=as_ts)
+            for k in stations:
+                stns[k] = self._fetch_static(k, static_attributes, st, en, as_ts=as_ts)
 
         return stns
 
-    def _read_static(self, stations, attributes, st, en, as_ts):
-        # overwritten for speed
-        df = pd.DataFrame()
+    def _read_static_table(self) -> pd.DataFrame:
+        # the file contains one column for each station, some of which start with a space
         path = os.path.join(self.ds_dir, f"1_CAMELScl_attributes{SEP}1_CAMELScl_attributes.txt")
-        _df = pd.read_csv(path, sep='\t', index_col='gauge_id')
-
-        stns_df = {}
-        for stn in stations:
-            if stn in _df:
-                df[stn] = _df[stn]
-            elif ' ' + stn in _df:
-                df[stn] = _df[' ' + stn]
-
-            stns_df[stn] = self.to_ts(df.transpose()[attributes], st, en, as_ts)
-
-        return stns_df
+        return pd.read_csv(path, sep='\t', index_col='gauge_id').transpose()
 
     def fetch_dynamic_attributes(self,
                                  stn_id,
@@ -1380,7 +1823,7 @@ class CAMELS_CL(Camels):
                                 as_ts=False
                                 ):
 
-        return self._read_static(station, attributes, st, en, as_ts)
+        return self._fetch_static(station, attributes, st, en, as_ts)
 
 
 class HYPE(Camels):
@@ -1417,6 +1860,10 @@ class HYPE(Camels):
     def stations(self):
         return np.arange(1, 565).astype(str).tolist()
 
+    @property
+    def cache_path(self) -> str:
+        return os.path.join(self.ds_dir, f'{self.name}_{self.time_step}_dynamic.h5')
+
     def fetch_dynamic_attributes(self,
                                  station,
                                  attributes='all',
@@ -1426,11 +1873,7 @@ class HYPE(Camels):
 
         dynamic_attributes = check_attributes(attributes, self.dynamic_attributes)
 
-        _dynamic_attributes = []
-        for dyn_attr in dynamic_attributes:
-            pref, suff = dyn_attr.split('_')[0], dyn_attr.split('_')[-1]
-            _dyn_attr = f"{pref}_{self.time_step}_{suff}"
-            _dynamic_attributes.append(_dyn_attr)
+        _dynamic_attributes = [self._file_attribute(dyn_attr) for dyn_attr in dynamic_attributes]
 
         df = pd.DataFrame()
         for dyn_attr in _dynamic_attributes:
@@ -1443,6 +1886,14 @@ class HYPE(Camels):
 
         return df[_dynamic_attributes][st:en]
 
+    def _file_attribute(self, dyn_attr: str) -> str:
+        """name of a dynamic attribute in the files of `time_step`"""
+        pref, suff = dyn_attr.split('_')[0], dyn_attr.split('_')[-1]
+        return f"{pref}_{self.time_step}_{suff}"
+
+    def _cache_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df.rename(columns={self._file_attribute(attr): attr for attr in self.dynamic_attributes})
+
     @property
     def start(self):
         return '19850101'
@@ -200,7 +200,8 @@ import pandas as pd
 
 from AI4Water.utils.spatial_utils import find_records
 from AI4Water.utils.datasets.download_pangaea import PanDataSet
-from AI4Water.utils.datasets.download_zenodo import download_from_zenodo
+from AI4Water.utils.datasets.download_zenodo import download_from_zenodo, zenodo_files
+from AI4Water.utils.datasets.download_manager import DownloadManager
 from AI4Water.utils.datasets.utils import download, download_all_http_directory
 from .utils import check_attributes, sanity_check
 
@@ -246,7 +247,7 @@ class Datasets(object):
         We don't host datasets. Each dataset is downloaded fromt he target remote
         server and saved into local disk.
     """
-    def __init__(self, name=None, units=None):
+    def __init__(self, name=None, units=None, stream=False):
         if name is None:
             name = self.__class__.__name__
 
@@ -255,10 +256,15 @@ class Datasets(object):
 
         self.units = units
         self.name = name
+        self.stream = stream
     """
     Arguments:
         name :
         units :
+        stream : if True, the archives are extracted while they are downloaded
+            instead of being saved and then unzipped. Only the members selected
+            by `_select_member` are extracted and the members which already
+            exist with the same size are skipped.
     """
 
     @property
@@ -297,28 +303,66 @@ Use overwrite=True to remove previously saved files and download again""")
     def _download_and_unzip(self):
         if not os.path.exists(self.ds_dir):
             os.makedirs(self.ds_dir)
-        if isinstance(self.url, str):
+        if getattr(self, 'stream', False):
+            self._download_files(self._remote_files())
+        elif isinstance(self.url, str):
             if 'zenodo' in self.url:
                 download_from_zenodo(self.ds_dir, self.url)
             else:
                 download(self.url, self.ds_dir)
             self._unzip()
         elif isinstance(self.url, list):
+            files = []
             for url in self.url:
                 if 'zenodo' in url:
                     download_from_zenodo(self.ds_dir, url)
                 else:
-                    download(url, self.ds_dir)
-            self._unzip()
+                    files.append(url)
+            self._download_files(files)
         elif isinstance(self.url, dict):
+            files = []
             for fname, url in self.url.items():
                 if 'zenodo' in url:
                     download_from_zenodo(self.ds_dir, url)
                 else:
-                    download(url, os.path.join(self.ds_dir, fname))
-            self._unzip()
+                    files.append((url, fname))
+            self._download_files(files)
+        return
+
+    def _remote_files(self) -> list:
+        """(url, filename, checksum) of all the files of the dataset. The files of
+        zenodo records are listed from their metadata."""
+        if isinstance(self.url, dict):
+            urls = [(url, fname) for fname, url in self.url.items()]
+        else:
+            urls = [(url, None) for url in ([self.url] if isinstance(self.url, str) else self.url)]
+
+        files = []
+        for url, fname in urls:
+            if 'zenodo' in url:
+                files += zenodo_files(url)
+            else:
+                files.append((url, fname, None))
+        return files
+
+    def _download_files(self, files: list, outdir=None):
+        """Downloads the files, given as in `DownloadManager.download`, into `outdir`
+        and unzips them. If `stream` is True, the archives are instead extracted
+        while they are downloaded."""
+        if outdir is None:
+            outdir = self.ds_dir
+        if getattr(self, 'stream', False):
+            DownloadManager(outdir).extract(files, select=self._select_member)
+        else:
+            DownloadManager(outdir).download(files)
+            self._unzip(outdir)
         return
 
+    def _select_member(self, member: str) -> bool:
+        """Whether a member of an archive is extracted when `stream` is True.
+        Subclasses can override it to extract only the files they use."""
+        return True
+
     def _unzip(self, dirname=None):
         """unzip all the zipped files in a directory"""
         if dirname is None:
@@ -346,6 +390,61 @@ Use overwrite=True to remove previously saved files and download again""")
 
         return
 
+    @staticmethod
+    def _read_nc_stations(fname: str,
+                          stations: list,
+                          variables: list,
+                          id_var: str,
+                          index: pd.DatetimeIndex,
+                          st=None,
+                          en=None) -> dict:
+        """
+        Reads the variables of several stations from a netCDF file whose
+        variables are of shape (stations, time). The file is opened only once
+        and for each variable only the rows of requested stations between `st`
+        and `en` are read using hyperslab indexing. The fill values are replaced
+        with nan only in this slice.
+        Arguments:
+            fname : path of netCDF file
+            stations : ids of stations as they are saved in `id_var`
+            variables : names of variables to read
+            id_var : name of variable which contains the ids of stations
+            index : time index of the variables in file
+            st : start of data to be read. If None, then from start of `index`
+            en : end of data to be read. If None, then till end of `index`
+        Returns:
+            a dictionary whose keys are stations and values are dataframes of
+            shape (st:en, variables)
+        """
+        time_slice = index.slice_indexer(st, en)
+        index = index[time_slice]
+
+        nc = netCDF4.Dataset(fname)
+        try:
+            ids = {_id: row for row, _id in enumerate(np.asarray(nc[id_var][:]).tolist())}
+            missing = [stn for stn in stations if stn not in ids]
+            if len(missing) > 0:
+                raise ValueError(f"stations {missing} are not present in {fname}")
+
+            rows, inverse = np.unique([ids[stn] for stn in stations], return_inverse=True)
+            first, last = rows[0], rows[-1] + 1
+
+            data = {}
+            for var in variables:
+                if last - first <= 2 * len(rows):
+                    # rows are close to each other so reading them as one block is cheaper
+                    arr = nc[var][first:last, time_slice][rows - first]
+                else:
+                    arr = nc[var][rows, time_slice]
+                if np.issubdtype(arr.dtype, np.number):
+                    arr = np.ma.filled(np.ma.asarray(arr, dtype=np.float64), np.nan)
+                data[var] = np.asarray(arr)[inverse]
+        finally:
+            nc.close()
+
+        return {stn: pd.DataFrame({var: data[var][idx] for var in variables}, index=index)
+                for idx, stn in enumerate(stations)}
+
     def download_from_pangaea(self, overwrite=False):
 
         if os.path.exists(self.ds_dir):
@@ -663,7 +762,7 @@ class SWECanada(Datasets):
         """
 
         if station_id is None:
-            station_id - self.stations()
+            station_id = self.stations()
         elif isinstance(station_id, str):
             station_id = [station_id]
         elif isinstance(station_id, list):
@@ -674,11 +773,6 @@ class SWECanada(Datasets):
             num_stations = int(len(self.stations()) * station_id)
             station_id = random.sample(self.stations(), num_stations)
 
-        stns = self.stations()
-        stn_id_dict = {k: v for k, v in zip(stns, np.arange(len(stns)))}
-        stn_id_dict_inv = {v: k for k, v in stn_id_dict.items()}
-        stn_ids = [stn_id_dict[i] for i in station_id]
-
         features = check_attributes(features, self.feaures)
         qflags = []
         if q_flags is not None:
@@ -686,13 +780,23 @@ class SWECanada(Datasets):
 
         features_to_fetch = features + qflags
 
-        all_stn_data = {}
-        for stn in stn_ids:
-
-            stn_df = self.fetch_station_attributes(stn, features_to_fetch, st=st, en=en)
-            all_stn_data[stn_id_dict_inv[stn]] = stn_df
-
-        return all_stn_data
+        return self.fetch_stations_attributes(station_id, features_to_fetch, st=st, en=en)
+
+    def fetch_stations_attributes(self,
+                                  stations: list,
+                                  features_to_fetch: list,
+                                  st=None,
+                                  en=None,
+                                  ) -> dict:
+        """fetches attributes of multiple stations by reading the netCDF file
+        only once."""
+        return self._read_nc_stations(os.path.join(self.ds_dir, 'CanSWE-CanEEN_1928-2020_v1.nc'),
+                                      stations,
+                                      features_to_fetch,
+                                      id_var='station_id',
+                                      index=pd.date_range(self.start, self.end, freq='D'),
+                                      st=st,
+                                      en=en)
 
     def fetch_station_attributes(self,
                                  stn,
@@ -701,24 +805,7 @@ class SWECanada(Datasets):
                                  en=None,
                                  ) -> pd.DataFrame:
         """fetches attributes of one station"""
-
-        st, en = self._check_length(st, en)
-
-        nc = netCDF4.Dataset(os.path.join(self.ds_dir, 'CanSWE-CanEEN_1928-2020_v1.nc'))
-
-        stn_df = pd.DataFrame(columns=features_to_fetch)
-
-        for var in nc.variables:
-            if var in features_to_fetch:
-                ma = np.array(nc[var][:])
-                ma[ma == nc[var]._FillValue] = np.nan
-                ta = ma[stn, :]  # target array of on station
-                s = pd.Series(ta, index=pd.date_range(self.start, self.end, freq='D'), name=var)
-                stn_df[var] = s[st:en]
-
-        nc.close()
-
-        return stn_df
+        return self.fetch_stations_attributes([stn], features_to_fetch, st=st, en=en)[stn]
 
 
 class RRLuleaSweden(Datasets):
@@ -0,0 +1,490 @@
+__all__ = ["DownloadManager", "check_hash"]
+
+import io
+import os
+import json
+import time
+import shutil
+import hashlib
+import tarfile
+import zipfile
+import threading
+import urllib.parse as urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+ARCHIVES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tar.xz')
+
+
+def check_hash(filename, checksum):
+    algorithm, value = checksum.split(':')
+    if not os.path.exists(filename):
+        return value, 'invalid'
+    h = hashlib.new(algorithm)
+    with open(filename, 'rb') as f:
+        while True:
+            data = f.read(4096)
+            if not data:
+                break
+            h.update(data)
+    digest = h.hexdigest()
+    return value, digest
+
+
+class DownloadManager(object):
+    """
+    Downloads files into a directory, several files at a time. Each file is
+    first written to `<filename>.part`. If the transfer breaks, the next attempt
+    continues from the end of the `.part` file using an HTTP Range request, if
+    the server supports it, otherwise it starts again. A downloaded file is
+    verified against its checksum, if one is given, and then recorded in a
+    manifest file `download_manifest.json` in the directory. The files recorded
+    in the manifest are not downloaded again.
+
+    Archives can also be extracted while they are downloaded using `extract`,
+    so that the archive is never saved and only the selected members are
+    written to disk.
+
+    Example
+    -------
+    ```python
+    >>>manager = DownloadManager('CAMELS_AUS', n_workers=4)
+    >>>manager.download(["https://download.pangaea.de/dataset/921850/files/03_streamflow.zip",
+    ...                  ("https://zenodo.org/record/4029572/files/a.zip", "a.zip", "md5:...")])
+    ```
+    """
+    MANIFEST = 'download_manifest.json'
+
+    def __init__(self,
+                 outdir: str,
+                 n_workers: int = 4,
+                 chunk_size: int = 2**20,
+                 timeout: float = 15,
+                 retry: int = 3,
+                 pause: float = 0.5,
+                 verbosity: int = 1):
+        """
+        Arguments:
+            outdir : directory where the files are saved.
+            n_workers : number of files to be downloaded in parallel.
+            chunk_size : number of bytes to be written at once.
+            timeout : connection timeout in seconds.
+            retry : number of times a broken transfer is resumed.
+            pause : seconds to wait before resuming a transfer.
+            verbosity : if 0, nothing is printed.
+        """
+        self.outdir = os.path.abspath(outdir)
+        if not os.path.exists(self.outdir):
+            os.makedirs(self.outdir)
+
+        self.n_workers = n_workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retry = retry
+        self.pause = pause
+        self.verbosity = verbosity
+
+        self.failed = {}
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self):
+        return os.path.join(self.outdir, self.MANIFEST)
+
+    @property
+    def manifest(self) -> dict:
+        """completed files as {filename: {'url': url, 'size': size, 'checksum': checksum}}"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as fp:
+                return json.load(fp)
+        return {}
+
+    def download(self, files: list, raise_errors: bool = True) -> dict:
+        """
+        Downloads the files in parallel.
+        Arguments:
+            files : list whose each member is either a url or a tuple of
+                (url, filename) or (url, filename, checksum). The filename is
+                relative to `outdir`. If not given, it is taken from url. The
+                checksum is of the form `algorithm:value` e.g. `md5:9e107d9d...`
+            raise_errors : if True, then an error is raised after all the files
+                have been tried if any of them could not be downloaded.
+                Otherwise the errors are saved in `failed` attribute.
+        Returns:
+            a dictionary whose keys are urls and values are paths of downloaded files.
+        """
+        return self._run(self.download_file, files, raise_errors)
+
+    def extract(self, files: list, select=None, raise_errors: bool = True) -> dict:
+        """
+        Extracts the archives in parallel while they are downloaded.
+        Arguments:
+            files : same as in `download`. The files which are not archives
+                are downloaded as they are.
+            select : a callable which receives the name of a member of an
+                archive and returns True if it is to be extracted. If None,
+                all members are extracted.
+            raise_errors : same as in `download`
+        Returns:
+            a dictionary whose keys are urls and values are lists of paths of
+            extracted members.
+        """
+        return self._run(self.extract_file, files, raise_errors, select=select)
+
+    def _run(self, func, files, raise_errors, **kwargs) -> dict:
+        files = [(f,) if isinstance(f, str) else tuple(f) for f in files]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.n_workers, len(files)))) as executor:
+            futures = {f[0]: executor.submit(func, *f, **kwargs) for f in files}
+
+        paths = {}
+        self.failed = {}
+        for url, future in futures.items():
+            try:
+                paths[url] = future.result()
+            except Exception as e:
+                self.failed[url] = e
+
+        if len(self.failed) > 0 and raise_errors:
+            raise ConnectionError(f"could not download {len(self.failed)} files: {self.failed}")
+
+        return paths
+
+    def download_file(self, url: str, fname: str = None, checksum: str = None) -> str:
+        """Downloads one file and returns its path."""
+        if fname is None:
+            fname = self._fname(url)
+        path = os.path.join(self.outdir, fname)
+        key = os.path.relpath(path, self.outdir)
+
+        if self._is_complete(key, path, checksum):
+            if self.verbosity > 0:
+                print(f"{key} is already downloaded")
+            return path
+
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        part = path + '.part'
+        error = None
+        for attempt in range(self.retry + 1):
+            try:
+                self._transfer(url, part)
+            except (requests.RequestException, IOError) as e:
+                error = e
+                if self.verbosity > 0:
+                    print(f"transfer of {key} broke at {self._size(part)} bytes ({e}), attempt {attempt + 1}")
+                time.sleep(self.pause)
+            else:
+                break
+        else:
+            raise ConnectionError(f"could not download {url} after {self.retry + 1} attempts: {error}")
+
+        if checksum is not None:
+            expected, digest = check_hash(part, checksum)
+            if expected != digest:
+                os.remove(part)  # resuming a corrupt file will not make it correct
+                raise ValueError(f"checksum of {key} is {digest} instead of {expected}")
+
+        os.replace(part, path)
+        self._record(key, url, checksum)
+
+        if self.verbosity > 0:
+            print(f"downloaded {key} ({round(os.path.getsize(path) * 1e-6, 2)} MB)")
+
+        return path
+
+    def extract_file(self,
+                     url: str,
+                     fname: str = None,
+                     checksum: str = None,
+                     select=None,
+                     extract_dir: str = None) -> list:
+        """
+        Extracts a zip or tar archive while it is downloaded. Members which
+        already exist with the same size are not written again, so a broken
+        extraction continues where it stopped when it is retried.
+
+        The members of a zip archive are read from the server with HTTP Range
+        requests, so the members which are not selected are not downloaded
+        at all. If the server does not support Range requests, the archive is
+        downloaded first and deleted after extraction. A tar archive is read
+        as one stream and its checksum, if given, is verified after extraction.
+        The members of zip archives are verified against their CRC by `zipfile`.
+        Arguments:
+            url : url of the archive
+            fname : name of the archive, used to find its type. If not given, it
+                is taken from url.
+            checksum : same as in `download_file`
+            select : same as in `extract`
+            extract_dir : directory relative to `outdir` where the members are
+                extracted. By default, zip archives are extracted into a folder
+                with the name of the archive, and tar archives into `outdir`.
+        Returns:
+            list of paths of the selected members.
+        """
+        if fname is None:
+            fname = self._fname(url)
+        if not fname.endswith(ARCHIVES):
+            return [self.download_file(url, fname, checksum)]
+
+        if extract_dir is None:
+            extract_dir = fname[:-len('.zip')] if fname.endswith('.zip') else ''
+        outdir = os.path.join(self.outdir, extract_dir)
+
+        error = None
+        for attempt in range(self.retry + 1):
+            try:
+                if fname.endswith('.zip'):
+                    paths, written = self._extract_zip(url, fname, outdir, select)
+                else:
+                    paths, written = self._extract_tar(url, fname, outdir, select, checksum)
+            except (requests.RequestException, IOError, EOFError, tarfile.TarError, zipfile.BadZipFile) as e:
+                error = e
+                if self.verbosity > 0:
+                    print(f"extraction of {fname} broke ({e}), attempt {attempt + 1}")
+                time.sleep(self.pause)
+            else:
+                break
+        else:
+            raise ConnectionError(f"could not extract {url} after {self.retry + 1} attempts: {error}")
+
+        if self.verbosity > 0:
+            print(f"extracted {written} members of {fname}, {len(paths) - written} already existed")
+
+        return paths
+
+    def _extract_zip(self, url, fname, outdir, select):
+        headers = {'Range': 'bytes=0-0', 'Accept-Encoding': 'identity'}
+        with requests.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            total = r.headers.get('Content-Range', '').split('/')[-1]
+
+        if r.status_code == 206 and total.isdigit():
+            with zipfile.ZipFile(_RemoteFile(url, int(total), self.timeout, self.chunk_size)) as zf:
+                return self._extract_members(zf, outdir, select)
+
+        # the server can only send the whole file
+        path = self.download_file(url, fname)
+        with zipfile.ZipFile(path) as zf:
+            result = self._extract_members(zf, outdir, select)
+        os.remove(path)
+        return result
+
+    def _extract_tar(self, url, fname, outdir, select, checksum):
+        with requests.get(url, headers={'Accept-Encoding': 'identity'}, stream=True, timeout=self.timeout) as r:
+            r.raise_for_status()
+            src = _HashReader(r.raw, checksum)
+            with tarfile.open(fileobj=src, mode='r|*') as tf:
+                result = self._extract_members(tf, outdir, select)
+            src.read()  # the rest of the stream, so that the checksum covers the whole archive
+
+        if checksum is not None and src.digest != checksum.split(':')[1]:
+            raise ValueError(f"checksum of {fname} is {src.digest} instead of {checksum.split(':')[1]}")
+        return result
+
+    def _extract_members(self, archive, outdir, select):
+        """Extracts the members of an open zip or tar archive in the order they
+        are stored and returns the paths of the selected members and the number
+        of members which were written."""
+        if isinstance(archive, zipfile.ZipFile):
+            members = sorted((m for m in archive.infolist() if not m.is_dir()), key=lambda m: m.header_offset)
+            members = ((m.filename, m.file_size, m) for m in members)
+            open_member = archive.open
+        else:
+            members = ((m.name, m.size, m) for m in archive if m.isfile())
+            open_member = archive.extractfile
+
+        paths, written = [], 0
+        for name, size, member in members:
+            if select is not None and not select(name):
+                continue
+            path = os.path.abspath(os.path.join(outdir, name))
+            if not path.startswith(os.path.abspath(outdir) + os.sep):  # e.g. an absolute path or ../
+                continue
+            paths.append(path)
+            if os.path.exists(path) and os.path.getsize(path) == size:
+                continue
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open_member(member) as src, open(path + '.part', 'wb') as dst:
+                shutil.copyfileobj(src, dst, self.chunk_size)
+            os.replace(path + '.part', path)
+            written += 1
+
+        return paths, written
+
+    def _transfer(self, url, part):
+        pos = self._size(part)
+        headers = {'Range': f'bytes={pos}-'} if pos > 0 else {}
+
+        with requests.get(url, headers=headers, stream=True, timeout=self.timeout) as r:
+            if r.status_code == 416:  # nothing after pos
+                total = r.headers.get('Content-Range', '').split('/')[-1]
+                if total.isdigit() and int(total) == pos:
+                    return
+                os.remove(part)
+                raise IOError(f"{part} is larger than the remote file")
+
+            r.raise_for_status()
+
+            if r.status_code != 206:  # the server ignored the Range header so start again
+                pos = 0
+            expected = r.headers.get('Content-Length')
+            expected = pos + int(expected) if expected is not None else None
+
+            with open(part, 'ab' if pos > 0 else 'wb') as f:
+                for chunk in r.iter_content(chunk_size=self.chunk_size):
+                    f.write(chunk)
+
+        if expected is not None and self._size(part) < expected:
+            raise IOError(f"only {self._size(part)} of {expected} bytes received")
+        return
+
+    def _is_complete(self, key, path, checksum) -> bool:
+        if not os.path.exists(path):
+            return False
+
+        entry = self.manifest.get(key)
+        if entry is not None:
+            return entry['size'] == os.path.getsize(path) and checksum in (None, entry['checksum'])
+
+        # downloaded before the manifest was used
+        if checksum is not None:
+            expected, digest = check_hash(path, checksum)
+            if expected == digest:
+                self._record(key, None, checksum)
+                return True
+        return False
+
+    def _record(self, key, url, checksum):
+        with self._lock:
+            manifest = self.manifest
+            manifest[key] = {'url': url,
+                             'size': os.path.getsize(os.path.join(self.outdir, key)),
+                             'checksum': checksum}
+            tmp = self.manifest_path + '.tmp'
+            with open(tmp, 'w') as fp:
+                json.dump(manifest, fp, indent=4)
+            os.replace(tmp, self.manifest_path)
+        return
+
+    @staticmethod
+    def _size(fname):
+        return os.path.getsize(fname) if os.path.exists(fname) else 0
+
+    @staticmethod
+    def _fname(url):
+        return urlparse.unquote(os.path.basename(urlparse.urlparse(url).path))
+
+
+class _RemoteFile(io.RawIOBase):
+    """Read only, seekable file object over a remote file. Each Range request
+    asks for a window of the file. The window starts at `block` bytes and is
+    doubled, up to 64 blocks, as long as the file is read sequentially, and a
+    seek to another position starts again with one block. So a seek wastes
+    at most one window and sequential reading needs few requests."""
+
+    def __init__(self, url, size, timeout, block=2**20):
+        super().__init__()
+        self.url = url
+        self.size = size
+        self.timeout = timeout
+        self.block = block
+        self._window = block
+        self._pos = 0
+        self._response = None
+        self._response_pos = 0
+        self._response_end = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = offset
+        return self._pos
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            n = self.size - self._pos
+        n = min(n, self.size - self._pos)
+        if n <= 0:
+            return b''
+
+        chunks = []
+        while n > 0:
+            gap = self._pos - self._response_pos
+            if self._response is None or not 0 <= gap <= 2**16 or self._pos >= self._response_end:
+                self._open(n)
+            elif gap > 0:  # e.g. a data descriptor between two members
+                self._read(gap)
+
+            k = min(n, self._response_end - self._pos)
+            chunks.append(self._read(k))
+            self._pos += k
+            n -= k
+        return b''.join(chunks)
+
+    def _read(self, n):
+        chunks = []
+        while n > 0:
+            chunk = self._response.raw.read(n)
+            if not chunk:
+                raise IOError(f"connection to {self.url} closed at {self._response_pos} bytes")
+            chunks.append(chunk)
+            n -= len(chunk)
+            self._response_pos += len(chunk)
+        return b''.join(chunks)
+
+    def _open(self, n):
+        if self._response is not None and self._pos == self._response_end:  # sequential reading
+            self._window = min(2 * self._window, 64 * self.block)
+        else:
+            self._window = self.block
+        self._close_response()
+
+        end = min(self._pos + max(self._window, n), self.size)
+        headers = {'Range': f'bytes={self._pos}-{end - 1}', 'Accept-Encoding': 'identity'}
+        self._response = requests.get(self.url, headers=headers, stream=True, timeout=self.timeout)
+        self._response.raise_for_status()
+        self._response_pos = self._pos
+        self._response_end = end
+
+    def _close_response(self):
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def close(self):
+        self._close_response()
+        super().close()
+
+
+class _HashReader(object):
+    """Wraps a file object and computes the hash of everything read from it."""
+
+    def __init__(self, fileobj, checksum=None):
+        self.fileobj = fileobj
+        self._hash = hashlib.new(checksum.split(':')[0]) if checksum is not None else None
+
+    def read(self, n=-1):
+        data = self.fileobj.read(n) if n is not None and n >= 0 else self.fileobj.read()
+        if self._hash is not None:
+            self._hash.update(data)
+        return data
+
+    @property
+    def digest(self):
+        return self._hash.hexdigest() if self._hash is not None else None
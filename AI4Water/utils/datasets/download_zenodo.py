@@ -5,11 +5,9 @@ import sys
 import os
 import json
 import signal
-import time
-import hashlib
 import requests
 from contextlib import contextmanager
-from AI4Water.utils.datasets.utils import download
+from AI4Water.utils.datasets.download_manager import DownloadManager, check_hash
 
 abort_signal = False
 abort_counter = 0
@@ -47,19 +45,44 @@ def cd(newdir):
         os.chdir(prevdir)
 
 
-def check_hash(filename, checksum):
-    algorithm, value = checksum.split(':')
-    if not os.path.exists(filename):
-        return value, 'invalid'
-    h = hashlib.new(algorithm)
-    with open(filename, 'rb') as f:
-        while True:
-            data = f.read(4096)
-            if not data:
-                break
-            h.update(data)
-    digest = h.hexdigest()
-    return value, digest
+def _zenodo_record(doi, sandbox=False, timeout=15):
+    """returns the record ID and the metadata of a zenodo record"""
+    url = doi
+    if not url.startswith('http'):
+        url = 'https://doi.org/' + url
+    try:
+        r = requests.get(url, timeout=timeout)
+    except requests.exceptions.ConnectTimeout:
+        raise TimeoutError("Connection timeout.")
+    except Exception:
+        raise ConnectionError
+    if not r.ok:
+        raise ValueError(f'DOI {doi} could not be resolved. Try again, or use record ID.')
+
+    recordID = r.url.split('/')[-1]
+
+    if not sandbox:
+        url = 'https://zenodo.org/api/records/'
+    else:
+        url = 'https://sandbox.zenodo.org/api/records/'
+
+    try:
+        r = requests.get(url + recordID, timeout=timeout)
+    except requests.exceptions.ConnectTimeout:
+        raise TimeoutError('Connection timeout during metadata reading.')
+    except Exception:
+        raise ConnectionError('Connection error during metadata reading.')
+
+    if not r.ok:
+        raise Exception('Record could not get accessed.')
+
+    return recordID, json.loads(r.text)
+
+
+def zenodo_files(doi, sandbox=False, timeout=15) -> list:
+    """returns (link, filename, checksum) of all files of a zenodo record"""
+    _, js = _zenodo_record(doi, sandbox, timeout)
+    return [(f['links']['self'], f['key'], f['checksum']) for f in js['files']]
 
 
 def download_from_zenodo(outdir,
@@ -78,122 +101,60 @@ def download_from_zenodo(outdir,
         timeout: int, Connection time-out. Default: 15 [sec].
         pause: float, Seconds to wait before retry attempt, e.g. 0.5
         retry: int, Number of times to Retry on error.
+        n_workers: int, Number of files to download in parallel. Default: 4.
     """
     _wget = kwargs.get('wget', None)
     md5 = kwargs.get('md5', False)
-    keep = kwargs.get('keep', False)
     timeout = kwargs.get('timeout', 15)
     sandbox = kwargs.get('sandbox', False)
     pause = kwargs.get('pause', 0.5)
     retry = kwargs.get('retry', 0)
+    n_workers = kwargs.get('n_workers', 4)
 
     with cd(outdir):
 
-        url = doi
-        if not url.startswith('http'):
-            url = 'https://doi.org/' + url
-        try:
-            r = requests.get(url, timeout=timeout)
-        except requests.exceptions.ConnectTimeout:
-            raise TimeoutError("Connection timeout.")
-        except Exception:
-            raise ConnectionError
-        if not r.ok:
-            raise ValueError(f'DOI {doi} could not be resolved. Try again, or use record ID.')
-
-        recordID = r.url.split('/')[-1]
-
-        if not sandbox:
-            url = 'https://zenodo.org/api/records/'
-        else:
-            url = 'https://sandbox.zenodo.org/api/records/'
-
-        try:
-            r = requests.get(url + recordID, timeout=timeout)
-        except requests.exceptions.ConnectTimeout:
-            raise TimeoutError('Connection timeout during metadata reading.')
-        except Exception:
-            raise ConnectionError('Connection error during metadata reading.')
-
-        if r.ok:
-            js = json.loads(r.text)
-            files = js['files']
-            total_size = sum(f['size'] for f in files)
-
-            if md5 is not None:
-                with open('md5sums.txt', 'wt') as md5file:
-                    for f in files:
-                        fname = f['key']
-                        checksum = f['checksum'].split(':')[-1]
-                        md5file.write(f'{checksum}  {fname}\n')
+        recordID, js = _zenodo_record(doi, sandbox, timeout)
 
-            if _wget is not None:
-                if _wget == '-':
-                    for f in files:
-                        link = f['links']['self']
-                        print(link)
-                else:
-                    with open(_wget, 'wt') as wgetfile:
-                        for f in files:
-                            fname = f['key']
-                            link = 'https://zenodo.org/record/{}/files/{}'.format(
-                                recordID, fname
-                            )
-                            wgetfile.write(link + '\n')
-            else:
-                print('Title: {}'.format(js['metadata']['title']))
-                print('Keywords: ' +
-                       (', '.join(js['metadata'].get('keywords', []))))
-                print('Publication date: ' + js['metadata']['publication_date'])
-                print('DOI: ' + js['metadata']['doi'])
-                print('Total size: {:.1f} MB'.format(total_size / 2 ** 20))
+        files = js['files']
+        total_size = sum(f['size'] for f in files)
 
+        if md5 is not None:
+            with open('md5sums.txt', 'wt') as md5file:
                 for f in files:
-                    if abort_signal:
-                        print('Download aborted with CTRL+C.')
-                        print('Already successfully downloaded files are kept.')
-                        break
-                    link = f['links']['self']
-                    size = f['size'] / 2 ** 20
-                    print()
-                    print(f'Link: {link}   size: {size:.1f} MB')
                     fname = f['key']
-                    checksum = f['checksum']
-
-                    remote_hash, local_hash = check_hash(fname, checksum)
-
-                    if remote_hash == local_hash and cont:
-                        print(f'{fname} is already downloaded correctly.')
-                        continue
-
-                    for _ in range(retry + 1):
-                        try:
-                            filename = download(link)
-                        except Exception:
-                            print('  Download error.')
-                            time.sleep(pause)
-                        else:
-                            break
-                    else:
-                        print('  Too many errors.')
-                        if not error:
-                            raise Exception('Download is aborted. Too  many errors')
-                        print('  Download continues with the next file.')
-                        continue
-
-                    h1, h2 = check_hash(filename, checksum)
-                    if h1 == h2:
-                        print(f'Checksum is correct. ({h1})')
-                    else:
-                        print(f'Checksum is INCORRECT!({h1} got:{h2})')
-                        if not keep:
-                            print('  File is deleted.')
-                            os.remove(filename)
-                        else:
-                            print('  File is NOT deleted!')
-                        if not error:
-                            sys.exit(1)
-                else:
-                    print('All files have been downloaded.')
+                    checksum = f['checksum'].split(':')[-1]
+                    md5file.write(f'{checksum}  {fname}\n')
+
+        if _wget is not None:
+            if _wget == '-':
+                for f in files:
+                    link = f['links']['self']
+                    print(link)
+            else:
+                with open(_wget, 'wt') as wgetfile:
+                    for f in files:
+                        fname = f['key']
+                        link = 'https://zenodo.org/record/{}/files/{}'.format(
+                            recordID, fname
+                        )
+                        wgetfile.write(link + '\n')
         else:
-            raise Exception('Record could not get accessed.')
\ No newline at end of file
+            print('Title: {}'.format(js['metadata']['title']))
+            print('Keywords: ' +
+                   (', '.join(js['metadata'].get('keywords', []))))
+            print('Publication date: ' + js['metadata']['publication_date'])
+            print('DOI: ' + js['metadata']['doi'])
+            print('Total size: {:.1f} MB'.format(total_size / 2 ** 20))
+
+            for f in files:
+                print(f"Link: {f['links']['self']}   size: {f['size'] / 2 ** 20:.1f} MB")
+
+            # the files are downloaded in parallel, broken transfers are resumed and the checksums are verified
+            manager = DownloadManager(os.getcwd(), n_workers=n_workers, timeout=timeout, retry=retry,
+                                      pause=pause)
+            manager.download([(f['links']['self'], f['key'], f['checksum']) for f in files],
+                             raise_errors=not error)
+            if len(manager.failed) > 0:
+                print(f'Download continued after errors in {list(manager.failed.keys())}')
+            else:
+                print('All files have been downloaded.')
@@ -1,11 +1,11 @@
 import os
 import ssl
 import requests
-import tempfile
-import sys, shutil
-import urllib.request as ulib
+import sys
 import urllib.parse as urlparse
 
+from .download_manager import DownloadManager
+
 
 # following files must exist withing data folder for CAMELS-GB data
 DATA_FILES = {
@@ -53,72 +53,41 @@ def download_all_http_directory(url, outpath=None, filetypes=".zip", match_name=
     data = bs4.BeautifulSoup(r.text, "html.parser")
     match_name = filetypes if match_name is None else match_name
 
+    files = []
     for l in data.find_all("a"):
 
         if l["href"].endswith(filetypes) and match_name in l['href']:
-            _outpath = outpath
+            _outpath = l['href']
             if outpath is not None:
                 _outpath = os.path.join(outpath, l['href'])
 
             if os.path.exists(_outpath):
                 print(f"file {l['href']} already exists at {outpath}")
                 continue
-            download(basic_url + l["href"], _outpath)
-            print(r.status_code, l["href"], )
+            files.append((basic_url + l["href"], l['href']))
+
+    DownloadManager(outpath or os.getcwd()).download(files)
 
 
-def download(url, out=None):
-    """High level function, which downloads URL into tmp file in current
-    directory and then renames it to filename autodetected from either URL
-    or HTTP headers.
+def download(url, out=None, checksum=None):
+    """Downloads URL into the file `out` using `DownloadManager`, so a broken
+    download is resumed when this function is called again and a completed
+    download is not repeated.
 
     :param url:
-    :param out: output filename or directory
+    :param out: output filename or directory. If it is an existing directory or
+        None, then the filename is autodetected from URL.
+    :param checksum: if given, the downloaded file is verified against it e.g. 'md5:...'
     :return:    filename where URL is downloaded to
     """
-    # detect of out is a directory
-    if out is not None:
-        outdir = os.path.dirname(out)
-        out_filename = os.path.basename(out)
-        if not os.path.exists(outdir):
-            os.makedirs(outdir)
+    if out is None:
+        outdir, out_filename = os.getcwd(), None
+    elif os.path.isdir(out):
+        outdir, out_filename = out, None
     else:
-        outdir = os.getcwd()
-        out_filename = None
-
-    # get filename for temp file in current directory
-    prefix = filename_from_url(url)
-    (fd, tmpfile) = tempfile.mkstemp(".tmp", prefix=prefix, dir=".")
-    os.close(fd)
-    os.unlink(tmpfile)
-
-    # set progress monitoring callback
-    def callback_charged(blocks, block_size, total_size):
-        # 'closure' to set bar drawing function in callback
-        callback_progress(blocks, block_size, total_size, bar_function=bar)
-
-    callback = callback_charged
-
-    # Python 3 can not quote URL as needed
-    binurl = list(urlparse.urlsplit(url))
-    binurl[2] = urlparse.quote(binurl[2])
-    binurl = urlparse.urlunsplit(binurl)
-
-    (tmpfile, headers) = ulib.urlretrieve(binurl, tmpfile, callback)
-    filename = filename_from_url(url)
-
-    if out_filename:
-        filename = out_filename
-
-    filename = outdir + "/" + filename
-
-    # add numeric ' (x)' suffix if filename already exists
-    if os.path.exists(filename):
-        filename = filename + '1'
-    shutil.move(tmpfile, filename)
+        outdir, out_filename = os.path.dirname(out) or os.getcwd(), os.path.basename(out)
 
-    # print headers
-    return filename
+    return DownloadManager(outdir, n_workers=1).download_file(url, out_filename, checksum)
 
 
 __current_size = 0
@@ -84,10 +84,12 @@ class Imputation(object):
         else:
             _kwargs = self.imputer_args
 
+        # a shallow copy is enough because the imputed columns are assigned as new arrays
+        # and the arrays of original data are never modified in place.
         if data is not None:
-            df = data.copy()
+            df = data.copy(deep=False)
         else:
-            df = self.data.copy()
+            df = self.data.copy(deep=False)
 
         if self.method.lower() in ['fillna', 'interpolate']:
             for col in df.columns:
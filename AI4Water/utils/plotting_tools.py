@@ -14,7 +14,7 @@ try:
 except ModuleNotFoundError:
     trees = None
 
-from AI4Water.backend import xgboost
+from AI4Water import backend
 from AI4Water.utils.utils import find_tot_plots, init_subplots
 from AI4Water.utils.transformations import Transformations
 
@@ -407,10 +407,10 @@ class Plots(object):
             if hasattr(self._model, "tree_"):
                 tree.plot_tree(self._model, **kwargs)
         else:  # xgboost
-            if xgboost is None:
+            if backend.xgboost is None:
                 warnings.warn("install xgboost to use plot_tree method")
             else:
-                xgboost.plot_tree(self._model, **kwargs)
+                backend.xgboost.plot_tree(self._model, **kwargs)
         self.save_or_show(save, fname="decision_tree", where="results")
         return
 
@@ -0,0 +1,125 @@
+__all__ = ["StreamingForecaster"]
+
+import numpy as np
+import pandas as pd
+
+
+class StreamingForecaster(object):
+    """
+    Makes forecasts from a trained `Model` as new observations arrive. Instead of
+    preparing all the windows again from the data, the scaled inputs of last
+    `window_rows` observations are kept in a ring buffer, so that each new row
+    produces its window, as would have been made by `prepare_data`, without
+    copying the previous rows.
+
+    The ring buffer is twice as long as a window and each row is written at two
+    positions, therefore the last `window_rows` rows always lie contiguously in
+    the buffer and the window is a strided view with step of `input_step`.
+
+    Example
+    -------
+    ```python
+    >>>from AI4Water import Model
+    >>>model = Model.load('model.joblib')
+    >>>forecaster = StreamingForecaster(model)
+    >>>forecaster.fill(df.iloc[-forecaster.window_rows:])  # the recent history
+    >>>predictions = forecaster.update(new_rows)  # shape (len(new_rows), outs, forecast_len)
+    ```
+    """
+    def __init__(self, model, scaler_key: str = '0'):
+        """
+        Arguments:
+            model : a trained `Model` with one input layer
+            scaler_key str: key of the stored scalers with which the inputs are scaled,
+                same as in `Model.predict_batch`.
+        """
+        if isinstance(model.in_cols, dict) or model.num_input_layers not in (1, np.inf):
+            raise NotImplementedError("streaming is supported only for models with one input layer")
+        if model.config['input_nans'] is not None:
+            raise NotImplementedError("imputation of missing inputs is not supported while streaming")
+
+        self.model = model
+        self.scaler_key = scaler_key
+        self.ins = model.ins
+        self.outs = model.outs
+        self.input_step = model.config['input_step']
+        self.window_rows = model.window_rows
+        # for 2d inputs, only the last row of window is fed to the model
+        self.windowed = model.category.upper() == "DL" and len(model.first_layer_shape()) > 2
+
+        self.reset()
+
+    def reset(self):
+        """forgets all the observations"""
+        self.buffer = np.full((2 * self.window_rows, self.ins), np.nan, dtype=np.float32)
+        self.pos = 0
+        self.rows_seen = 0
+        return
+
+    def scale(self, rows) -> np.ndarray:
+        """scales the raw observations of inputs with the stored scalers of model"""
+        if isinstance(rows, pd.Series):
+            rows = rows.to_frame().T
+        if isinstance(rows, pd.DataFrame):
+            rows = rows[self.model.in_cols].values
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+
+        arr = np.full((len(rows), self.ins + self.outs), np.nan)
+        arr[:, :self.ins] = rows[:, :self.ins]
+        if self.model.config['transformation']:
+            arr = self.model.apply_scalers(arr, self.scaler_key)
+        return arr[:, :self.ins].astype(np.float32)
+
+    def push(self, row: np.ndarray):
+        """puts a scaled row in the ring buffer and returns the window which ends at it,
+        or None if enough rows have not been seen yet."""
+        self.buffer[self.pos] = row
+        self.buffer[self.pos + self.window_rows] = row
+        self.pos = (self.pos + 1) % self.window_rows
+        self.rows_seen += 1
+
+        if self.rows_seen < self.window_rows:
+            return None
+        return self.buffer[self.pos:self.pos + self.window_rows:self.input_step]
+
+    def fill(self, rows):
+        """puts the observations in the buffer without making predictions e.g. to warm up the
+        forecaster with recent history."""
+        for row in self.scale(rows)[-self.window_rows:]:
+            self.push(row)
+        return
+
+    def update(self, new_rows) -> np.ndarray:
+        """
+        Adds new observations and makes a prediction from each window which ends at them.
+        Arguments:
+            new_rows pd.DataFrame/pd.Series/np.ndarray: raw observations of inputs. If
+                `known_future_inputs` is True, the inputs of each row are those which are
+                known at the end of the window.
+        Returns:
+            array of shape (windows, outs, forecast_len) in original units of outputs.
+            The windows are as many as the new rows, once `window_rows` rows have been seen.
+        """
+        windows = []
+        for row in self.scale(new_rows):
+            window = self.push(row)
+            if window is not None:
+                windows.append(window.copy())  # the buffer is overwritten by next rows
+
+        if not windows:
+            return np.empty((0, self.outs, self.model.forecast_len), dtype=np.float32)
+
+        x = np.stack(windows)
+        if self.windowed:
+            x = self.model.conform_shape(x, datetime_index=False)
+        else:
+            x = x[:, -1]
+        return self.model.predict_scaled(x, scaler_key=self.scaler_key)
+
+    def target_row(self, row: int) -> int:
+        """position in the stream of the first target of the window which ends at `row`.
+        The positions start from 0 at the first observation given after `reset`."""
+        first_row = row - self.window_rows + 1
+        return first_row + (self.model.lookback - 1) * self.input_step + self.model.forecast_step
@@ -160,6 +160,7 @@ class Transformations(scaler_container):
                  replace_with: Union[str, int, float] = 'mean',
                  replace_zeros: bool = False,
                  replace_zeros_with: Union[str, int, float] = 'mean',
+                 copy: bool = True,
                  **kwargs
                  ):
         """
@@ -187,6 +188,10 @@ class Transformations(scaler_container):
                 'mean', 'max', 'man'.
             replace_zeros : same as replace_nans but for zeros in the data.
             replace_zeros_with : same as `replace_with` for for zeros in the data.
+            copy : The data is modified in place only when `replace_nans` or
+                `replace_zeros` is True and only then it is copied. If False, it is
+                not copied even then, which saves memory when the caller does not
+                need the data afterwards.
             kwargs : any arguments which are to be provided to transformer on
                 INTIALIZATION and not during transform or inverse transform e.g.
                 `n_components` for pca.
@@ -198,7 +203,9 @@ class Transformations(scaler_container):
         self.replace_with=replace_with
         self.replace_zeros=replace_zeros
         self.replace_zeros_with=replace_zeros_with
-        data = self.pre_process_data(data.copy())
+        if copy and (replace_nans or replace_zeros):
+            data = data.copy()
+        data = self.pre_process_data(data)
         self.data = data
 
         self.features = features
@@ -391,10 +398,10 @@ class Transformations(scaler_container):
             if self.method == "log":
                 scaler = FunctionTransformer(func=np.log, inverse_func=np.exp, validate=True, check_inverse=True)
             elif self.method == "log2":
-                scaler = FunctionTransformer(func=np.log2, inverse_func=lambda x:2**x, validate=True,
+                scaler = FunctionTransformer(func=np.log2, inverse_func=np.exp2, validate=True,
                                              check_inverse=True)
             else:   # "log10":
-                scaler = FunctionTransformer(func=np.log10, inverse_func=lambda x:10**x, validate=True,
+                scaler = FunctionTransformer(func=np.log10, inverse_func=exp10, validate=True,
                                              check_inverse=True)
         elif self.method.lower() == "tan":
             scaler = FunctionTransformer(func=np.tan, inverse_func=np.tanh, validate=True, check_inverse=False)
@@ -575,6 +582,11 @@ class Transformations(scaler_container):
         return
 
 
+def exp10(x):
+    # not a lambda so that the fitted scalers can be pickled
+    return np.power(10, x)
+
+
 def get_val(df:pd.DataFrame, method):
 
     if isinstance(method, str):
@@ -252,8 +252,12 @@ def _make_model(data, **kwargs):
         'steps_per_epoch':   {"type": int,   "default": None, 'lower': None, 'upper': None, 'between': None},
         # fraction of data to be used for test
         'test_fraction':     {"type": float, "default": 0.2, 'lower': None, 'upper': None, 'between': None},
-        # write the data/batches as hdf5 file
-        'cache_data':        {"type": bool,  "default": False, 'lower': None, 'upper': None, 'between': None},
+        # cache the prepared examples in memory and as hdf5 files, so that they are not prepared again for same data
+        # and config. If a string, it is the directory where the hdf5 files are written.
+        'cache_data':        {"type": [bool, str],  "default": False, 'lower': None, 'upper': None, 'between': None},
+        # if True, the examples/windows for training of deep learning models are cut from 2d data on demand one batch
+        # at a time instead of preparing the whole 3d array (examples, lookback, ins) in memory.
+        'lazy_batches':      {"type": bool,  "default": False, 'lower': None, 'upper': None, 'between': None},
 
         'allow_nan_labels':       {"type": int,  "default": 0, 'lower': 0, 'upper': 2, 'between': None},
 
@@ -446,6 +450,8 @@ def find_best_weight(w_path:str, best:str="min", ext:str=".hdf5"):
     all_weights = os.listdir(w_path)
     losses = {}
     for w in all_weights:
+        if not w.startswith('weights_') or not w.endswith(ext):  # e.g. saved ml models
+            continue
         wname = w.split(ext)[0]
         val_loss = str(float(wname.split('_')[2]))  # converting to float so that trailing 0 is removed
         losses[val_loss] = {'loss': wname.split('_')[2], 'epoch': wname.split('_')[1]}
@@ -706,6 +712,142 @@ def _missing_vals(data: pd.DataFrame) -> Dict[str, Any]:
     }
 
 
+def _strided_windows(arr: np.ndarray, num_windows: int, window_len: int, step: int = 1) -> np.ndarray:
+    """
+    Returns a read-only view of shape (num_windows, window_len, arr.shape[1])
+    into the 2d array `arr`. The i'th window consists of rows
+    i, i+step, ..., i+(window_len-1)*step of `arr`. No data is copied.
+    """
+    row_stride, col_stride = arr.strides
+    return np.lib.stride_tricks.as_strided(arr,
+                                           shape=(num_windows, window_len, arr.shape[1]),
+                                           strides=(row_stride, step * row_stride, col_stride),
+                                           writeable=False)
+
+
+def num_windows(examples: int,
+                lookback_steps: int,
+                input_steps: int = 1,
+                forecast_step: int = 0,
+                forecast_len: int = 1,
+                known_future_inputs: bool = False) -> int:
+    """Number of examples which `prepare_data` generates from `examples` rows of data."""
+    if known_future_inputs:
+        lookback_steps = lookback_steps + forecast_len
+    return examples - lookback_steps * input_steps + 1 - forecast_step - forecast_len + 1
+
+
+def make_windows(
+        data: np.ndarray,
+        lookback_steps: int,
+        num_outputs: int,
+        input_steps: int = 1,
+        forecast_step: int = 0,
+        forecast_len: int = 1,
+        known_future_inputs: bool = False,
+        copy: bool = False
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized windowing engine behind `prepare_data`. Instead of looping over
+    examples, the windows are built as strided views into `data` so that
+    creating `x`, `prev_y` and `y` costs O(1) irrespective of the number of
+    examples.
+
+    Arguments:
+        data np.ndarray: 2d array of shape (examples, features) where last
+            `num_outputs` columns are outputs.
+        lookback_steps int, num_outputs int, input_steps int, forecast_step int,
+        forecast_len int, known_future_inputs bool :
+            same as in `prepare_data`
+        copy bool: If False (default), `x` is returned as read-only view into
+            `data`. `prev_y` and `y` are views as well if `data` is already of
+            float32 dtype, otherwise they are converted to float32 which involves
+            a single copy. If True, each of returned array is one contiguous
+            array (materialized with one copy), identical to the output of the
+            loop based implementation.
+
+    Returns:
+        x np.ndarray: of shape (examples, lookback_steps, ins) and same dtype as data
+        prev_y np.ndarray: of shape (examples, lookback_steps-1, outs) and dtype float32
+        y np.ndarray: of shape (examples, outs, forecast_len) and dtype float32
+    """
+    assert data.ndim == 2, f"data must be 2 dimensional but it has shape {data.shape}"
+    features = data.shape[1]
+    num_inputs = features - num_outputs
+
+    time_steps = lookback_steps
+    if known_future_inputs:
+        lookback_steps = lookback_steps + forecast_len
+        assert forecast_len>1, f"""
+            known_futre_inputs should be True only when making predictions at multiple 
+            horizons i.e. when forecast length/number of horizons to predict is > 1.
+            known_future_inputs: {known_future_inputs}
+            forecast_len: {forecast_len}"""
+
+    examples = num_windows(len(data), time_steps, input_steps, forecast_step, forecast_len, known_future_inputs)
+    if examples < 1:
+        raise ValueError(f"""
+Can not create any example from data with shape {data.shape} with lookback_steps {time_steps},
+input_steps {input_steps}, forecast_step {forecast_step} and forecast_len {forecast_len}""")
+
+    x = _strided_windows(data[:, 0:num_inputs], examples, lookback_steps, input_steps)
+
+    prev_y = _strided_windows(data[:, num_inputs:], examples, lookback_steps - 1, input_steps)
+
+    # first target corresponding to first example
+    target_st = time_steps * input_steps + forecast_step - input_steps
+    y = _strided_windows(data[target_st:, num_inputs:], examples, forecast_len)
+    # transpose because we want labels to be of shape (examples, outs, forecast_length)
+    y = y.transpose(0, 2, 1)
+
+    if copy:
+        x = np.array(x, order='C')
+        prev_y = np.array(prev_y, dtype=np.float32, order='C')
+        y = np.array(y, dtype=np.float32, order='C')
+    else:
+        prev_y = prev_y.astype(np.float32, copy=False)
+        y = y.astype(np.float32, copy=False)
+
+    return x, prev_y, y
+
+
+def label_mask(labels: np.ndarray,
+               allow_nan_labels: int = 0,
+               missing: Union[int, float] = np.nan) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the examples which are to be kept/removed because of missing labels.
+
+    Arguments:
+        labels np.ndarray: array whose first dimension is examples, for example
+            of shape (examples, outs, forecast_len) or (examples, outs).
+        allow_nan_labels int: same as in `Model`. If 0, the examples with any
+            missing label are removed. If 1, only the examples whose all labels
+            are missing are removed. If 2, no example is removed.
+        missing int/np.nan: the value which marks a label as missing.
+
+    Returns:
+        keep np.ndarray: boolean array of length `examples`, True for examples to keep.
+        dropped np.ndarray: indices of removed examples. The number of removed
+            examples is len(dropped).
+    """
+    labels = np.asarray(labels)
+    if allow_nan_labels == 2:
+        keep = np.ones(len(labels), dtype=bool)
+    else:
+        if isinstance(missing, float) and np.isnan(missing):
+            missing = np.isnan(labels)
+        else:
+            missing = labels == missing
+        missing = missing.reshape(len(labels), -1)
+
+        if allow_nan_labels == 1:
+            keep = ~missing.all(axis=1)
+        else:
+            keep = ~missing.any(axis=1)
+
+    return keep, np.where(~keep)[0]
+
+
 def prepare_data(
         data: np.ndarray,
         lookback_steps:int,
@@ -716,7 +858,8 @@ def prepare_data(
         forecast_len:int=1,
         known_future_inputs:bool=False,
         output_steps=1,
-        mask:Union[int, float, np.ndarray]=None
+        mask:Union[int, float, np.ndarray]=None,
+        copy:bool=True
 )-> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
     converts a numpy nd array into a supervised machine learning problem.
@@ -758,6 +901,11 @@ def prepare_data(
             and forecast_step. Thus it is better to provide an integer indicating
             which values in outputs are to be considered as invalid. Default is
             None, which indicates all the generated examples will be returned.
+        copy bool :
+            If True (default), the returned arrays are contiguous copies which
+            can be modified. If False, read-only strided views into `data` are
+            returned wherever possible so that no memory is allocated for the
+            windows. See `make_windows` for details.
 
     Returns:
       x np.ndarray: numpy array of shape (examples, lookback, ins) consisting of input examples
@@ -912,54 +1060,24 @@ num_inputs {num_inputs} + num_outputs {num_outputs} != total features {features}
     if len(data) <= 1:
         raise ValueError(f"Can not create batches from data with shape {data.shape}")
 
-    time_steps = lookback_steps
-    if known_future_inputs:
-        lookback_steps = lookback_steps + forecast_len
-        assert forecast_len>1, f"""
-            known_futre_inputs should be True only when making predictions at multiple 
-            horizons i.e. when forecast length/number of horizons to predict is > 1.
-            known_future_inputs: {known_future_inputs}
-            forecast_len: {forecast_len}"""
-
-    examples = len(data)
-
-    x = []
-    prev_y = []
-    y = []
-
-    for i in range(examples - lookback_steps * input_steps + 1 - forecast_step - forecast_len + 1):
-        stx, enx = i, i + lookback_steps * input_steps
-        x_example = data[stx:enx:input_steps, 0:features - num_outputs]
-
-        st, en = i, i + (lookback_steps - 1) * input_steps
-        y_data = data[st:en:input_steps, features - num_outputs:]
-
-        sty = (i + time_steps * input_steps) + forecast_step - input_steps
-        eny = sty + forecast_len
-        target = data[sty:eny, features - num_outputs:]
-
-        x.append(np.array(x_example))
-        prev_y.append(np.array(y_data))
-        y.append(np.array(target))
-
-    x = np.stack(x)
-    prev_y = np.array([np.array(i, dtype=np.float32) for i in prev_y], dtype=np.float32)
-    # transpose because we want labels to be of shape (examples, outs, forecast_length)
-    y = np.array([np.array(i, dtype=np.float32).T for i in y], dtype=np.float32)
+    x, prev_y, y = make_windows(data,
+                                lookback_steps=lookback_steps,
+                                num_outputs=num_outputs,
+                                input_steps=input_steps,
+                                forecast_step=forecast_step,
+                                forecast_len=forecast_len,
+                                known_future_inputs=known_future_inputs,
+                                copy=copy)
 
 
     if mask is not None:
         if isinstance(mask, np.ndarray):
             assert mask.ndim == 1
             assert len(x) == len(mask), f"Number of generated examples are {len(x)} but the length of mask is {len(mask)}"
-        elif isinstance(mask, float) and np.isnan(mask):
-            mask = np.invert(np.isnan(y))
-            mask = np.array([all(i.reshape(-1,)) for i in mask])
         else:
-            assert isinstance(mask, int), f"""
+            assert isinstance(mask, (int, float)), f"""
                     Invalid mask identifier given of type: {mask.__class__.__name__}"""
-            mask = y!=mask
-            mask = np.array([all(i.reshape(-1,)) for i in mask])
+            mask, _ = label_mask(y, missing=mask)
 
         x = x[mask]
         prev_y = prev_y[mask]
@@ -10,7 +10,7 @@ import tensorflow as tf
 import matplotlib as mpl
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
-from AI4Water.backend import xgboost
+from AI4Water import backend
 
 from AI4Water.utils.SeqMetrics import RegressionMetrics
 from AI4Water.utils.utils import _missing_vals
@@ -154,10 +154,10 @@ class Interpret(Plot):
         plt.figure()
         plt.title("Feature importance")
         if use_xgb:
-            if xgboost is None:
+            if backend.xgboost is None:
                 warnings.warn("install xgboost to plot plot_importance using xgboost", UserWarning)
             else:
-                xgboost.plot_importance(self._model, **kwargs)
+                backend.xgboost.plot_importance(self._model, **kwargs)
         else:
             plt.bar(range(self.model.ins if use_prev else self.model.ins + self.model.outs), importance, **kwargs)
             plt.xticks(ticks=range(len(all_cols)), labels=list(all_cols), rotation=90, fontsize=12)
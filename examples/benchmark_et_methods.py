@@ -0,0 +1,75 @@
+# this file measures, for every etp method in ETUtil, the time taken by the first call, when the intermediate
+# quantities such as extraterrestrial radiation and net radiation are calculated, and by the repeated calls,
+# when they are taken from the cache. It also shows that the input dataframe does not grow during the
+# calculation and the memory occupied by the cached intermediate quantities.
+import io
+import time
+import contextlib
+
+import numpy as np
+import pandas as pd
+
+from AI4Water import ETUtil
+from AI4Water.ETUtil import ETBase, ETEnsemble
+
+days = 3650
+index = pd.date_range('20000101', periods=days, freq='D')
+tmin = 5 + 10 * np.sin(np.arange(days) / 58) + np.random.random(days)
+df = pd.DataFrame({'tmin': tmin,
+                   'tmax': tmin + 5 + 5 * np.random.random(days),
+                   'rh_min': 30 + 20 * np.random.random(days),
+                   'rh_max': 60 + 30 * np.random.random(days),
+                   'sol_rad': 5 + 20 * np.random.random(days),
+                   'wind_speed': 0.5 + 3 * np.random.random(days)}, index=index)
+
+units = {'tmin': 'Centigrade', 'tmax': 'Centigrade', 'rh_min': 'percent', 'rh_max': 'percent',
+         'sol_rad': 'MegaJourPerMeterSquare', 'wind_speed': 'MeterPerSecond'}
+
+constants = {'lat_dec_deg': 35.5, 'altitude': 249, 'long_dec_deg': 127.0, 'albedo': 0.23, 'a_s': 0.23, 'b_s': 0.5,
+             'abtew_k': 0.52, 'ct': 0.025, 'tx': 3, 'cts': 0.0055, 'pen_ap': 2.4, 'pan_ap': 2.4, 'turc_k': 0.013,
+             'wind_f': 'pen48', 'pan_coeff': 0.71, 'pan_over_est': False, 'pan_est': 'pot_et', 'CH': 0.12,
+             'Ca': 0.001013, 'surf_res': 70, 'alphaPT': 1.28, 'alpha_pt': 1.26, 'alphaA': 0.14, 'Roua': 1.2,
+             'f_camargo': 0.01, 'cts_jh': 0.014, 'ctx_jh': -0.37, 'ritchie_alpha': 1.0, 'valiantzas_alpha': 0.23,
+             'e0': 0.81917, 'e1': -0.0040922, 'e2': 1.0705, 'e3': 0.065649, 'e4': -0.0059684}
+
+methods = [name for name, obj in vars(ETUtil).items() if isinstance(obj, type) and issubclass(obj, ETBase)]
+
+repeats = 5
+supported = []
+print(f"{'method':<20} {'first call (ms)':>16} {'repeated call (ms)':>19} {'new input columns':>18} {'cache (KB)':>11}")
+for method in methods:
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            start = time.time()
+            model = getattr(ETUtil, method)(df, units=units, constants=constants.copy(), verbosity=0)
+            columns = len(model.input.columns)
+            model()
+            first = time.time() - start
+
+            start = time.time()
+            for _ in range(repeats):
+                model()
+            repeated = (time.time() - start) / repeats
+        except Exception as e:  # some methods need inputs or constants which are not given here
+            model = e
+
+    if isinstance(model, Exception):
+        print(f"{method:<20} skipped: {type(model).__name__}")
+        continue
+    supported.append(method)
+    print(f"{method:<20} {first * 1e3:>16.2f} {repeated * 1e3:>19.2f} {len(model.input.columns) - columns:>18} "
+          f"{model.cache.nbytes / 1024:>11.1f}")
+
+with contextlib.redirect_stdout(io.StringIO()):
+    start = time.time()
+    for method in supported:
+        getattr(ETUtil, method)(df, units=units, constants=constants.copy(), verbosity=0)()
+    individually = time.time() - start
+
+    start = time.time()
+    ensemble = ETEnsemble(df, units, constants.copy(), verbosity=0)
+    ensemble(supported)
+    together = time.time() - start
+
+print(f"{len(supported)} methods: individually {individually:.3f} s, in ensemble {together:.3f} s "
+      f"({ensemble.cache.hits} cache hits, {ensemble.cache.misses} misses)")
@@ -0,0 +1,45 @@
+# this file measures the peak memory allocated while preparing the training data with and without copying the
+# data at every stage of `fetch_data`. `copy=True` reproduces the previous behaviour in which the whole data was
+# copied at the start of `fetch_data` and again inside `Transformations`.
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from AI4Water import Model
+from AI4Water.utils.transformations import Transformations
+
+
+def peak_memory(func, *args, **kwargs):
+    """returns peak memory in MB allocated while calling the func"""
+    tracemalloc.start()
+    func(*args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024**2
+
+
+examples = 500_000
+in_cols = ['input_' + str(i) for i in range(10)]
+out_cols = ['output']
+df = pd.DataFrame(np.random.random((examples, len(in_cols) + 1)), columns=in_cols + out_cols)
+print(f"size of data is {df.memory_usage().sum() / 1024**2:.1f} MB")
+
+print("Transformations with replace_nans")
+for copy in [True, False]:
+    data = df.copy()
+    peak = peak_memory(lambda: Transformations(data, method='minmax', replace_nans=True, copy=copy)())
+    print(f"copy={copy}: {peak:.1f} MB")
+
+model = Model(data=df,
+              inputs=in_cols,
+              outputs=out_cols,
+              lookback=1,
+              model={'layers': {'Dense': {'units': 1}}},
+              transformation='minmax',
+              verbosity=0)
+
+print("fetch_data")
+for copy in [True, False]:
+    peak = peak_memory(model.fetch_data, model.data, in_cols, out_cols, transformation='minmax', copy=copy)
+    print(f"copy={copy}: {peak:.1f} MB")
@@ -0,0 +1,45 @@
+# this file compares the time taken by an epoch of training with sparse labels, when the masked `train_step`
+# and `test_step` are run eagerly, as was done previously, with the time taken when keras runs them in graph
+# mode and when their forward and backward pass is compiled with XLA. On CPU, XLA can be much slower for
+# recurrent layers, so the last comparison is meaningful mainly on GPU.
+import time
+from functools import partial
+from types import MethodType
+
+import numpy as np
+import tensorflow as tf
+
+from AI4Water.models.custom_training import train_step, test_step, fit_batch, jit_compiled
+
+examples, lookback, ins, outs = 20_000, 15, 8, 3
+
+x = np.random.random((examples, lookback, ins)).astype(np.float32)
+y = np.random.random((examples, outs)).astype(np.float32)
+y[np.random.random(y.shape) < 0.7] = np.nan  # 70% of labels are missing as in water quality data
+mask = (~np.isnan(y)).astype(np.float32)
+y = np.nan_to_num(y)
+
+
+def build(run_eagerly=False, xla=False):
+    inp = tf.keras.layers.Input(shape=(lookback, ins))
+    lstm = tf.keras.layers.LSTM(32)(inp)
+    out = tf.keras.layers.Dense(outs)(lstm)
+    model = tf.keras.Model(inputs=inp, outputs=out)
+    model.compile(loss='mse', optimizer='adam', metrics=['mae'], run_eagerly=run_eagerly)
+    # only the forward and backward pass is compiled with XLA because the metrics are calculated on
+    # valid labels whose number varies from batch to batch. Moreover `jit_compile` of `compile` requires tf>=2.8
+    step = partial(train_step, fit_batch_fn=jit_compiled(fit_batch)) if xla else train_step
+    model.train_step = MethodType(step, model)
+    model.test_step = MethodType(test_step, model)
+    return model
+
+
+for name, build_args in [('eager', {'run_eagerly': True}),
+                         ('graph', {}),
+                         ('xla', {'xla': True})]:
+    model = build(**build_args)
+    model.fit(x[:64], y[:64], sample_weight=mask[:64], batch_size=32, verbose=0)  # tracing
+
+    start = time.time()
+    model.fit(x, y, sample_weight=mask, batch_size=32, epochs=1, verbose=0)
+    print(f"{name:>5}: {time.time() - start:.2f} s per epoch")
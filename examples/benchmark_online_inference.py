@@ -0,0 +1,39 @@
+# this file compares the time taken to predict from the newest window of observations by `predict`, which
+# prepares all the data, writes and plots the results, with the time taken by `predict_on_window` which scales
+# and windows only the newest observations.
+import time
+
+import numpy as np
+import pandas as pd
+
+from AI4Water import Model
+
+examples, lookback = 5000, 15
+inputs = ['in' + str(i) for i in range(8)]
+outputs = ['out']
+
+df = pd.DataFrame(np.random.random((examples, len(inputs) + 1)), columns=inputs + outputs,
+                  index=pd.date_range('20110101', periods=examples, freq='H'))
+
+model = Model(data=df,
+              inputs=inputs,
+              outputs=outputs,
+              lookback=lookback,
+              model={'layers': {'LSTM': 32, 'Dense': 1, "Reshape": {"target_shape": (1, 1)}}},
+              transformation='minmax',
+              epochs=1,
+              verbosity=0)
+model.fit()
+
+start = time.time()
+model.predict(scaler_key='0')
+print(f"predict: {time.time() - start:.3f} s")
+
+recent = df[inputs].values[-model.window_rows:]
+model.predict_on_window(recent)  # the prediction function is compiled in first call
+
+calls = 100
+start = time.time()
+for _ in range(calls):
+    model.predict_on_window(recent)
+print(f"predict_on_window: {(time.time() - start) / calls * 1000:.2f} ms per call")
@@ -0,0 +1,32 @@
+# this file compares the time taken by `RegressionMetrics.calculate_all` when the statistics shared by
+# the metrics e.g. errors, means, standard deviations and sorted arrays are calculated only once, with the
+# time taken when they are recalculated for every metric, as was done previously.
+import time
+
+import numpy as np
+
+from AI4Water.utils.SeqMetrics import RegressionMetrics
+
+
+def unfused(errors):
+    """calculates all the metrics while discarding the shared statistics before every metric"""
+    for m in errors.all_methods:
+        if m not in ["brier_score"]:
+            errors._stats.clear()
+            getattr(errors, m)()
+    return
+
+
+for examples in [1_000, 10_000, 100_000]:
+    t = np.random.random(examples)
+    p = np.random.random(examples)
+
+    start = time.time()
+    unfused(RegressionMetrics(t, p))
+    unfused_time = time.time() - start
+
+    start = time.time()
+    RegressionMetrics(t, p).calculate_all()
+    fused_time = time.time() - start
+
+    print(f"{examples:>7} examples: unfused {unfused_time:.3f} s, fused {fused_time:.3f} s")
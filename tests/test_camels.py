@@ -0,0 +1,379 @@
+import os
+import shutil
+import tempfile
+import unittest
+import site   # so that AI4Water directory is in path
+site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
+
+try:
+    import netCDF4
+except ModuleNotFoundError:
+    netCDF4 = None
+
+import numpy as np
+import pandas as pd
+
+from AI4Water.utils.datasets import HYSETS, SWECanada
+from AI4Water.utils.datasets.camels import Camels
+from AI4Water.utils.datasets.utils import check_attributes
+
+
+ATTRIBUTES = ['prcp', 'tmax', 'q']
+
+# each station has data of a different period and its files have columns in a different order
+PERIODS = {'01': ('20000101', '20000131'), '02': ('20000115', '20000301'), '10': ('20001201', '20001231')}
+COLUMNS = {'01': ['prcp', 'tmax', 'q'], '02': ['q', 'prcp', 'tmax'], '10': ['tmax', 'q', 'prcp']}
+
+
+# static attributes are in a different order of stations than `PERIODS`
+STATIC = pd.DataFrame({'area': [10.5, 1.5, 2.5], 'elev': [100.0, 10.0, 20.0], 'name': ['ten', 'one', 'two']},
+                      index=['10', '01', '02'])
+
+
+def dynamic_frame(station) -> pd.DataFrame:
+    index = pd.date_range(*PERIODS[station], freq='D')
+    df = pd.DataFrame({attr: int(station) * 1000 + pos * 100 + np.arange(len(index), dtype=float)
+                       for pos, attr in enumerate(ATTRIBUTES)}, index=index)
+    df.iloc[3, 0] = np.nan
+    return df[COLUMNS[station]]
+
+
+class Synthetic(Camels):
+    """A dataset whose files are made up by `dynamic_frame`"""
+    dynamic_attributes = ATTRIBUTES
+
+    def __init__(self, path, **kwargs):
+        self.ds_dir = path
+        super().__init__(**kwargs)
+
+    def stations(self):
+        return list(PERIODS.keys())
+
+    @property
+    def start(self):
+        return '20000101'
+
+    @property
+    def end(self):
+        return '20001231'
+
+    def fetch_dynamic_attributes(self, station, dynamic_attributes='all', st=None, en=None, **kwargs):
+        attributes = check_attributes(dynamic_attributes, self.dynamic_attributes)
+        if station not in PERIODS:
+            raise FileNotFoundError(f"no file for station {station}")
+        df = dynamic_frame(station)
+        return df[[col for col in df.columns if col in attributes]][st:en]
+
+    def _read_static_table(self) -> pd.DataFrame:
+        return STATIC.copy()
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.ds = Synthetic(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_write_cache(self):
+        # the later stations have dates which the first one does not have
+        self.ds.write_cache(stations=['10', '01', '02'], batch_size=1)
+
+        cached = self.ds._fetch_from_cache(self.ds.stations())
+        for stn in self.ds.stations():
+            expected = dynamic_frame(stn)[ATTRIBUTES]
+            stn_df = cached[stn]
+            self.assertEqual(list(stn_df.columns), ATTRIBUTES)
+            self.assertTrue(stn_df.index.is_monotonic_increasing)
+            pd.testing.assert_frame_equal(stn_df.loc[expected.index], expected, check_freq=False)
+            self.assertTrue(stn_df.drop(expected.index).isna().all().all())
+
+        # fetch reads from the cache and slices it
+        self.assertTrue(self.ds._cache_has(['q', 'prcp']))
+        data = self.ds.fetch(['02', '01'], ['q', 'prcp'], st='20000125', en='20000205')
+        for stn in ['02', '01']:
+            expected = dynamic_frame(stn)[['q', 'prcp']]['20000125':'20000205']
+            pd.testing.assert_frame_equal(data[stn].loc[expected.index], expected, check_freq=False)
+        return
+
+    def test_cache_params(self):
+        self.ds.write_cache(stations=['01', '02'])
+        self.assertEqual(self.ds.write_cache(stations=['01', '02']), self.ds.cache_path)
+
+        with self.assertRaises(ValueError):
+            self.ds.write_cache()
+        self.ds.write_cache(overwrite=True)
+        self.assertEqual(self.ds._cache_params()['stations'], self.ds.stations())
+
+        # a period which is not in the cache is read from the files
+        self.assertFalse(self.ds._cache_has('all', st='19991201'))
+        data = self.ds.fetch(['01'], st='19991201', en='20000110')
+        pd.testing.assert_frame_equal(data['01'], dynamic_frame('01')[:'20000110'])
+        return
+
+
+class TestFetchStations(unittest.TestCase):
+
+    ds = Synthetic(tempfile.gettempdir())
+
+    def check_fetched(self, data, stations):
+        self.assertEqual(list(data.keys()), stations)
+        for stn in stations:
+            pd.testing.assert_frame_equal(data[stn], dynamic_frame(stn)[['tmax', 'q']], check_like=True)
+        return
+
+    def test_pools(self):
+        stations = ['10', '01', '02']
+        for kwargs in [{}, {'n_workers': 3}, {'n_workers': 2, 'use_processes': True}]:
+            data = self.ds.fetch_stations_attributes(stations, ['tmax', 'q'], **kwargs)
+            self.check_fetched(data, stations)
+            self.assertEqual(self.ds.failed_stations, {})
+        return
+
+    def test_failed_stations(self):
+        for kwargs in [{}, {'n_workers': 2}, {'n_workers': 2, 'use_processes': True}]:
+            with self.assertWarns(UserWarning):
+                data = self.ds.fetch_stations_attributes(['01', '99', '02'], ['tmax', 'q'], **kwargs)
+            self.check_fetched(data, ['01', '02'])
+            self.assertEqual(list(self.ds.failed_stations.keys()), ['99'])
+            self.assertIsInstance(self.ds.failed_stations['99'], FileNotFoundError)
+
+            # the error is raised when none of the stations could be fetched
+            with self.assertRaises(FileNotFoundError):
+                self.ds.fetch_stations_attributes(['98', '99'], **kwargs)
+        return
+
+    def test_invalid_attributes(self):
+        for kwargs in [{}, {'n_workers': 2}]:
+            with self.assertRaises(AssertionError):
+                self.ds.fetch_stations_attributes(['01', '02'], ['tmax', 'flow'], **kwargs)
+            with self.assertRaises(AssertionError):
+                self.ds.fetch(['01', '02'], ['tmax', 'flow'], **kwargs)
+        return
+
+
+class IntegerIds(Synthetic):
+    """A dataset whose static table has integer ids"""
+
+    def _read_static_table(self) -> pd.DataFrame:
+        df = STATIC.copy()
+        df.index = [int(stn) for stn in df.index]
+        return df
+
+
+class TestStatic(unittest.TestCase):
+
+    ds = Synthetic(tempfile.gettempdir())
+
+    def test_ids(self):
+        # ids are matched as strings so the leading zeros are kept
+        df = self.ds._fetch_static('01')
+        pd.testing.assert_frame_equal(df, STATIC.loc[['01']])
+        pd.testing.assert_frame_equal(self.ds.fetch_static_attributes('02', ['name']), STATIC.loc[['02'], ['name']])
+        with self.assertRaises(KeyError):
+            self.ds._fetch_static(1)
+
+        # integer ids are returned as they are given
+        df = IntegerIds(tempfile.gettempdir())._fetch_static([2, 10], ['elev', 'area'])
+        self.assertEqual(df.index.to_list(), [2, 10])
+        np.testing.assert_array_equal(df.values, [[20.0, 2.5], [100.0, 10.5]])
+        return
+
+    def test_list(self):
+        df = self.ds._fetch_static(['02', '10', '01'], ['area', 'name'])
+        pd.testing.assert_frame_equal(df, STATIC.loc[['02', '10', '01'], ['area', 'name']])
+        return
+
+    def test_as_ts(self):
+        index = pd.date_range('20000301', '20000310', freq='D')
+        df = self.ds._fetch_static('10', ['elev', 'area'], st='20000301', en='20000310', as_ts=True)
+        self.assertTrue(df.index.equals(index))
+        np.testing.assert_array_equal(df.values, np.repeat([[100.0, 10.5]], len(index), axis=0))
+
+        # for several stations the index is (station, time)
+        df = self.ds._fetch_static(['02', '10'], 'all', st='20000301', en='20000310', as_ts=True)
+        self.assertIsInstance(df.index, pd.MultiIndex)
+        self.assertEqual(len(df), 2 * len(index))
+        for stn in ['02', '10']:
+            self.assertTrue(df.loc[stn].index.equals(index))
+            pd.testing.assert_frame_equal(df.loc[stn], STATIC.loc[[stn] * len(index)].set_index(index),
+                                          check_freq=False)
+        return
+
+    def test_add_static(self):
+        # the stations are fetched in a different order than the rows of static table
+        stations = ['02', '10', '01']
+        data = self.ds.fetch_stations_attributes(stations, ['q'], ['area', 'name'], as_ts=True)
+        self.assertEqual(list(data.keys()), stations)
+        for stn in stations:
+            stn_df = data[stn]
+            self.assertEqual(list(stn_df.columns), ['q', 'area', 'name'])
+            pd.testing.assert_series_equal(stn_df['q'], dynamic_frame(stn)['q'])
+            self.assertTrue((stn_df['area'] == STATIC.loc[stn, 'area']).all())
+            self.assertTrue((stn_df['name'] == STATIC.loc[stn, 'name']).all())
+
+        data = self.ds.fetch(stations, ['q'], 'all')
+        for stn in stations:
+            pd.testing.assert_frame_equal(data[stn]['static'], STATIC.loc[[stn]])
+            pd.testing.assert_frame_equal(data[stn]['dynamic'], dynamic_frame(stn)[['q']])
+        return
+
+
+class TestFetchAsArray(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.ds = Synthetic(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def check_dynamic(self, dynamic, stations, attributes, index):
+        self.assertEqual(dynamic.shape, (len(stations), len(index), len(attributes)))
+        self.assertEqual(dynamic.dtype, np.float32)
+        for row, stn in enumerate(stations):
+            if stn in PERIODS:
+                expected = dynamic_frame(stn)[attributes].reindex(index).values.astype(np.float32)
+            else:
+                expected = np.full((len(index), len(attributes)), np.nan, dtype=np.float32)
+            np.testing.assert_array_equal(dynamic[row], expected, err_msg=stn)
+        return
+
+    def test_attribute_order(self):
+        # the first station has columns in a different order than dynamic_attributes
+        stations = ['02', '10', '01']
+        dynamic, static, index, stns = self.ds.fetch_as_array(stations, batch_size=2)
+        self.assertIsInstance(dynamic, np.ndarray)
+        self.assertIsNone(static)
+        self.assertEqual(stns, stations)
+        self.assertEqual(len(index), 366)
+        self.check_dynamic(dynamic, stations, ATTRIBUTES, index)
+
+        dynamic, _, index, _ = self.ds.fetch_as_array(stations, ['q', 'prcp'], st='20000110', en='20000220')
+        self.check_dynamic(dynamic, stations, ['q', 'prcp'], index)
+        return
+
+    def test_memmap_and_static(self):
+        fname = os.path.join(self.path, 'dynamic.npy')
+        stations = ['10', '99', '01', '02']
+        with self.assertWarns(UserWarning):
+            dynamic, _, index, _ = self.ds.fetch_as_array(stations, ['tmax', 'prcp'], memmap_path=fname, batch_size=3)
+        self.assertIsInstance(dynamic, np.memmap)
+        # the station which could not be fetched is nan
+        self.check_dynamic(dynamic, stations, ['tmax', 'prcp'], index)
+        np.testing.assert_array_equal(np.load(fname, mmap_mode='r'), dynamic)
+        del dynamic
+
+        # static attributes which are not numeric are nan
+        _, static, _, _ = self.ds.fetch_as_array(['02', '10'], static_attributes=['elev', 'name', 'area'])
+        expected = np.array([[20.0, np.nan, 2.5], [100.0, np.nan, 10.5]], dtype=np.float32)
+        np.testing.assert_array_equal(static, expected)
+        return
+
+
+FILL = -9999.0
+
+
+def write_nc(fname, id_var, ids, length, variables) -> dict:
+    """writes variables of shape (stations, time) in a netCDF file and returns
+    them with the fill values replaced by nan"""
+    rng = np.random.RandomState(0)
+    arrays = {}
+    with netCDF4.Dataset(fname, 'w') as nc:
+        nc.createDimension('station', len(ids))
+        nc.createDimension('time', length)
+        id_dtype = str if isinstance(ids[0], str) else np.int32
+        nc.createVariable(id_var, id_dtype, ('station',))[:] = np.array(ids, dtype=object if id_dtype is str else None)
+        for var, dtype in variables.items():
+            arr = rng.randint(0, 100, (len(ids), length)).astype(dtype)
+            arr[rng.random_sample(arr.shape) < 0.1] = FILL
+            nc.createVariable(var, dtype, ('station', 'time'), fill_value=FILL)[:] = arr
+            arrays[var] = np.where(arr == FILL, np.nan, arr.astype(np.float64))
+    return arrays
+
+
+def expected_frames(arrays, ids, stations, attributes, index, st, en) -> dict:
+    pos = index.slice_indexer(st, en)
+    return {stn: pd.DataFrame({attr: arrays[attr][ids.index(stn), pos] for attr in attributes}, index=index[pos])
+            for stn in stations}
+
+
+class SyntheticSWE(SWECanada):
+    """SWECanada whose netCDF file is in `path`"""
+
+    def __init__(self, path, **kwargs):
+        self.path = path
+        super().__init__(**kwargs)
+
+    @property
+    def ds_dir(self):
+        return self.path
+
+
+@unittest.skipIf(netCDF4 is None, "netCDF4 is not installed")
+class TestNetCDFStations(unittest.TestCase):
+    """stations are read from netCDF files by their ids in the requested order"""
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def check_frames(self, data, expected):
+        self.assertEqual(list(data.keys()), list(expected.keys()))
+        for stn, df in expected.items():
+            pd.testing.assert_frame_equal(data[stn], df, check_freq=False)
+        return
+
+    def test_hysets(self):
+        ids = [5, 11, 2, 7]
+        ds = HYSETS(self.path, 'ERA5')
+        index = pd.date_range(ds.start, ds.end, freq='D')
+        # the file has no swe so it is not fetched
+        arrays = write_nc(os.path.join(self.path, 'HYSETS_2020_ERA5.nc'), 'watershedID', ids, len(index),
+                          {'discharge': np.float32, 'tasmin': np.float32, 'tasmax': np.float32, 'pr': np.float64})
+        attributes = ['discharge', 'tasmin', 'tasmax', 'pr']
+
+        stations = [7, 2, 11]
+        data = ds.fetch_stations_dynamic_attributes(stations, st='20000101', en='20000110')
+        self.check_frames(data, expected_frames(arrays, ids, stations, attributes, index, '20000101', '20000110'))
+        self.assertEqual(len(data[7]), 10)
+        self.assertTrue(data[7].isna().any().any())
+
+        data = ds.fetch_stations_attributes([11, 5], ['pr', 'discharge'], st='20181220')
+        self.check_frames(data, expected_frames(arrays, ids, [11, 5], ['pr', 'discharge'], index, '20181220', None))
+
+        # the whole period when st and en are not given
+        df = ds.fetch_dynamic_attributes(2, 'tasmax')
+        pd.testing.assert_frame_equal(df, expected_frames(arrays, ids, [2], ['tasmax'], index, None, None)[2],
+                                      check_freq=False)
+
+        with self.assertRaises(ValueError):
+            ds.fetch_stations_dynamic_attributes([7, 3])
+        return
+
+    def test_swe_canada(self):
+        ids = ['ALE-01', 'BC-1A01', 'ON-2']
+        arrays = write_nc(os.path.join(self.path, 'CanSWE-CanEEN_1928-2020_v1.nc'), 'station_id', ids,
+                          len(pd.date_range('19280101', '20200731', freq='D')),
+                          {'snw': np.float64, 'snd': np.float32, 'den': np.float32, 'qc_flag_snw': np.int16})
+        ds = SyntheticSWE(self.path)
+        index = pd.date_range(ds.start, ds.end, freq='D')
+        self.assertEqual(ds.stations(), ids)
+
+        stations = ['ON-2', 'ALE-01']
+        data = ds.fetch_stations_attributes(stations, ['den', 'snw'], st='19500301', en='19500331')
+        self.check_frames(data, expected_frames(arrays, ids, stations, ['den', 'snw'], index, '19500301', '19500331'))
+
+        # integer flags are also returned with nan in place of fill values
+        data = ds.fetch(['BC-1A01'], q_flags='qc_flag_snw', en='19280110')
+        self.check_frames(data, expected_frames(arrays, ids, ['BC-1A01'], ['snw', 'snd', 'den', 'qc_flag_snw'],
+                                                index, None, '19280110'))
+        return
+
+
+if __name__ == "__main__":
+    unittest.main()
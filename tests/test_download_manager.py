@@ -0,0 +1,198 @@
+import os
+import io
+import json
+import hashlib
+import tarfile
+import zipfile
+import tempfile
+import threading
+import unittest
+import site   # so that AI4Water directory is in path
+site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from AI4Water.utils.datasets.download_manager import DownloadManager
+
+
+FILES = {f'file{i}.bin': os.urandom(50_000 + i) for i in range(4)}
+
+MEMBERS = {'data/daily/a.csv': os.urandom(30_000), 'data/hourly/b.csv': os.urandom(300_000),
+           'data/daily/c.csv': os.urandom(20_000)}
+
+
+def _archives():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+    FILES['archive.zip'] = buf.getvalue()
+
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tf:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    FILES['archive.tar.gz'] = buf.getvalue()
+    return
+
+
+_archives()
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    ranges = []
+    broken = set()   # files whose first transfer stops halfway
+    sent = 0
+    accept_ranges = True
+
+    def do_GET(self):
+        name = self.path.strip('/')
+        if name not in FILES:
+            self.send_error(404)
+            return
+        data = FILES[name]
+        start = 0
+        end = len(data)
+        rng = self.headers.get('Range')
+        if rng is not None and Handler.accept_ranges:
+            Handler.ranges.append((name, rng))
+            start, _end = rng.split('=')[1].split('-')
+            start, end = int(start), int(_end) + 1 if _end else end
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{len(data)}')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(end - start))
+        self.end_headers()
+        Handler.sent += end - start
+
+        if name in Handler.broken:
+            Handler.broken.discard(name)
+            self.wfile.write(data[start:start + len(data) // 2])
+            self.wfile.flush()
+            self.connection.close()
+            return
+        try:
+            self.wfile.write(data[start:end])
+        except ConnectionError:  # the client did not read the whole response
+            pass
+
+    def log_message(self, *args):
+        return
+
+
+class TestDownloadManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.url = f'http://127.0.0.1:{cls.server.server_address[1]}/'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        Handler.ranges = []
+        Handler.sent = 0
+        Handler.accept_ranges = True
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parallel(self):
+        manager = DownloadManager(self.tmp.name, n_workers=4, verbosity=0)
+        paths = manager.download([self.url + f for f in FILES])
+        self.assertEqual(len(paths), len(FILES))
+        for f, data in FILES.items():
+            with open(os.path.join(self.tmp.name, f), 'rb') as fp:
+                self.assertEqual(fp.read(), data)
+        return
+
+    def test_resume(self):
+        Handler.broken = {'file1.bin'}
+        manager = DownloadManager(self.tmp.name, chunk_size=1000, verbosity=0, pause=0.0)
+        path = manager.download_file(self.url + 'file1.bin')
+        with open(path, 'rb') as fp:
+            self.assertEqual(fp.read(), FILES['file1.bin'])
+        self.assertEqual(Handler.ranges, [('file1.bin', f"bytes={len(FILES['file1.bin']) // 2}-")])
+        self.assertFalse(os.path.exists(path + '.part'))
+        return
+
+    def test_checksum(self):
+        manager = DownloadManager(self.tmp.name, verbosity=0)
+        md5 = hashlib.md5(FILES['file2.bin']).hexdigest()
+        manager.download_file(self.url + 'file2.bin', checksum=f'md5:{md5}')
+        self.assertRaises(ValueError, manager.download_file, self.url + 'file3.bin', checksum=f'md5:{md5}')
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'file3.bin.part')))
+
+        manager.download([self.url + 'file3.bin', (self.url + 'missing.bin', 'missing.bin')], raise_errors=False)
+        self.assertEqual(list(manager.failed), [self.url + 'missing.bin'])
+        return
+
+    def test_manifest(self):
+        manager = DownloadManager(self.tmp.name, verbosity=0)
+        manager.download([(self.url + 'file0.bin', 'sub/a.bin')])
+        with open(os.path.join(self.tmp.name, DownloadManager.MANIFEST)) as fp:
+            manifest = json.load(fp)
+        self.assertEqual(manifest[os.path.join('sub', 'a.bin')]['size'], len(FILES['file0.bin']))
+
+        # a completed file is not requested again
+        Handler.broken = set()
+        os.utime(os.path.join(self.tmp.name, 'sub', 'a.bin'), (0, 0))
+        manager.download([(self.url + 'file0.bin', 'sub/a.bin')])
+        self.assertEqual(os.path.getmtime(os.path.join(self.tmp.name, 'sub', 'a.bin')), 0)
+        return
+
+    def check_members(self, paths, extract_dir):
+        self.assertEqual(len(paths), 2)
+        for name in ['data/daily/a.csv', 'data/daily/c.csv']:
+            with open(os.path.join(self.tmp.name, extract_dir, name), 'rb') as fp:
+                self.assertEqual(fp.read(), MEMBERS[name])
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, extract_dir, 'data/hourly/b.csv')))
+        return
+
+    def test_extract_zip(self):
+        manager = DownloadManager(self.tmp.name, chunk_size=4096, verbosity=0)
+        paths = manager.extract_file(self.url + 'archive.zip', select=lambda m: 'hourly' not in m)
+        self.check_members(paths, 'archive')
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'archive.zip')))
+        # the member which is not selected is not downloaded
+        self.assertLess(Handler.sent, len(FILES['archive.zip']) - len(MEMBERS['data/hourly/b.csv']) // 2)
+
+        # members which already exist are not read again
+        Handler.sent = 0
+        os.remove(paths[1])
+        manager.extract_file(self.url + 'archive.zip', select=lambda m: 'hourly' not in m)
+        self.assertTrue(os.path.exists(paths[1]))
+        self.assertLess(Handler.sent, len(MEMBERS['data/daily/a.csv']))
+        return
+
+    def test_extract_zip_without_ranges(self):
+        Handler.accept_ranges = False
+        manager = DownloadManager(self.tmp.name, verbosity=0)
+        paths = manager.extract(['http://127.0.0.1:{}/archive.zip'.format(self.server.server_address[1])],
+                                select=lambda m: 'hourly' not in m)
+        self.check_members(list(paths.values())[0], 'archive')
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'archive.zip')))
+        return
+
+    def test_extract_tar(self):
+        md5 = hashlib.md5(FILES['archive.tar.gz']).hexdigest()
+        manager = DownloadManager(self.tmp.name, verbosity=0)
+        paths = manager.extract_file(self.url + 'archive.tar.gz', checksum=f'md5:{md5}',
+                                     select=lambda m: 'hourly' not in m)
+        self.check_members(paths, '')
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'archive.tar.gz')))
+
+        self.assertRaises(ValueError, manager.extract_file, self.url + 'archive.tar.gz', checksum='md5:0')
+        return
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import unittest
+import site   # so that AI4Water directory is in path
+site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
+
+import numpy as np
+import pandas as pd
+
+from AI4Water.ETUtil import ETEnsemble, MultiSiteET, PenmanMonteith, et_methods
+
+
+units = {'tmin': 'Centigrade', 'tmax': 'Centigrade', 'rh_min': 'percent', 'rh_max': 'percent',
+         'sol_rad': 'MegaJourPerMeterSquare', 'wind_speed': 'MeterPerSecond'}
+
+constants = {'lat_dec_deg': 35.5, 'altitude': 249, 'long_dec_deg': 127.0, 'albedo': 0.23, 'a_s': 0.23, 'b_s': 0.5,
+             'abtew_k': 0.52, 'ct': 0.025, 'tx': 3, 'cts': 0.0055, 'pen_ap': 2.4, 'pan_ap': 2.4, 'turc_k': 0.013,
+             'wind_f': 'pen48', 'pan_coeff': 0.71, 'pan_over_est': False, 'pan_est': 'pot_et', 'CH': 0.12,
+             'Ca': 0.001013, 'surf_res': 70, 'alphaPT': 1.28, 'alpha_pt': 1.26, 'alphaA': 0.14, 'Roua': 1.2,
+             'f_camargo': 0.01}
+
+methods = ['Abtew', 'Albrecht', 'BrutsaertStrickler', 'Camargo', 'Caprio', 'ChapmanAustralia', 'Dalton',
+           'GrangerGray', 'Hamon', 'HargreavesSamani', 'Makkink', 'MattShuttleworth', 'McGuinnessBordne',
+           'Penman', 'PenPan', 'PenmanMonteith', 'PriestleyTaylor', 'Romanenko', 'SzilagyiJozsa', 'Turc']
+
+
+def make_inputs(days=730, seed=0) -> pd.DataFrame:
+    rng = np.random.RandomState(seed)
+    tmin = 5 + 10 * np.sin(np.arange(days) / 58) + rng.random_sample(days)
+    return pd.DataFrame({'tmin': tmin,
+                         'tmax': tmin + 5 + 5 * rng.random_sample(days),
+                         'rh_min': 30 + 20 * rng.random_sample(days),
+                         'rh_max': 60 + 30 * rng.random_sample(days),
+                         'sol_rad': 5 + 20 * rng.random_sample(days),
+                         'wind_speed': 0.5 + 3 * rng.random_sample(days)},
+                        index=pd.date_range('20000101', periods=days, freq='D'))
+
+
+class TestETEnsemble(unittest.TestCase):
+
+    def test_same_as_single_method(self):
+        # the methods which share the input and cache of ensemble give the same etp as when run alone
+        df = make_inputs()
+        method_kwargs = {'HargreavesSamani': {'method': '2003'}}
+        et = ETEnsemble(df, units, constants, verbosity=0)(methods, method_kwargs=method_kwargs)
+        self.assertEqual(list(et.columns), methods)
+        self.assertTrue(et.index.equals(df.index))
+
+        for method in methods:
+            single = getattr(et_methods, method)(df.copy(), units.copy(), constants.copy(), verbosity=0)
+            expected = np.asarray(single(**method_kwargs.get(method, {})), dtype=float)
+            np.testing.assert_array_equal(et[method].values.astype(float), expected, err_msg=method)
+
+        # the methods can also be given as classes and the input is not modified
+        pd.testing.assert_frame_equal(df, make_inputs())
+        et2 = ETEnsemble(df, units, constants, verbosity=0)([PenmanMonteith, 'Abtew'])
+        pd.testing.assert_frame_equal(et2, et[['PenmanMonteith', 'Abtew']])
+        return
+
+
+class TestMultiSiteET(unittest.TestCase):
+
+    sites = 4
+    dfs = [make_inputs(seed=site) for site in range(sites)]
+    lats = np.linspace(-40, 50, sites)
+    altitudes = np.linspace(0, 2000, sites)
+
+    def multi_site(self):
+        inputs = {col: np.stack([df[col].values for df in self.dfs], axis=1) for col in self.dfs[0].columns}
+        cons = constants.copy()
+        cons.update({'lat_dec_deg': self.lats, 'altitude': self.altitudes})
+        return MultiSiteET(inputs, units, cons, index=self.dfs[0].index, verbosity=0)
+
+    def test_same_as_single_site(self):
+        et = self.multi_site()(methods)
+        self.assertEqual(MultiSiteET.to_array(et).shape, (len(self.dfs[0]), self.sites, len(methods)))
+
+        for site, df in enumerate(self.dfs):
+            cons = constants.copy()
+            cons.update({'lat_dec_deg': self.lats[site], 'altitude': self.altitudes[site]})
+            single = ETEnsemble(df, units, cons, verbosity=0)(methods)
+            for method in methods:
+                multi, one = et[method].iloc[:, site].values, single[method].values.astype(float)
+                if method == 'SzilagyiJozsa':
+                    # the equilibrium temperature is iterated until it converges at all sites, so the
+                    # iterations stop at slightly different values and, on a few days, at another root.
+                    self.assertGreater(np.isclose(multi, one, atol=0.5, equal_nan=True).mean(), 0.99)
+                else:
+                    np.testing.assert_allclose(multi, one, rtol=1e-5, atol=1e-4, err_msg=f"{method} at site {site}")
+        return
+
+    def test_unsupported_methods(self):
+        et = self.multi_site()
+        for method in MultiSiteET.unsupported:
+            with self.assertRaises(NotImplementedError):
+                et(['PenmanMonteith', method])
+        # no method is calculated when one of them is not supported
+        self.assertEqual(et.output, {})
+        return
+
+
+class TestIntermediateCache(unittest.TestCase):
+
+    def et(self, **cons):
+        _cons = constants.copy()
+        _cons.update(cons)
+        return PenmanMonteith(make_inputs(), units, _cons, verbosity=0)
+
+    def test_reassign_cons(self):
+        et = self.et()
+        ra, sha = et._et_rad(), et.sunset_angle()
+        cons = constants.copy()
+        cons['lat_dec_deg'] = -20.0
+        et.cons = cons
+
+        fresh = self.et(lat_dec_deg=-20.0)
+        self.assertFalse(np.allclose(et._et_rad(), ra))
+        self.assertFalse(np.allclose(et.sunset_angle(), sha))
+        np.testing.assert_array_equal(et._et_rad(), fresh._et_rad())
+        np.testing.assert_array_equal(et.sunset_angle(), fresh.sunset_angle())
+        return
+
+    def test_invalidate_cache(self):
+        et = self.et()
+        ra = et._et_rad()
+        et.cons['lat_dec_deg'] = -20.0
+        # the cached values are returned until they are invalidated
+        np.testing.assert_array_equal(et._et_rad(), ra)
+
+        et.invalidate_cache('ra', 'sha')
+        self.assertNotIn(('ra', 1440), et.cache)
+        np.testing.assert_array_equal(et._et_rad(), self.et(lat_dec_deg=-20.0)._et_rad())
+
+        et.input['jday'] = et.input['jday'].values + 1
+        et.invalidate_cache()
+        self.assertEqual(len(et.cache), 0)
+        self.assertFalse(np.allclose(et._et_rad(), self.et(lat_dec_deg=-20.0)._et_rad()))
+        return
+
+    def test_read_only(self):
+        et = self.et()
+        et()
+        self.assertGreater(len(et.cache), 0)
+        for quantity in ['ra', 'sha', 'ird', 'solar_dec', 'rn']:
+            val = et.cache.get(quantity, 1440, None)
+            self.assertFalse(val.flags.writeable)
+            with self.assertRaises(ValueError):
+                val[0] = 0.0
+        return
+
+    def test_input_does_not_grow(self):
+        et = self.et()
+        columns = list(et.input.columns)
+        first = et()
+        self.assertEqual(list(et.input.columns), columns)
+        self.assertGreater(et.cache.hits, 0)
+        # the second run uses the cache and gives the same result
+        np.testing.assert_array_equal(et().values, first.values)
+        self.assertEqual(list(et.input.columns), columns)
+        return
+
+
+if __name__ == "__main__":
+    unittest.main()
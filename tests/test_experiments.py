@@ -57,6 +57,17 @@ class TestExperiments(unittest.TestCase):
         self.assertEqual(exp2.exp_name, exp.exp_name)
         self.assertEqual(exp2.exp_path, exp.exp_path)
 
+    def test_parallel_dryrun(self):
+        include = ['GaussianProcessRegressor', 'HistGradientBoostingRegressor', 'LinearRegression']
+        exp = MLRegressionExperiments(data=df, inputs=input_features, outputs=outputs,
+                                      input_nans={'SimpleImputer': {'strategy': 'mean'}}, exp_name="ParallelMLModels")
+        exp.fit(run_type="dry_run", include=include, n_jobs=2, threads_per_model=1)
+
+        self.assertEqual(list(exp.simulations['test'].keys()), include)
+        self.assertEqual(len(exp.config['eval_models']), 3)
+        self.assertEqual(len(exp.config['failed_models']), 0)
+        return
+
 if __name__=="__main__":
     unittest.main()
 
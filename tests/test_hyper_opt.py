@@ -8,6 +8,7 @@ site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
 import skopt
 import sklearn
 import numpy as np
+import pandas as pd
 from sklearn.svm import SVC
 from scipy.stats import uniform
 from hyperopt import hp, STATUS_OK
@@ -23,6 +24,7 @@ from AI4Water.utils.utils import Jsonize
 from AI4Water.utils.SeqMetrics import RegressionMetrics
 from AI4Water.utils.datasets import load_u1
 from AI4Water.hyper_opt import HyperOpt, Real, Categorical, Integer
+from AI4Water.hyper_opt.utils import fingerprint
 
 
 data = load_u1()
@@ -119,6 +121,11 @@ def run_unified_interface(algorithm, backend, num_iterations, num_samples=None):
         assert os.path.exists(fpath)
     return optimizer
 
+def quadratic(**suggestion):
+    # defined at module level so that it can be evaluated in worker processes
+    return 100 * ((suggestion['x'] - 2) ** 2 + suggestion['y'])
+
+
 class TestHyperOpt(unittest.TestCase):
 
     def test_real_num_samples(self):
@@ -509,6 +516,47 @@ class TestHyperOpt(unittest.TestCase):
 
 
 
+    def test_parallel_trials_and_journal(self):
+        opt_path = os.path.join(os.getcwd(), 'results', f'test_parallel_grid_{int(time.time())}')
+        space = [Integer(low=0, high=4, name='x', num_samples=5), Integer(low=0, high=2, name='y', num_samples=3)]
+
+        opt = HyperOpt('grid', objective_fn=quadratic, param_space=space, n_jobs=4, opt_path=opt_path)
+        opt.fit()
+        self.assertEqual(len(opt.journal), 15)
+        self.assertEqual(opt.best_paras(), {'x': 2, 'y': 0})
+
+        # the second optimization should read all the points from journal
+        opt = HyperOpt('grid', objective_fn=quadratic, param_space=space, n_jobs=4, opt_path=opt_path,
+                       resume=True)
+        self.assertEqual(len(opt.journal), 15)
+        opt.fit()
+        self.assertEqual(opt.best_paras(), {'x': 2, 'y': 0})
+
+        # the journal of an optimization with different space must not be reused
+        space1 = [Integer(low=0, high=4, name='x', num_samples=3), Integer(low=0, high=2, name='y', num_samples=3)]
+        with self.assertRaises(ValueError):
+            HyperOpt('grid', objective_fn=quadratic, param_space=space1, opt_path=opt_path, resume=True)
+
+        # without resume, the journal is started afresh
+        opt = HyperOpt('grid', objective_fn=quadratic, param_space=space1, opt_path=opt_path)
+        self.assertEqual(len(opt.journal), 0)
+        return
+
+    def test_fingerprint(self):
+        space = [Integer(low=0, high=4, name='x', num_samples=5)]
+        data = np.arange(12.0)
+        fp = fingerprint(quadratic, space, data)
+        self.assertEqual(fp, fingerprint(quadratic, space, data.copy()))
+
+        # same bytes but different shape or dtype
+        self.assertNotEqual(fp, fingerprint(quadratic, space, data.reshape(3, 4)))
+        self.assertNotEqual(fp, fingerprint(quadratic, space, data.view(np.int64)))
+
+        df = pd.DataFrame(data.reshape(6, 2), columns=['a', 'b'])
+        self.assertNotEqual(fingerprint(quadratic, space, df), fingerprint(quadratic, space, df.rename(columns={'b': 'c'})))
+        self.assertEqual(fingerprint(quadratic, space, df['a']), fingerprint(quadratic, space, df[['a']]))
+        self.assertEqual(fingerprint(quadratic, space, data.tolist()), fp)
+        return
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import unittest
+import subprocess
+
+import site   # so that AI4Water directory is in path
+site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FRAMEWORKS = ['tensorflow', 'torch', 'tcn', 'catboost', 'xgboost', 'lightgbm', 'tpot']
+
+# the import is timed in a fresh interpreter and the frameworks which it imported are reported
+SCRIPT = """
+import sys, json, time
+start = time.time()
+import {module}
+print(json.dumps({{'seconds': time.time() - start,
+                   'imported': [m for m in {frameworks} if m in sys.modules]}}))
+"""
+
+
+def time_import(module: str) -> dict:
+    code = SCRIPT.format(module=module, frameworks=FRAMEWORKS)
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE, check=True,
+                         universal_newlines=True).stdout
+    return json.loads(out.strip().split('\n')[-1])
+
+
+class TestImportTime(unittest.TestCase):
+
+    def check(self, module):
+        result = time_import(module)
+        print(f"import {module}: {result['seconds']:.3f} s")
+        self.assertEqual(result['imported'], [], f"import {module} imported {result['imported']}")
+        return result
+
+    def test_import_AI4Water(self):
+        self.check('AI4Water')
+        return
+
+    def test_import_backend(self):
+        self.check('AI4Water.backend')
+        return
+
+    def test_import_ETUtil(self):
+        self.check('AI4Water.ETUtil')
+        return
+
+    def test_import_SeqMetrics(self):
+        self.check('AI4Water.utils.SeqMetrics')
+        return
+
+    def test_lazy_framework(self):
+        """only the framework which is asked for, is imported"""
+        code = SCRIPT.format(module='AI4Water.backend', frameworks=FRAMEWORKS)
+        code = code.replace("import AI4Water.backend", "from AI4Water.backend import imputations")
+        out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, stdout=subprocess.PIPE, check=True,
+                             universal_newlines=True).stdout
+        self.assertEqual(json.loads(out.strip().split('\n')[-1])['imported'], [])
+        return
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -401,6 +401,21 @@ class test_Scalers(unittest.TestCase):
         for i,j in zip(data['out1'], pred):
             self.assertAlmostEqual(i, float(j), 5)
         return
+
+    def test_data_not_modified(self):
+        """The caller's data must remain intact unless copy is False"""
+        data = pd.DataFrame(np.random.random((100, 3)), columns=['in1', 'in2', 'out1'])
+        data.iloc[[5, 10], 0] = np.nan
+        orig = data.copy()
+
+        Transformations(data=data, method='minmax', replace_nans=True)('Transform')
+        self.assertTrue(data.equals(orig))
+
+        model = Model(data=data, inputs=['in1', 'in2'], outputs=['out1'], transformation='minmax',
+                      input_nans={'fillna': {'value': 0.0}}, verbosity=0)
+        model.fetch_data(model.data, model.in_cols, model.out_cols, transformation='minmax')
+        self.assertTrue(model.data.equals(orig))
+        return
     #
     # def test_multiple_transformation_multiple_inputs(self):
     #     # TODO
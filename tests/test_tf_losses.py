@@ -7,6 +7,7 @@ site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
 
 from AI4Water.utils import tf_losses
 from AI4Water.utils.SeqMetrics import RegressionMetrics
+from AI4Water.models.custom_training import nan_mask, masked_loss, jit_compiled
 
 
 import tensorflow as tf
@@ -47,5 +48,46 @@ class test_errors(unittest.TestCase):
     def nse_pbias(self):
         self.assertAlmostEqual(np_errors.pbias(), K.eval(tf_losses.pbias(t, p)), 4)
 
+
+class test_masked_loss(unittest.TestCase):
+
+    y = np.array([[0.5, np.nan], [0.0, -1.0], [np.nan, 2.0], [-0.5, 1.0]], dtype=np.float32)
+    y_pred = np.random.random((4, 2)).astype(np.float32)
+    valid = ~np.isnan(y)
+
+    def test_masked_mse(self):
+        """zero and negative labels must not be masked, only the nans"""
+        mask, y = nan_mask(tf.constant(self.y))
+        self.assertTrue(np.array_equal(K.eval(mask), self.valid.astype(np.float32)))
+        loss = masked_loss('mse', y, tf.constant(self.y_pred), mask)
+        expected = np.mean(np.square(self.y[self.valid] - self.y_pred[self.valid]))
+        self.assertAlmostEqual(float(K.eval(loss)), float(expected), 5)
+
+    def test_mask_with_weights(self):
+        weights = np.ones_like(self.y)
+        weights[1, 1] = 0.0
+        mask, y = nan_mask(tf.constant(self.y), tf.constant(weights))
+        loss = masked_loss(tf.keras.losses.MeanAbsoluteError(), y, tf.constant(self.y_pred), mask)
+        valid = self.valid & (weights > 0)
+        expected = np.mean(np.abs(self.y[valid] - self.y_pred[valid]))
+        self.assertAlmostEqual(float(K.eval(loss)), float(expected), 5)
+
+    def test_masked_nse(self):
+        mask, y = nan_mask(tf.constant(self.y))
+        loss = masked_loss(tf_losses.tf_nse, y, tf.constant(self.y_pred), mask)
+        nse = RegressionMetrics(self.y[self.valid], self.y_pred[self.valid]).nse()
+        self.assertAlmostEqual(float(K.eval(loss)), 1.0 - nse, 4)
+
+    def test_masked_loss_in_graph(self):
+        @jit_compiled
+        def step(y, y_pred):
+            mask, y = nan_mask(y)
+            return masked_loss('mse', y, y_pred, mask)
+
+        loss = step(tf.constant(self.y), tf.constant(self.y_pred))
+        expected = np.mean(np.square(self.y[self.valid] - self.y_pred[self.valid]))
+        self.assertAlmostEqual(float(K.eval(loss)), float(expected), 5)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,9 +1,10 @@
 import os
 import unittest
+import warnings
 import site   # so that AI4Water directory is in path
 site.addsitedir(os.path.dirname(os.path.dirname(__file__)) )
 
-from AI4Water.utils.SeqMetrics import RegressionMetrics
+from AI4Water.utils.SeqMetrics import RegressionMetrics, BatchRegressionMetrics
 from AI4Water.utils.SeqMetrics.utils import plot_metrics
 
 import numpy as np
@@ -81,5 +82,98 @@ class test_errors(unittest.TestCase):
         assert errs.mare() * 100.0 == errs.mape()
         return
 
+    def test_shared_stats(self):
+        # the statistics shared by metrics must be recalculated when arrays are changed
+        errs = RegressionMetrics(t, p)
+        mse = errs.mse()
+        errs.true = errs.true * 2.0
+        self.assertAlmostEqual(errs.mse(), float(np.mean((t.reshape(-1,) * 2.0 - p.reshape(-1,)) ** 2)))
+        self.assertNotAlmostEqual(errs.mse(), mse)
+        return
+
+    def test_mb_r(self):
+        true, pred = er.true, er.predicted
+        tot = sum(np.sum(np.abs(pred - true[i])) for i in range(len(true)))
+        mb_r = 1 - (len(true) ** 2 * np.mean(np.abs(pred - true)) / tot)
+        self.assertAlmostEqual(er.mb_r(), mb_r)
+        return
+
+    def test_batch_metrics(self):
+        # metrics of each output and horizon must be same as calculated by RegressionMetrics after removing nans
+        true = np.random.random((100, 2, 3)) + 0.1
+        pred = np.random.random((100, 2, 3)) + 0.1
+        true[np.random.random(true.shape) < 0.1] = np.nan
+        pred[np.random.random(pred.shape) < 0.05] = np.nan
+
+        batch_errors = BatchRegressionMetrics(true, pred).calculate_all()
+        self.assertEqual(len(batch_errors), len(all_errors))
+
+        for out in range(2):
+            for h in range(3):
+                t, p_ = true[:, out, h], pred[:, out, h]
+                valid = ~(np.isnan(t) | np.isnan(p_))
+                errors = RegressionMetrics(t[valid], p_[valid])
+                for metric, values in batch_errors.items():
+                    self.assertEqual(values.shape, (2, 3))
+                    expected = getattr(errors, metric)()
+                    expected = np.nan if expected is None else float(expected)
+                    np.testing.assert_allclose(values[out, h], expected, rtol=1e-6, err_msg=metric)
+        return
+
+    def test_batch_undefined_metrics(self):
+        true = np.random.random((50, 2, 1)) + 0.1
+        pred = np.random.random((50, 2, 1)) + 0.1
+        true[3, 1, 0] = -1.0
+        pred[:, 0, 0] = true[:, 0, 0]
+        batch = BatchRegressionMetrics(true, pred)
+        errors = batch.calculate_all()
+
+        # raise as in RegressionMetrics and are NaN only where not defined in calculate_all
+        for metric in ['mean_gamma_deviance', 'mean_poisson_deviance']:
+            with self.assertRaises(ValueError):
+                getattr(RegressionMetrics(true[:, 1, 0], pred[:, 1, 0]), metric)()
+            with self.assertRaises(ValueError):
+                getattr(batch, metric)()
+            self.assertTrue(np.isnan(errors[metric][1, 0]))
+            self.assertAlmostEqual(errors[metric][0, 0], getattr(RegressionMetrics(true[:, 0, 0], pred[:, 0, 0]), metric)())
+
+        # metrics which are None in RegressionMetrics are NaN
+        for metric in ['r2_mod', 'exp_var_score']:
+            self.assertIsNone(getattr(RegressionMetrics(true[:, 0, 0], pred[:, 0, 0]), metric)())
+            self.assertTrue(np.isnan(getattr(batch, metric)()[0, 0]))
+            self.assertTrue(np.isfinite(getattr(batch, metric)()[1, 0]))
+        return
+
+    def test_batch_single_column(self):
+        # one output and one horizon gives arrays of shape (1, 1) and not scalars
+        true, pred = np.random.random((30, 1, 1)), np.random.random((30, 1, 1))
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            errors = BatchRegressionMetrics(true, pred).calculate_all()
+        for metric, values in errors.items():
+            self.assertEqual(values.shape, (1, 1), msg=metric)
+        self.assertAlmostEqual(errors['r2_mod'][0, 0], RegressionMetrics(true[:, 0, 0], pred[:, 0, 0]).r2_mod())
+        return
+
+    def test_fdc_with_nans(self):
+        # NaNs are not removed by default and come after all the values when sorted in descending order
+        true, pred = np.linspace(1, 20, 20), np.linspace(2, 21, 20)
+        true[[3, 7]] = np.nan
+        errors = RegressionMetrics(true, pred)
+
+        obs, sim = -np.sort(-true), -np.sort(-pred)
+        fhv = np.sum(sim[:3] - obs[:3]) / (np.sum(obs[:3]) + 1e-6) * 100
+        self.assertAlmostEqual(errors.fdc_fhv(h=0.15), fhv)
+        self.assertTrue(np.isfinite(errors.fdc_fhv(h=0.15)))
+
+        obs, sim = np.log(obs[14:] + 1e-6), np.log(sim[14:] + 1e-6)
+        flv = -1 * (np.sum(sim - sim.min()) - np.sum(obs - obs.min())) / (np.sum(obs - obs.min()) + 1e-6) * 100
+        np.testing.assert_allclose(errors.fdc_flv(), flv)
+
+        batch = BatchRegressionMetrics(true.reshape(-1, 1, 1), pred.reshape(-1, 1, 1), ignore_nan=False)
+        self.assertAlmostEqual(batch.fdc_fhv(h=0.15)[0, 0], fhv)
+        np.testing.assert_allclose(batch.fdc_flv()[0, 0], flv)
+        return
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
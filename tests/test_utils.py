@@ -15,7 +15,10 @@ from AI4Water.backend import get_sklearn_models
 from AI4Water.utils.imputation import Imputation
 from AI4Water.utils.datasets import load_nasdaq
 from AI4Water.utils.visualizations import Interpret
-from AI4Water.utils.utils import split_by_indices, train_val_split, ts_features, prepare_data, Jsonize
+from AI4Water.utils.utils import split_by_indices, train_val_split, ts_features, prepare_data, Jsonize, label_mask
+from AI4Water.utils.batch_generator import WindowedSequence
+from AI4Water.utils.data_cache import DATA_CACHE
+from AI4Water.utils.streaming import StreamingForecaster
 
 tf.compat.v1.disable_eager_execution()
 
@@ -73,12 +76,12 @@ def get_layers(o=1, forecast_len=1):
 
 def build_model(**kwargs):
 
+    kwargs.setdefault('transformation', None)
     model = Model(
         data=data1,
         verbosity=0,
         batch_size=batch_size,
         lookback=lookback,
-        transformation=None,
         epochs=1,
         **kwargs
     )
@@ -735,6 +738,251 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(len(x), 33)
         return
 
+    def test_prepare_data_views(self):
+        """Test that windows returned as views are same as those returned as copies."""
+        copies = prepare_data(data2, num_outputs=2, lookback_steps=4, input_steps=2, forecast_step=2,
+                              forecast_len=4)
+        views = prepare_data(data2, num_outputs=2, lookback_steps=4, input_steps=2, forecast_step=2,
+                             forecast_len=4, copy=False)
+        for c, v in zip(copies, views):
+            self.assertEqual(c.shape, v.shape)
+            self.assertTrue(np.array_equal(c, v))
+        self.assertFalse(views[0].flags.writeable)
+        self.assertTrue(np.shares_memory(views[0], data2))
+        self.assertTrue(copies[0].flags.writeable)
+        self.assertTrue(copies[2].flags.c_contiguous)
+        return
+
+    def test_label_mask(self):
+        y = np.array([[[1.0], [2.0]],
+                      [[np.nan], [2.0]],
+                      [[np.nan], [np.nan]],
+                      [[4.0], [5.0]]])
+        keep, dropped = label_mask(y)
+        self.assertTrue(np.array_equal(keep, [True, False, False, True]))
+        self.assertTrue(np.array_equal(dropped, [1, 2]))
+        keep, dropped = label_mask(y, allow_nan_labels=1)
+        self.assertTrue(np.array_equal(dropped, [2]))
+        keep, dropped = label_mask(y, allow_nan_labels=2)
+        self.assertEqual(len(dropped), 0)
+        keep, dropped = label_mask(np.array([[1], [-99], [3]]), missing=-99)
+        self.assertTrue(np.array_equal(dropped, [1]))
+        return
+
+    def test_windowed_sequence(self):
+        """Test that batches from WindowedSequence are same as examples prepared by prepare_data."""
+        data = np.arange(int(50 * 5), dtype=np.float32).reshape(-1, 50).transpose()
+        data[[10, 20], -1] = np.nan
+        x, _, y = prepare_data(data, num_outputs=2, lookback_steps=4, input_steps=2, forecast_step=2,
+                               forecast_len=4, mask=np.nan)
+        seq = WindowedSequence(data, num_outputs=2, lookback_steps=4, input_steps=2, forecast_step=2,
+                               forecast_len=4, batch_size=8)
+        self.assertEqual(seq.num_examples, len(x))
+        self.assertEqual(len(seq), int(np.ceil(len(x) / 8)))
+        seq_x = np.concatenate([seq[i][0] for i in range(len(seq))])
+        seq_y = np.concatenate([seq[i][1] for i in range(len(seq))])
+        self.assertTrue(np.allclose(seq_x, x))
+        self.assertTrue(np.allclose(seq_y, y))
+        return
+
+    def test_lazy_batches(self):
+        model = build_model(lazy_batches=True,
+                            model={'layers': get_layers()},
+                            inputs=in_cols,
+                            outputs=out_cols)
+        history = model.fit(indices='random')
+        self.assertTrue('val_loss' in history.history)
+        return
+
+    def test_cache_data(self):
+        model = build_model(cache_data=True,
+                            transformation='minmax',
+                            model={'layers': get_layers()},
+                            inputs=in_cols,
+                            outputs=out_cols)
+        DATA_CACHE.clear(model.data_cache_path)
+        x, _, y = model.train_data(st=10, en=500)
+        scaler = model.scalers['0']
+        dropped = model.dropped_examples
+        # second call should return the cached arrays and restore the scaler and dropped examples
+        model.scalers = {}
+        model.dropped_examples = None
+        x1, _, y1 = model.train_data(st=10, en=500)
+        self.assertTrue(np.allclose(x, x1))
+        self.assertTrue(np.allclose(y, y1, equal_nan=True))
+        self.assertIs(model.scalers['0'], scaler)
+        self.assertTrue(np.array_equal(model.dropped_examples, dropped))
+
+        # the cached arrays can not be modified in place by the caller
+        for arr in (x[0], y, x1[0], y1):
+            self.assertFalse(arr.flags.writeable)
+        with self.assertRaises(ValueError):
+            y1[0] = 0.0
+
+        # arrays written on disk should be used when they are not in memory
+        DATA_CACHE.memory.clear()
+        x2, _, y2 = model.train_data(st=10, en=500)
+        self.assertTrue(np.allclose(x, x2))
+        self.assertFalse(y2.flags.writeable)
+
+        history = model.fit(st=10, en=500)
+        self.assertTrue('val_loss' in history.history)
+        DATA_CACHE.clear(model.data_cache_path)
+        return
+
+    def test_cache_data_relative_path(self):
+        model = build_model(cache_data=os.path.join('results', 'test_cache'),
+                            model={'layers': get_layers()},
+                            inputs=in_cols,
+                            outputs=out_cols)
+        self.assertTrue(os.path.isabs(model.data_cache_path))
+        DATA_CACHE.clear(model.data_cache_path)
+        x, _, _ = model.train_data(st=10, en=500)
+        self.assertEqual(len([f for f in os.listdir(model.data_cache_path) if f.endswith('.h5')]), 1)
+
+        DATA_CACHE.memory.clear()
+        x1, _, _ = model.train_data(st=10, en=500)
+        self.assertTrue(np.allclose(x, x1))
+        self.assertEqual(len(DATA_CACHE.memory), 1)  # read back from disk
+        DATA_CACHE.clear(model.data_cache_path)
+        return
+
+    def test_fit_from_cache(self):
+        model = build_model(model={'layers': get_layers()},
+                            inputs=in_cols,
+                            outputs=out_cols)
+        x, prev_y, y = model.train_data()
+        for fmt in ['h5', 'npy']:
+            path = model.write_cache('train_data_' + fmt, x, prev_y, y, fmt=fmt)
+            seq = model.cached_sequence(path, shuffle=True)
+            self.assertEqual(seq.num_examples, len(x[0]))
+            history = model.fit(data=path)
+            self.assertTrue('val_loss' in history.history)
+            true, pred = model.predict(data=path)
+            self.assertEqual(len(true), len(pred))
+            seq.close()
+
+        # an existing file can not be used as directory of npy files
+        with self.assertRaises(FileExistsError):
+            model.write_cache('train_data_h5', x, prev_y, y, fmt='npy')
+        return
+
+    def test_save_load_artifact(self):
+        model = build_model(model={'layers': get_layers()},
+                            transformation='minmax',
+                            inputs=in_cols,
+                            outputs=out_cols)
+        model.fit(indices='random')
+        true, pred = model.predict(indices=model.test_indices, pp=False)
+
+        fname = model.save_artifact()
+        loaded = Model.load(fname)
+        self.assertIsNone(loaded.data)
+        self.assertEqual(loaded.test_indices, model.test_indices)
+
+        loaded.data = data1
+        true1, pred1 = loaded.predict(indices=loaded.test_indices, pp=False)
+        self.assertTrue(np.allclose(true, true1, equal_nan=True))
+        self.assertTrue(np.allclose(pred, pred1))
+        return
+
+    def test_save_load_ml_artifact(self):
+        model = Model(model={'DecisionTreeRegressor': {'max_depth': 3}},
+                      data=data1,
+                      transformation='minmax',
+                      inputs=in_cols,
+                      outputs=out_cols,
+                      verbosity=0)
+        model.fit()
+        _, pred = model.predict(pp=False)
+
+        loaded = Model.load(model.save_artifact())
+        self.assertEqual(sorted(loaded.scalers), sorted(model.scalers))
+
+        loaded.data = data1
+        _, pred1 = loaded.predict(pp=False)
+        self.assertTrue(np.allclose(pred, pred1))
+        return
+
+    def test_predict_batch(self):
+        model = build_model(model={'layers': get_layers(1, 3)},
+                            transformation='minmax',
+                            forecast_step=2,
+                            forecast_length=3,
+                            input_step=2,
+                            inputs=in_cols,
+                            outputs=out_cols)
+        model.fit()
+        # the scalers fitted on training data are refitted on same data under same key
+        _, pred = model.predict(scaler_key='0', pp=False)
+
+        pred1 = model.predict_batch(data1)
+        self.assertEqual(pred1.shape[1:], (1, 3))
+        self.assertTrue(np.allclose(pred, pred1[:len(pred)], atol=1e-4))
+
+        # windows can be made from the rows whose targets are not known yet
+        pred2 = model.predict_on_window(data1[in_cols].values[-model.window_rows:])
+        self.assertTrue(np.allclose(pred2, pred1[-1], atol=1e-4))
+
+        # arrays are windowed same as dataframes
+        self.assertTrue(np.allclose(model.predict_batch(data1[in_cols].values), pred1, atol=1e-4))
+        self.assertTrue(np.allclose(model.predict_batch(data1, last_window=True), pred1[-1:], atol=1e-4))
+        return
+
+    def check_streaming(self, model):
+        model.fit()
+        expected = model.predict_batch(data1.iloc[:200])
+
+        forecaster = StreamingForecaster(model)
+        # no prediction until a window is complete
+        self.assertEqual(len(forecaster.update(data1.iloc[:model.window_rows - 1])), 0)
+        predictions = [forecaster.update(data1.iloc[i]) for i in range(model.window_rows - 1, 150)]
+        predictions.append(forecaster.update(data1.iloc[150:200]))
+        predictions = np.concatenate(predictions)
+        self.assertTrue(np.allclose(predictions, expected, atol=1e-4))
+
+        # the first target of each window is the first label of same example in prepare_data
+        _, _, y = prepare_data(data1.values[:200],
+                               lookback_steps=lookback,
+                               num_outputs=outs,
+                               input_steps=model.config['input_step'],
+                               forecast_step=model.config['forecast_step'],
+                               forecast_len=model.forecast_len,
+                               known_future_inputs=model.config['known_future_inputs'])
+        rows = [forecaster.target_row(row) for row in range(model.window_rows - 1, model.window_rows - 1 + len(y))]
+        self.assertTrue(np.allclose(data1[out_cols[0]].values[rows], y[:, 0, 0]))
+
+        # warming up with history gives same predictions
+        forecaster.reset()
+        forecaster.fill(data1.iloc[:150])
+        self.assertTrue(np.allclose(forecaster.update(data1.iloc[150:200]), expected[-50:], atol=1e-4))
+        return
+
+    def test_streaming_forecaster(self):
+        model = build_model(model={'layers': get_layers(1, 3)},
+                            transformation='minmax',
+                            forecast_step=1,
+                            forecast_length=3,
+                            input_step=2,
+                            inputs=in_cols,
+                            outputs=out_cols)
+        self.check_streaming(model)
+        return
+
+    def test_streaming_known_future_inputs(self):
+        # the window also contains the inputs at the forecast horizons
+        layers = {"Input": {"config": {"shape": (lookback + 3, ins)}}}
+        layers.update(get_layers(1, 3))
+        model = build_model(model={'layers': layers},
+                            transformation='minmax',
+                            forecast_step=1,
+                            forecast_length=3,
+                            input_step=2,
+                            known_future_inputs=True,
+                            inputs=in_cols,
+                            outputs=out_cols)
+        self.check_streaming(model)
+        return
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file